@@ -0,0 +1,19 @@
+"""Settings and favorites files being saved and read back repeatedly."""
+import os
+from benchmarks.harness import benchmark, WORK_DIR
+
+WRITES = 50
+
+def json_setup():
+    path = os.path.join(WORK_DIR, 'churn.json')
+    data = {str(i): {'name': f"Sound {i:05d}", 'favorite': i % 3 == 0, 'hotkey': str(i % 21)} for i in range(1000)}
+    return path, data
+
+@benchmark(f"save_json/load_json x{WRITES} (1k entries)", setup=json_setup)
+def run_json_churn(state):
+    from src.utils.file_utils import save_json, load_json
+    path, data = state
+    for _ in range(WRITES):
+        save_json(path, data)
+        if len(load_json(path)) != len(data):
+            raise RuntimeError("JSON round trip lost entries")
@@ -0,0 +1,42 @@
+"""Loading tabs: probing sound files and building every tab of the window."""
+from benchmarks.harness import benchmark, get_app, get_soundpad, make_tab, wait_for_tabs
+
+def load_thread_setup(count):
+    def setup():
+        get_app()
+        make_tab(f"Load {count}", count, library=f'load_{count}')
+        from src.audio.threads import LoadSoundsThread
+        thread = LoadSoundsThread(f"Load {count}")
+        thread.results = []
+        thread.loading_finished_signal.connect(lambda sounds, success: thread.results.append(len(sounds)))
+        return thread
+    return setup
+
+def run_load_thread(thread):
+    # Run the loader on this thread, its signals are delivered directly
+    thread.run()
+    if not thread.results or not thread.results[0]:
+        raise RuntimeError("LoadSoundsThread loaded nothing")
+
+benchmark("LoadSoundsThread 1k files", setup=load_thread_setup(1000))(run_load_thread)
+benchmark("LoadSoundsThread 10k files", rounds=3, setup=load_thread_setup(10000), slow=True)(run_load_thread)
+
+TABS = 50
+SOUNDS_PER_TAB = 20
+
+def load_tabs_setup():
+    for i in range(TABS):
+        make_tab(f"Tab {i:02d}", SOUNDS_PER_TAB, library='many_tabs')
+    window = get_soundpad('many_tabs')
+    
+    # Pages removed by load_tabs stay children of the window, drop them between rounds
+    for i in range(window.tab_widget.count()):
+        window.tab_widget.widget(i).deleteLater()
+    get_app().processEvents()
+    return window
+
+@benchmark(f"SoundPad.load_tabs {TABS} tabs x {SOUNDS_PER_TAB}", setup=load_tabs_setup)
+def run_load_tabs(window):
+    # Until every tab has been probed and filled in
+    window.load_tabs()
+    wait_for_tabs(window)
@@ -0,0 +1,28 @@
+"""Triggering sounds, with and without the decoded sounds cached."""
+from benchmarks.harness import benchmark, get_soundpad, make_tab
+
+# One per mixer channel, so no sound has to be stopped to make room
+SOUNDS = 8
+
+def playback_setup(cold):
+    def setup():
+        make_tab("Playback", SOUNDS, library='playback', seconds=2.0)
+        window = get_soundpad('playback')
+        from src.audio.sound_cache import sound_cache
+        if cold:
+            sound_cache.clear()
+        else:
+            for index in range(SOUNDS):
+                sound_cache.get(window.tab_widget.widget(0).get_sound_data(index)['path'])
+        return window
+    return setup
+
+def stop_sounds(window):
+    window.stop_all_sounds()
+
+def run_toggle(window):
+    for index in range(SOUNDS):
+        window.toggle_sound("Playback", index)
+
+benchmark(f"SoundPad.toggle_sound cold x{SOUNDS}", setup=playback_setup(True), teardown=stop_sounds)(run_toggle)
+benchmark(f"SoundPad.toggle_sound warm x{SOUNDS}", rounds=20, setup=playback_setup(False), teardown=stop_sounds)(run_toggle)
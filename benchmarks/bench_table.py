@@ -0,0 +1,41 @@
+"""Filling and searching the sound table of a tab."""
+from benchmarks.harness import benchmark, get_app, use_library
+
+_pages = {}
+
+def get_tab_page(count, purpose):
+    """
+    Get a tab page holding count sounds, without files behind them.
+
+    Each purpose gets its own page: a table that has been filled again
+    filters several times faster than one filled once, as in the app, so
+    the search benchmarks mustn't reuse the pages the fill benchmarks refill.
+    """
+    key = (count, purpose)
+    if key not in _pages:
+        get_app()
+        use_library('table')
+        from src.tabpage import TabPage
+        page = TabPage(f"Table {count}")
+        page.sounds = [
+            {'name': f"Sound {i:05d}", 'path': f"/nonexistent/sound_{i:05d}.wav", 'duration': 1.5 + i % 90}
+            for i in range(count)
+        ]
+        page.create_sound_buttons()
+        get_app().processEvents()
+        _pages[key] = page
+    return _pages[key]
+
+def run_create_buttons(page):
+    page.create_sound_buttons()
+
+benchmark("TabPage.create_sound_buttons 1k", setup=lambda: get_tab_page(1000, 'fill'))(run_create_buttons)
+benchmark("TabPage.create_sound_buttons 10k", rounds=3, setup=lambda: get_tab_page(10000, 'fill'), slow=True)(run_create_buttons)
+
+def run_filter(page):
+    # Narrow the list down, then show everything again
+    page.filter_sounds("123")
+    page.filter_sounds("")
+
+benchmark("TabPage.filter_sounds 1k", setup=lambda: get_tab_page(1000, 'search'))(run_filter)
+benchmark("TabPage.filter_sounds 10k", setup=lambda: get_tab_page(10000, 'search'), slow=True)(run_filter)
@@ -0,0 +1,218 @@
+"""
+Benchmark harness.
+
+Sets up a headless environment (offscreen Qt, dummy SDL audio, a
+throwaway sounds and data directory) before any app module is imported,
+runs the registered benchmarks and compares their timings with a saved
+baseline.
+"""
+import os
+import sys
+import json
+import time
+import wave
+import shutil
+import platform
+import tempfile
+import statistics
+
+# Must be set before Qt, pygame or the app are imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+# Stall warnings from the watchdog would land in the middle of the results
+os.environ.setdefault('CXRRUPTPAD_LOG_LEVEL', 'ERROR')
+WORK_DIR = tempfile.mkdtemp(prefix='cxrruptpad_bench_')
+os.environ['CXRRUPTPAD_SOUNDS_DIR'] = os.path.join(WORK_DIR, 'sounds')
+os.environ['CXRRUPTPAD_DATA_DIR'] = os.path.join(WORK_DIR, 'data')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Where --save and --compare keep results
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+_benchmarks = []
+
+def benchmark(name, rounds=5, setup=None, teardown=None, slow=False):
+    """
+    Register func as a benchmark.
+
+    setup() runs before every round, untimed, and its return value is
+    passed to func; teardown(state) runs after it, also untimed. Slow
+    benchmarks are skipped by --quick.
+    """
+    def decorator(func):
+        _benchmarks.append({
+            'name': name, 'func': func, 'rounds': rounds,
+            'setup': setup, 'teardown': teardown, 'slow': slow
+        })
+        return func
+    return decorator
+
+def get_benchmarks(pattern=None, quick=False):
+    return [bench for bench in _benchmarks
+            if (not pattern or pattern in bench['name']) and not (quick and bench['slow'])]
+
+def run_benchmark(bench, rounds=None):
+    """Run a benchmark and get its timing statistics in seconds."""
+    times = []
+    for _ in range(rounds or bench['rounds']):
+        state = bench['setup']() if bench['setup'] else None
+        started = time.perf_counter()
+        if state is None:
+            bench['func']()
+        else:
+            bench['func'](state)
+        times.append(time.perf_counter() - started)
+        if bench['teardown']:
+            bench['teardown'](state)
+    return {
+        'rounds': len(times),
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0
+    }
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'system': f"{platform.system()} {platform.release()}",
+        'machine': platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+def save_results(results, name):
+    """Write results to results/<name>.json and return the path."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f'{name}.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'machine': machine_info(), 'saved': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'results': results}, f, indent=2)
+    return path
+
+def load_results(name):
+    path = os.path.join(RESULTS_DIR, f'{name}.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_results(results, baseline, threshold):
+    """
+    Compare medians with a baseline.
+
+    Returns rows of (name, baseline median, median, change) and the names
+    of benchmarks that got slower by more than threshold (a fraction).
+    """
+    rows = []
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if not before:
+            rows.append((name, None, stats['median'], None))
+            continue
+        change = (stats['median'] - before['median']) / before['median'] if before['median'] else 0.0
+        rows.append((name, before['median'], stats['median'], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+def format_seconds(seconds):
+    if seconds is None:
+        return '-'
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1000:.2f}ms"
+    return f"{seconds:.2f}s"
+
+_app = None
+
+def get_app():
+    """Get the QApplication and start pygame's mixer, once."""
+    global _app
+    if _app is None:
+        import pygame
+        from PyQt6.QtWidgets import QApplication
+        pygame.init()
+        pygame.mixer.init()
+        _app = QApplication.instance() or QApplication([])
+    return _app
+
+def process_events_until(condition, timeout=120):
+    """Run the Qt event loop until condition() is true."""
+    app = get_app()
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Benchmark condition not met in time")
+        app.processEvents()
+        time.sleep(0.001)
+
+def write_wav(path, seconds=0.05, rate=22050, channels=1):
+    """Write a silent WAV file."""
+    frames = int(seconds * rate)
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(bytes(frames * channels * 2))
+
+def use_library(library):
+    """Point the app at a separate sounds directory, so scenarios don't see each other's tabs."""
+    sounds_dir = os.path.join(WORK_DIR, library)
+    os.makedirs(sounds_dir, exist_ok=True)
+    os.environ['CXRRUPTPAD_SOUNDS_DIR'] = sounds_dir
+    return sounds_dir
+
+def make_tab(tab_name, count, library='sounds', seconds=0.05):
+    """Create a tab with count WAV files in a benchmark library, once."""
+    tab_dir = os.path.join(use_library(library), tab_name)
+    if os.path.isdir(tab_dir) and len(os.listdir(tab_dir)) == count:
+        return tab_dir
+    shutil.rmtree(tab_dir, ignore_errors=True)
+    os.makedirs(tab_dir)
+    template = os.path.join(tab_dir, 'sound_00000.wav')
+    write_wav(template, seconds)
+    for i in range(1, count):
+        shutil.copyfile(template, os.path.join(tab_dir, f'sound_{i:05d}.wav'))
+    return tab_dir
+
+_soundpads = {}
+
+def get_soundpad(library):
+    """Get a main window showing a benchmark library, with every tab loaded."""
+    if library not in _soundpads:
+        get_app()
+        use_library(library)
+        from src.soundpad import SoundPad
+        
+        # Background deduplication and download resuming would compete with the measured work
+        SoundPad.start_dedupe = lambda self: None
+        SoundPad.resume_downloads = lambda self: None
+        window = SoundPad()
+        window.show()
+        wait_for_tabs(window)
+        _soundpads[library] = window
+    use_library(library)
+    return _soundpads[library]
+
+def wait_for_tabs(window):
+    """Process events until every tab of the window has finished loading."""
+    def loaded():
+        for i in range(window.tab_widget.count()):
+            thread = getattr(window.tab_widget.widget(i), 'load_thread', None)
+            if thread is None or not thread.isFinished():
+                return False
+        return True
+    process_events_until(loaded)
+    # Deliver the results the threads posted before finishing
+    get_app().processEvents()
+
+def cleanup():
+    """Close the windows (stopping their threads) and delete the benchmark files."""
+    for window in _soundpads.values():
+        window.cleanup()
+    _soundpads.clear()
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
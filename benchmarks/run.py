@@ -0,0 +1,92 @@
+"""
+Run the benchmarks headless and compare them with a saved baseline.
+
+Usage:
+    python -m benchmarks.run                  Run everything and print timings
+    python -m benchmarks.run --quick          Skip the 10k-sound cases
+    python -m benchmarks.run -k toggle        Only benchmarks whose name contains 'toggle'
+    python -m benchmarks.run --save           Save the timings as the 'baseline'
+    python -m benchmarks.run --compare        Compare with the 'baseline' (exit code 1 on regressions)
+    python -m benchmarks.run --save after --compare before
+
+Results are machine specific, so baselines are kept in benchmarks/results/
+and not committed; save one before a change and compare after it.
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import harness
+from benchmarks import bench_loading, bench_table, bench_playback, bench_json  # Register the benchmarks
+
+def print_results(results):
+    width = max(len(name) for name in results)
+    print(f"{'Benchmark':<{width}}  {'rounds':>6}  {'min':>10}  {'median':>10}  {'mean':>10}  {'stdev':>10}")
+    for name, stats in results.items():
+        print(f"{name:<{width}}  {stats['rounds']:>6}  {harness.format_seconds(stats['min']):>10}  "
+              f"{harness.format_seconds(stats['median']):>10}  {harness.format_seconds(stats['mean']):>10}  "
+              f"{harness.format_seconds(stats['stdev']):>10}")
+
+def print_comparison(rows, baseline_name, threshold):
+    width = max(len(row[0]) for row in rows)
+    print(f"\nMedians against '{baseline_name}' (regressions past {threshold:.0%} marked):")
+    print(f"{'Benchmark':<{width}}  {'baseline':>10}  {'now':>10}  {'change':>8}")
+    for name, before, after, change in rows:
+        if change is None:
+            change_text, mark = "new", ""
+        else:
+            change_text = f"{change:+.1%}"
+            mark = "  SLOWER" if change > threshold else ("  faster" if change < -threshold else "")
+        print(f"{name:<{width}}  {harness.format_seconds(before):>10}  {harness.format_seconds(after):>10}  "
+              f"{change_text:>8}{mark}")
+
+def main():
+    parser = argparse.ArgumentParser(description="CxrruptPad benchmarks")
+    parser.add_argument("-k", "--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Skip the slow (10k sound) benchmarks")
+    parser.add_argument("--rounds", type=int, help="Rounds per benchmark, instead of each one's default")
+    parser.add_argument("--save", nargs="?", const="baseline", metavar="NAME", help="Save the results as NAME (default: baseline)")
+    parser.add_argument("--compare", nargs="?", const="baseline", metavar="NAME", help="Compare with saved results NAME (default: baseline)")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown (fraction of the baseline median) counted as a regression")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = harness.load_results(args.compare)
+        except (OSError, ValueError) as e:
+            print(f"Could not load results '{args.compare}': {e}")
+            return 2
+
+    benchmarks = harness.get_benchmarks(args.filter, args.quick)
+    if not benchmarks:
+        print("No benchmarks match")
+        return 2
+
+    results = {}
+    try:
+        for bench in benchmarks:
+            print(f"Running {bench['name']}...", file=sys.stderr)
+            results[bench['name']] = harness.run_benchmark(bench, args.rounds)
+    finally:
+        harness.cleanup()
+
+    print_results(results)
+
+    if args.save:
+        print(f"\nSaved results to {harness.save_results(results, args.save)}")
+
+    if baseline is not None:
+        rows, regressions = harness.compare_results(results, baseline['results'], args.threshold)
+        print_comparison(rows, args.compare, args.threshold)
+        if baseline.get('machine') != harness.machine_info():
+            print("\nNote: the baseline was saved on a different machine or Python version")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
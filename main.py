@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
-from src.main import main
-from src.utils.logger import logger, get_log_directory
 
+# Imports stay under the guard: spawned worker processes (the metadata
+# probing pool) re-run this file as __mp_main__, and must not pull in Qt,
+# pygame or the log session just to start
 if __name__ == "__main__":
-    logger.info(f"CxrruptPad starting - logs available at: {get_log_directory()}/latest.log")
+    from src.main import main
+    from src.utils.logger import logger, get_log_directory
+
+    logger.info("CxrruptPad starting - logs available at: %s/latest.log", get_log_directory())
     main()
@@ -18,14 +18,14 @@ def initialize_audio():
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
         pygame.mixer.set_num_channels(64)  # Allow more simultaneous sounds
         pygame.init()
-        logger.info(f"Audio initialized successfully: {pygame.mixer.get_init()}")
+        logger.info("Audio initialized successfully: %s", pygame.mixer.get_init())
     except Exception as e:
-        logger.error(f"Failed to initialize audio: {str(e)}")
+        logger.error("Failed to initialize audio: %s", e)
         raise
 
 def get_default_audio_device():
     system = platform.system()
-    logger.debug(f"Getting default audio device for {system}")
+    logger.debug("Getting default audio device for %s", system)
     
     if system == "Windows":
         if PYAUDIO_AVAILABLE:
@@ -34,10 +34,10 @@ def get_default_audio_device():
                 info = p.get_default_input_device_info()
                 device_name = info['name']
                 p.terminate()
-                logger.debug(f"Found default audio device via PyAudio: {device_name}")
+                logger.debug("Found default audio device via PyAudio: %s", device_name)
                 return device_name
             except Exception as e:
-                logger.debug(f"PyAudio device detection failed: {str(e)}")
+                logger.debug("PyAudio device detection failed: %s", e)
                 try:
                     logger.debug("Trying FFmpeg to detect audio devices")
                     devices_cmd = subprocess.Popen(
@@ -60,10 +60,10 @@ def get_default_audio_device():
                                 audio_devices.append(device_name)
                     
                     if audio_devices:
-                        logger.debug(f"Found audio devices via FFmpeg: {audio_devices}")
+                        logger.debug("Found audio devices via FFmpeg: %s", audio_devices)
                         return audio_devices[0]  # Return first device
                 except Exception as e:
-                    logger.debug(f"FFmpeg device detection failed: {str(e)}")
+                    logger.debug("FFmpeg device detection failed: %s", e)
                 
         # Default fallback for Windows
         logger.debug("Using default fallback audio device for Windows")
@@ -78,7 +78,7 @@ def stop_all_sounds():
     pygame.mixer.stop()
 
 def set_global_volume(volume):
-    logger.debug(f"Setting global volume to {volume}%")
+    logger.debug("Setting global volume to %s%%", volume)
     pygame.mixer.music.set_volume(volume / 100)
     for channel in range(pygame.mixer.get_num_channels()):
         if pygame.mixer.Channel(channel).get_busy():
@@ -0,0 +1,69 @@
+"""
+Audio level measurement for meters.
+
+Levels are computed from blocks of signed 16-bit PCM. Blocks are read
+straight into a preallocated buffer and viewed as samples without copying;
+NumPy is used when it is installed, with a slower pure Python fallback.
+"""
+import sys
+import math
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Quietest level shown on the meter, in dBFS
+METER_FLOOR_DB = -60.0
+
+FULL_SCALE = 32768.0
+
+def compute_levels(block):
+    """
+    Get the RMS and peak of a block of s16le PCM, both in 0.0-1.0.
+
+    The block can be any bytes-like object (e.g. a memoryview slice of a
+    read buffer); with NumPy it is read in place without a copy.
+    """
+    usable = len(block) - len(block) % 2
+    if usable == 0:
+        return 0.0, 0.0
+
+    if numpy is not None:
+        samples = numpy.frombuffer(block, dtype='<i2', count=usable // 2)
+        # Sum of squares accumulated in int64, without a temporary array
+        square_sum = numpy.einsum('i,i->', samples, samples, dtype=numpy.int64, casting='unsafe')
+        rms = math.sqrt(int(square_sum) / len(samples))
+        peak = float(max(-int(samples.min()), int(samples.max())))
+    else:
+        samples = array.array('h')
+        samples.frombytes(memoryview(block)[:usable])
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        rms = math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+        peak = float(max(abs(sample) for sample in samples))
+
+    return min(1.0, rms / FULL_SCALE), min(1.0, peak / FULL_SCALE)
+
+def level_to_percent(level):
+    """Map a linear level (0.0-1.0) to a 0-100 meter value on a dB scale."""
+    if level <= 0:
+        return 0
+    db = 20 * math.log10(level)
+    return int(max(0.0, min(100.0, (db - METER_FLOOR_DB) * 100 / -METER_FLOOR_DB)))
+
+def read_block(stream, view):
+    """
+    Fill a memoryview from a binary stream using readinto.
+
+    Returns the number of bytes read, which is less than the view's length
+    only at the end of the stream.
+    """
+    filled = 0
+    while filled < len(view):
+        count = stream.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
@@ -0,0 +1,163 @@
+"""
+Cache of downloaded audio, keyed by extractor and video ID.
+
+The same clip is often pulled into several tabs. The first download stores
+its extracted audio here once; later requests for the same video are served
+by linking (or copying) the cached file into the tab instead of downloading
+and converting it again. The cache is capped in size and evicts the least
+recently used entries.
+"""
+import os
+import re
+import time
+import hashlib
+import threading
+from urllib.parse import urlparse, parse_qs
+
+from src.utils.file_utils import (
+    get_data_dir, get_app_settings_path, ensure_dir_exists,
+    save_json, load_json, delete_file_safely, copy_file_fast
+)
+from src.utils.logger import logger
+
+# Default size cap of the cache
+DEFAULT_CACHE_MB = 1024
+
+YOUTUBE_HOSTS = ('youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com', 'youtu.be')
+YOUTUBE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+def media_key(url, extractor=None, video_id=None):
+    """
+    Get the cache key for a video.
+
+    Uses the extractor and ID when they are known (e.g. from a playlist
+    listing), otherwise recognises the common YouTube URL forms. Other URLs
+    are keyed by the URL itself.
+    """
+    if video_id:
+        return f"{(extractor or 'generic').lower()}:{video_id}"
+
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().split(':')[0]
+    if host in YOUTUBE_HOSTS:
+        if host == 'youtu.be':
+            candidate = parsed.path.strip('/').split('/')[0]
+        elif parsed.path.startswith(('/shorts/', '/embed/', '/live/')):
+            candidate = parsed.path.split('/')[2]
+        else:
+            candidate = parse_qs(parsed.query).get('v', [''])[0]
+        if YOUTUBE_ID_PATTERN.match(candidate):
+            return f"youtube:{candidate}"
+
+    return "url:" + hashlib.sha1(url.strip().encode('utf-8')).hexdigest()
+
+class MediaCache:
+    """
+    Size-capped LRU store of extracted audio files.
+
+    Entries are files under the cache directory, tracked in an index with
+    their size and last use so the least recently used ones are evicted
+    first once the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir or os.path.join(get_data_dir(), "media_cache")
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        ensure_dir_exists(self.cache_dir)
+        # {key: {"file", "size", "last_used"}}
+        self.entries = load_json(self.index_path)
+
+    def save(self):
+        with self.lock:
+            save_json(self.index_path, self.entries)
+
+    def total_bytes(self):
+        with self.lock:
+            return sum(entry['size'] for entry in self.entries.values())
+
+    def lookup(self, key):
+        """Get the cached file for a key, or None. Counts as a use of the entry."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            path = os.path.join(self.cache_dir, entry['file'])
+            if not os.path.exists(path):
+                del self.entries[key]
+                return None
+            entry['last_used'] = time.time()
+        self.save()
+        return path
+
+    def fetch(self, key, output_path):
+        """
+        Place the cached audio for a key at <output_path>.<ext>.
+
+        The file is hardlinked when possible, so it takes no extra space.
+        Returns the created path, or None on a cache miss.
+        """
+        path = self.lookup(key)
+        if not path:
+            return None
+
+        result_file = output_path + os.path.splitext(path)[1]
+        try:
+            copy_file_fast(path, result_file, mode="hardlink")
+        except OSError as e:
+            logger.warning("Failed to use cached media for %s: %s", key, e)
+            return None
+        logger.info("Served %s from the media cache", key)
+        return result_file
+
+    def store(self, key, file_path):
+        """Add a downloaded file to the cache and evict old entries if needed."""
+        name = re.sub(r'[^A-Za-z0-9_-]', '_', key) + os.path.splitext(file_path)[1].lower()
+        path = os.path.join(self.cache_dir, name)
+        try:
+            copy_file_fast(file_path, path, mode="hardlink")
+        except OSError as e:
+            logger.warning("Failed to cache media for %s: %s", key, e)
+            return
+
+        with self.lock:
+            self.entries[key] = {
+                'file': name,
+                'size': os.path.getsize(path),
+                'last_used': time.time()
+            }
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size cap."""
+        with self.lock:
+            total = sum(entry['size'] for entry in self.entries.values())
+            for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+                if total <= self.max_bytes:
+                    break
+                delete_file_safely(os.path.join(self.cache_dir, entry['file']))
+                del self.entries[key]
+                total -= entry['size']
+                logger.debug("Evicted %s from the media cache", key)
+        self.save()
+
+    def clear(self):
+        with self.lock:
+            for entry in self.entries.values():
+                delete_file_safely(os.path.join(self.cache_dir, entry['file']))
+            self.entries.clear()
+        self.save()
+
+_media_cache = None
+_media_cache_lock = threading.Lock()
+
+def get_media_cache():
+    """Get the shared media cache, sized from the 'media_cache_mb' setting."""
+    global _media_cache
+    with _media_cache_lock:
+        if _media_cache is None:
+            settings = load_json(get_app_settings_path())
+            max_mb = int(settings.get('media_cache_mb', DEFAULT_CACHE_MB))
+            _media_cache = MediaCache(max_bytes=max_mb * 1024 * 1024)
+        return _media_cache
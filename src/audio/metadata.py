@@ -0,0 +1,65 @@
+"""
+Sound file metadata probing.
+
+This module is imported by worker processes when metadata probing runs in a
+process pool, so it must stay free of Qt, pygame and the application logger.
+"""
+import os
+import wave
+
+from src.utils.tracing import traced
+
+try:
+    from mutagen.mp3 import MP3
+    from mutagen.oggvorbis import OggVorbis
+    from mutagen.flac import FLAC
+    from mutagen.oggopus import OggOpus
+except ImportError:
+    MP3 = None
+    OggVorbis = None
+    FLAC = None
+    OggOpus = None
+
+def get_duration(full_path):
+    """Get the duration of a sound file in seconds, or '' if unknown."""
+    lower_path = full_path.lower()
+    try:
+        if lower_path.endswith('.wav'):
+            with wave.open(full_path, 'rb') as wf:
+                frames = wf.getnframes()
+                rate = wf.getframerate()
+                return frames / float(rate)
+        elif lower_path.endswith('.mp3') and MP3:
+            return MP3(full_path).info.length
+        elif lower_path.endswith('.ogg') and OggVorbis:
+            return OggVorbis(full_path).info.length
+        elif lower_path.endswith('.flac') and FLAC:
+            return FLAC(full_path).info.length
+        elif lower_path.endswith('.opus') and OggOpus:
+            return OggOpus(full_path).info.length
+    except Exception:
+        pass
+    return ''
+
+@traced("sound.probe")
+def probe_sound_file(full_path):
+    """
+    Build the sound data dict for a file.
+
+    Returns None if the file can't be read (e.g. it was deleted mid-load).
+    """
+    try:
+        # Get file creation time or modification time as fallback
+        try:
+            creation_time = os.path.getctime(full_path)
+        except OSError:
+            creation_time = os.path.getmtime(full_path)
+    except OSError:
+        return None
+
+    return {
+        'path': full_path,
+        'name': os.path.splitext(os.path.basename(full_path))[0],  # Remove extension
+        'creation_time': creation_time,
+        'duration': get_duration(full_path)
+    }
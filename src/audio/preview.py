@@ -0,0 +1,177 @@
+"""
+In-process preview of recordings through the pygame mixer.
+
+Takes play on the already-initialized mixer, so there is no player process
+to start. Segments are decoded through the shared sound cache and queued
+back to back on one channel; seeking starts a segment part way through.
+"""
+import time
+import wave
+
+import pygame
+
+from src.constants import PREVIEW_END_EVENT
+from src.audio.levels import compute_levels
+from src.audio.metadata import get_duration
+from src.audio.sound_cache import sound_cache
+
+class PreviewPlayer:
+    """
+    Play a take made of one or more segment files, with seeking.
+
+    Call poll() regularly (e.g. from a Qt timer); it advances through the
+    segments on the channel's end events and returns False once playback
+    has finished.
+    """
+
+    def __init__(self, segments):
+        self.segments = list(segments)
+        self.offsets = []  # Start time of each segment within the take
+        self.durations = []
+        total = 0.0
+        for segment in self.segments:
+            duration = get_duration(segment)
+            if not duration:
+                # Unknown format for metadata, ask the mixer instead
+                duration = sound_cache.get(segment).get_length()
+            self.offsets.append(total)
+            self.durations.append(duration)
+            total += duration
+        self.duration = total
+
+        self.channel = None
+        self.index = 0  # Segment playing now
+        self.started_at = 0.0  # Monotonic time the current segment (virtually) started
+        self.paused_at = None
+        self.playing = False
+        self.wav = None
+        self.wav_index = -1
+
+    def _segment_at(self, position):
+        for index in range(len(self.segments) - 1, -1, -1):
+            if position >= self.offsets[index]:
+                return index
+        return 0
+
+    def _sound_from(self, index, offset):
+        """Get the sound for a segment, starting offset seconds in."""
+        sound = sound_cache.get(self.segments[index])
+        if offset <= 0:
+            return sound
+
+        return sound_cache.trim_sound(sound, offset)
+
+    def play(self, position=0.0):
+        """Start playing from a position in seconds."""
+        self.stop()
+        position = max(0.0, min(position, self.duration))
+        if position >= self.duration:
+            return
+
+        self.index = self._segment_at(position)
+        offset = position - self.offsets[self.index]
+        self.channel = self.channel or pygame.mixer.find_channel(True)
+        self.channel.set_endevent(PREVIEW_END_EVENT)
+        self.channel.play(self._sound_from(self.index, offset))
+        self._queue_next()
+
+        self.started_at = time.monotonic() - offset
+        self.paused_at = None
+        self.playing = True
+
+    def _queue_next(self):
+        # Queue the following segment so it starts without a gap
+        if self.index + 1 < len(self.segments):
+            self.channel.queue(sound_cache.get(self.segments[self.index + 1]))
+
+    def pause(self):
+        if self.playing and self.paused_at is None:
+            self.channel.pause()
+            self.paused_at = time.monotonic()
+
+    def resume(self):
+        if self.playing and self.paused_at is not None:
+            self.channel.unpause()
+            self.started_at += time.monotonic() - self.paused_at
+            self.paused_at = None
+
+    def stop(self):
+        if self.channel:
+            self.channel.set_endevent()
+            self.channel.stop()
+        # Drop end events of the stopped playback
+        if pygame.display.get_init():
+            pygame.event.clear(PREVIEW_END_EVENT)
+        self.playing = False
+        self.paused_at = None
+        self.close_wav()
+
+    def position(self):
+        """Current playback position within the take, in seconds."""
+        if not self.playing:
+            return 0.0
+        now = self.paused_at if self.paused_at is not None else time.monotonic()
+        offset = min(now - self.started_at, self.durations[self.index])
+        return self.offsets[self.index] + max(0.0, offset)
+
+    def poll(self):
+        """Advance through segments on end events. Returns False once playback ended."""
+        if not self.playing:
+            return False
+
+        if pygame.display.get_init():
+            ended = len(pygame.event.get(PREVIEW_END_EVENT))
+        else:
+            # No event queue (e.g. headless); watch the channel instead
+            ended = 0 if self.channel.get_busy() or self.paused_at is not None else 1
+
+        for _ in range(ended):
+            if self.index + 1 < len(self.segments):
+                # The queued segment has started where the last one ended
+                self.started_at += self.durations[self.index]
+                self.index += 1
+                self._queue_next()
+            else:
+                self.stop()
+                return False
+
+        if self.paused_at is None and not self.channel.get_busy():
+            self.stop()
+            return False
+        return True
+
+    def levels(self, block_seconds):
+        """Get the (rms, peak) of the audio playing now, for WAV segments only."""
+        if not self.playing:
+            return 0.0, 0.0
+        if self.wav_index != self.index:
+            self.close_wav()
+            self.wav_index = self.index
+            self.wav = open_wav(self.segments[self.index])
+        if not self.wav:
+            return 0.0, 0.0
+
+        frame = int((self.position() - self.offsets[self.index]) * self.wav.getframerate())
+        if not 0 <= frame < self.wav.getnframes():
+            return 0.0, 0.0
+        self.wav.setpos(frame)
+        return compute_levels(self.wav.readframes(int(self.wav.getframerate() * block_seconds)))
+
+    def close_wav(self):
+        if self.wav:
+            self.wav.close()
+        self.wav = None
+        self.wav_index = -1
+
+def open_wav(path):
+    """Open a 16-bit WAV file for metering, or return None."""
+    if not path.lower().endswith('.wav'):
+        return None
+    try:
+        wav = wave.open(path, 'rb')
+    except (wave.Error, EOFError, OSError):
+        return None
+    if wav.getsampwidth() != 2:
+        wav.close()
+        return None
+    return wav
@@ -1,15 +1,15 @@
 import os
+import queue
+import shutil
 import platform
 import threading
 import time
 import subprocess
 import wave
-import tempfile
-import random
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QProgressBar, QSizePolicy,
-    QSlider, QMessageBox, QFileDialog, QLineEdit, QInputDialog
+    QSlider, QMessageBox, QFileDialog, QLineEdit, QInputDialog, QComboBox
 )
 from PyQt6.QtGui import QIcon, QColor, QFont
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread
@@ -17,7 +17,45 @@ from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread
 from src.constants import APP_STYLE
 from src.ui.components import WaveformVisualizer
 from src.audio.audio_utils import get_default_audio_device
+from src.audio.levels import compute_levels, level_to_percent, read_block
+from src.audio.ring_buffer import RingBuffer
+from src.audio.preview import PreviewPlayer
+from src.audio.segments import (
+    create_session_dir, build_segment_output_args,
+    list_segments, join_segments, remove_stale_sessions
+)
+from src.utils.file_utils import get_app_settings_path, load_json, save_json
 from src.utils.logger import logger
+from src.utils.metrics import get_metrics
+
+# Recording format, also used for the level meter stream
+METER_RATE = 44100
+METER_CHANNELS = 2
+
+# Length of each block the level meter is computed over
+METER_BLOCK_SECONDS = 0.05
+
+# Recorder metrics
+recordings_counter = get_metrics().counter("cxrruptpad_recordings_total", "Recordings by result (finished, failed)", ("result",))
+recorded_seconds_counter = get_metrics().counter("cxrruptpad_recorded_seconds_total", "Length of finished recordings")
+captured_bytes_counter = get_metrics().counter(
+    "cxrruptpad_captured_bytes_total", "PCM read from the capture device by recordings and instant replay"
+)
+capturing_gauge = get_metrics().gauge("cxrruptpad_capturing", "Recordings and instant replay captures running")
+replay_clips_counter = get_metrics().counter("cxrruptpad_replay_clips_total", "Instant replay clips saved")
+
+def build_capture_input_args(system, audio_device):
+    """Build the ffmpeg input arguments for capturing from an audio device."""
+    # Set up recording command based on platform
+    if system == "Windows":
+        # On Windows, use FFmpeg with DirectShow
+        return ["-f", "dshow", "-audio_buffer_size", "50", "-i", f"audio={audio_device}"]
+    elif "default" in audio_device.lower():
+        # Use default ALSA device
+        return ["-f", "alsa", "-i", "default"]
+    else:
+        # Use pulse audio
+        return ["-f", "pulse", "-i", "default"]
 
 class RecordingThread(QThread):
     status_signal = pyqtSignal(str)
@@ -26,126 +64,104 @@ class RecordingThread(QThread):
     finished_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
 
-    def __init__(self, audio_device, system, max_seconds=60):
+    def __init__(self, audio_device, system, max_seconds=None, fmt="wav"):
         super().__init__()
         self.audio_device = audio_device
         self.system = system
-        self.max_seconds = max_seconds
-        self.temp_file = None
+        self.max_seconds = max_seconds  # None records until stopped
+        self.fmt = fmt
+        self.session_dir = None
         self.process = None
         self.stop_flag = False
         self.record_seconds = 0
 
     def run(self):
         try:
-            # Create temporary file for recording
-            temp_dir = tempfile.gettempdir()
-            temp_name = f"recording_{int(time.time())}_{random.randint(1000, 9999)}.wav"
-            self.temp_file = os.path.join(temp_dir, temp_name)
+            # Create a session directory for the recording segments
+            self.session_dir = create_session_dir()
             
-            logger.info(f"Starting audio recording to {self.temp_file}")
+            logger.info("Starting %s audio recording in %s", self.fmt, self.session_dir)
             self.status_signal.emit("Starting recording...")
             
-            # Set up recording command based on platform
-            if self.system == "Windows":
-                # On Windows, use FFmpeg with DirectShow
-                cmd = [
-                    "ffmpeg",
-                    "-f", "dshow",
-                    "-audio_buffer_size", "50",
-                    "-i", f"audio={self.audio_device}",
-                    "-y",  # Overwrite output file
-                    "-acodec", "pcm_s16le",
-                    "-ar", "44100",
-                    "-ac", "2",
-                    self.temp_file
-                ]
-            else:
-                # On Linux, use ALSA/Pulse
-                if "default" in self.audio_device.lower():
-                    # Use default ALSA device
-                    cmd = [
-                        "ffmpeg",
-                        "-f", "alsa",
-                        "-i", "default",
-                        "-y",
-                        "-acodec", "pcm_s16le",
-                        "-ar", "44100",
-                        "-ac", "2",
-                        self.temp_file
-                    ]
-                else:
-                    # Use pulse audio
-                    cmd = [
-                        "ffmpeg",
-                        "-f", "pulse",
-                        "-i", "default",
-                        "-y",
-                        "-acodec", "pcm_s16le",
-                        "-ar", "44100",
-                        "-ac", "2",
-                        self.temp_file
-                    ]
+            cmd = [
+                "ffmpeg",
+                "-loglevel", "error", "-nostats",  # Keep stderr quiet so it can't fill up
+                *build_capture_input_args(self.system, self.audio_device),
+                # Recording, written as rolling segment files
+                "-y",  # Overwrite output files
+                *build_segment_output_args(self.session_dir, self.fmt, METER_CHANNELS),
+                # The same audio as raw PCM on stdout, for the level meter
+                "-f", "s16le",
+                "-acodec", "pcm_s16le",
+                "-ar", str(METER_RATE),
+                "-ac", str(METER_CHANNELS),
+                "pipe:1"
+            ]
             
             # Start FFmpeg recording process
             self.process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
+                stderr=subprocess.PIPE
             )
             
             self.status_signal.emit("Recording started")
+            capturing_gauge.inc()
+            
+            # Read the PCM stream in blocks into one preallocated buffer
+            block_bytes = int(METER_RATE * METER_BLOCK_SECONDS) * METER_CHANNELS * 2
+            buffer = bytearray(block_bytes)
+            view = memoryview(buffer)
             
             # Monitor recording and update time/level
             self.record_seconds = 0
             start_time = time.time()
             
-            while not self.stop_flag and self.record_seconds < self.max_seconds:
-                # Sleep to allow time to process
-                time.sleep(0.1)
+            while not self.stop_flag and (self.max_seconds is None or self.record_seconds < self.max_seconds):
+                # Blocks until the next block is captured or ffmpeg exits
+                count = read_block(self.process.stdout, view)
+                captured_bytes_counter.inc(count)
                 
                 # Update recording duration
                 self.record_seconds = int(time.time() - start_time)
                 self.time_signal.emit(self.record_seconds)
                 
-                # Generate a pseudo-random audio level for visual feedback
-                # In a real app, we'd analyze the audio buffer, but this is simpler
-                base_level = 30
-                variation = random.randint(0, 40)
-                # Higher variations more likely when recording longer
-                probability = min(80, self.record_seconds * 2)
-                spike = random.randint(0, 100) < probability
-                
-                if spike:
-                    level = base_level + variation
-                else:
-                    level = base_level + (variation // 2)
-                
-                self.level_signal.emit(level)
+                if count:
+                    rms, peak = compute_levels(view[:count])
+                    # Mostly RMS, so the meter follows loudness, with a bit of peak for transients
+                    self.level_signal.emit(level_to_percent(0.7 * rms + 0.3 * peak))
                 
                 # Check if process is still running
-                if self.process.poll() is not None:
-                    if self.process.returncode != 0:
-                        stderr = self.process.stderr.read()
+                if count < block_bytes:
+                    self.process.wait()
+                    if self.process.returncode != 0 and not self.stop_flag:
+                        stderr = self.process.stderr.read().decode('utf-8', errors='replace')
+                        recordings_counter.inc(labels=("failed",))
                         self.error_signal.emit(f"Recording failed: {stderr}")
                         return
                     break
             
             # If we reached max time, stop recording
-            if self.record_seconds >= self.max_seconds:
+            if self.max_seconds is not None and self.record_seconds >= self.max_seconds:
                 self.status_signal.emit("Maximum recording time reached")
                 self.stop_recording()
             
             # Signal completion
-            if os.path.exists(self.temp_file):
-                self.finished_signal.emit(self.temp_file)
+            if list_segments(self.session_dir):
+                recordings_counter.inc(labels=("finished",))
+                recorded_seconds_counter.inc(self.record_seconds)
+                self.finished_signal.emit(self.session_dir)
             else:
+                recordings_counter.inc(labels=("failed",))
                 self.error_signal.emit("Recording file not found")
         
         except Exception as e:
-            logger.error(f"Recording error: {str(e)}", exc_info=True)
+            logger.error("Recording error: %s", e, exc_info=True)
+            recordings_counter.inc(labels=("failed",))
             self.error_signal.emit(f"Recording error: {str(e)}")
+        finally:
+            if self.process is not None:
+                capturing_gauge.dec()
     
     def stop_recording(self):
         self.stop_flag = True
@@ -165,85 +181,120 @@ class RecordingThread(QThread):
                     self.process.kill()
             logger.debug("Recording process stopped")
 
-class PlaybackThread(QThread):
-    finished_signal = pyqtSignal()
+class ReplayCaptureThread(QThread):
+    """
+    Capture input continuously, keeping the last few seconds for instant replay.
+
+    Audio goes straight from the ffmpeg pipe into a fixed RingBuffer. A clip
+    is copied out of the buffer on this thread between reads, so the buffer
+    needs no lock, and written to disk on a thread of its own, so a slow disk
+    never holds up reading the pipe.
+    """
     level_signal = pyqtSignal(int)
+    saved_signal = pyqtSignal(str)
+    error_signal = pyqtSignal(str)
 
-    def __init__(self, file_path):
+    def __init__(self, audio_device, system, seconds=30):
         super().__init__()
-        self.file_path = file_path
+        self.audio_device = audio_device
+        self.system = system
+        self.ring = RingBuffer(seconds, METER_RATE, METER_CHANNELS)
+        self.process = None
         self.stop_flag = False
+        self.save_requests = queue.Queue()
+        self.save_threads = []
+
+    def request_save(self, path):
+        """Write the buffered audio to path as a WAV file, without stopping capture."""
+        self.save_requests.put(path)
 
     def run(self):
         try:
-            # Start playback using FFmpeg
             cmd = [
-                "ffplay",
-                "-nodisp",  # No display window
-                "-autoexit",  # Exit when done
-                "-i", self.file_path
+                "ffmpeg",
+                "-loglevel", "error", "-nostats",
+                *build_capture_input_args(self.system, self.audio_device),
+                "-f", "s16le",
+                "-acodec", "pcm_s16le",
+                "-ar", str(METER_RATE),
+                "-ac", str(METER_CHANNELS),
+                "pipe:1"
             ]
+            self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            logger.info("Started instant replay capture (%s KB buffer)", self.ring.capacity // 1024)
+            capturing_gauge.inc()
             
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Simulate audio levels during playback
-            # Get duration of the audio file
-            duration = 0
-            try:
-                with wave.open(self.file_path, 'rb') as wf:
-                    frames = wf.getnframes()
-                    rate = wf.getframerate()
-                    duration = frames / float(rate)
-            except:
-                # Fallback to a default duration
-                duration = 10
-            
-            start_time = time.time()
-            
+            block_bytes = int(METER_RATE * METER_BLOCK_SECONDS) * METER_CHANNELS * 2
             while not self.stop_flag:
-                # Sleep to allow time to process
-                time.sleep(0.05)
+                # Read the next block straight into the ring
+                block = self.ring.fill_from(self.process.stdout, block_bytes)
+                captured_bytes_counter.inc(len(block))
+                if not len(block):
+                    self.process.wait()
+                    if not self.stop_flag:
+                        stderr = self.process.stderr.read().decode('utf-8', errors='replace')
+                        self.error_signal.emit(f"Replay capture stopped: {stderr.strip()}")
+                    return
                 
-                # Generate random audio level for visualization
-                level = random.randint(20, 80)
-                self.level_signal.emit(level)
+                rms, peak = compute_levels(block)
+                self.level_signal.emit(level_to_percent(0.7 * rms + 0.3 * peak))
                 
-                # Check if playback completed
-                if process.poll() is not None or (time.time() - start_time) >= duration:
-                    break
-            
-            # Ensure process is terminated
-            if process.poll() is None:
-                process.terminate()
-                process.wait(timeout=1)
-            
-            self.finished_signal.emit()
-            
+                # Copy out clips that were asked for since the last block and
+                # write them in the background
+                while not self.save_requests.empty():
+                    path = self.save_requests.get()
+                    if not self.ring.filled:
+                        self.error_signal.emit("Nothing has been captured yet")
+                        continue
+                    self.save_threads = [thread for thread in self.save_threads if thread.is_alive()]
+                    thread = threading.Thread(target=self.save_clip, args=(path, self.ring.snapshot()), name="ReplaySave")
+                    self.save_threads.append(thread)
+                    thread.start()
+        
         except Exception as e:
-            print(f"Playback error: {str(e)}")
-            self.finished_signal.emit()
+            logger.error("Replay capture error: %s", e, exc_info=True)
+            self.error_signal.emit(f"Replay capture error: {str(e)}")
+        finally:
+            if self.process is not None:
+                capturing_gauge.dec()
+    
+    def save_clip(self, path, clip):
+        """Write a snapshot of the buffer to path; runs on its own thread."""
+        try:
+            self.ring.write_wav(path, clip)
+            seconds = sum(len(chunk) for chunk in clip) / float(self.ring.rate * self.ring.frame_bytes)
+            logger.info("Saved %.1fs instant replay to %s", seconds, path)
+            replay_clips_counter.inc()
+            self.saved_signal.emit(path)
+        except (OSError, wave.Error) as e:
+            self.error_signal.emit(f"Failed to save replay: {str(e)}")
     
-    def stop_playback(self):
+    def stop(self):
         self.stop_flag = True
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        # Let clips that are still being written finish
+        for thread in self.save_threads:
+            thread.join()
 
 class RecorderDialog(QDialog):
     def __init__(self, parent, tab_dir):
         super().__init__(parent)
         self.parent = parent
         self.tab_dir = tab_dir
-        self.recording_file = None
+        self.session_dir = None  # Segments of the current recording
         self.recording_thread = None
-        self.playback_thread = None
+        self.preview = None
+        self.saved_path = None  # Where the take was saved
         self.is_recording = False
         self.is_playing = False
         self.recorded_seconds = 0
-        self.temp_file = None
         
-        logger.debug(f"Opening RecorderDialog for tab directory: {tab_dir}")
+        logger.debug("Opening RecorderDialog for tab directory: %s", tab_dir)
         
         # Set window properties
         self.setWindowTitle("Record Sound")
@@ -341,6 +392,19 @@ class RecorderDialog(QDialog):
         
         layout.addLayout(controls_layout)
         
+        # Playback position, drag to scrub through the take
+        position_layout = QHBoxLayout()
+        
+        self.position_slider = QSlider(Qt.Orientation.Horizontal)
+        self.position_slider.setEnabled(False)
+        self.position_slider.sliderReleased.connect(self.seek_preview)
+        position_layout.addWidget(self.position_slider)
+        
+        self.position_label = QLabel("0:00 / 0:00")
+        position_layout.addWidget(self.position_label)
+        
+        layout.addLayout(position_layout)
+        
         # Sound name input
         name_layout = QHBoxLayout()
         name_layout.addWidget(QLabel("Sound Name:"))
@@ -351,6 +415,20 @@ class RecorderDialog(QDialog):
         
         layout.addLayout(name_layout)
         
+        # Recording format
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(QLabel("Format:"))
+        
+        self.format_combo = QComboBox()
+        self.format_combo.addItem("WAV (uncompressed)", "wav")
+        self.format_combo.addItem("FLAC (lossless)", "flac")
+        self.format_combo.addItem("Opus (compressed)", "opus")
+        saved_format = load_json(get_app_settings_path()).get('recording_format', 'wav')
+        self.format_combo.setCurrentIndex(max(0, self.format_combo.findData(saved_format)))
+        format_layout.addWidget(self.format_combo)
+        
+        layout.addLayout(format_layout)
+        
         # Save button
         save_layout = QHBoxLayout()
         
@@ -366,19 +444,33 @@ class RecorderDialog(QDialog):
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_timer)
         
+        # Timer for following the preview
+        self.playback_timer = QTimer(self)
+        self.playback_timer.timeout.connect(self.update_playback)
+        
         # Timer for waveform updates when not recording/playing
         self.waveform_timer = QTimer(self)
         self.waveform_timer.timeout.connect(self.update_waveform)
         self.waveform_timer.start(100)
         
+        # Clear out recordings an earlier crash left behind
+        remove_stale_sessions()
+        
+        # Also clean up when the dialog is dismissed without closing (e.g. Escape)
+        self.finished.connect(lambda result: self.stop_and_discard())
+        
         # Get default audio device
         self.audio_device = get_default_audio_device()
         self.system = platform.system()
     
     def update_timer(self):
-        minutes = self.recorded_seconds // 60
+        hours = self.recorded_seconds // 3600
+        minutes = (self.recorded_seconds // 60) % 60
         seconds = self.recorded_seconds % 60
-        self.time_label.setText(f"{minutes:02d}:{seconds:02d}")
+        if hours:
+            self.time_label.setText(f"{hours}:{minutes:02d}:{seconds:02d}")
+        else:
+            self.time_label.setText(f"{minutes:02d}:{seconds:02d}")
     
     def update_waveform(self):
         if not self.is_recording and not self.is_playing:
@@ -406,14 +498,26 @@ class RecorderDialog(QDialog):
         self.record_button.setText("Stop")
         self.play_button.setEnabled(False)
         self.save_button.setEnabled(False)
+        self.position_slider.setEnabled(False)
         self.status_label.setText("Recording...")
         self.waveform.set_playing(True)
         
-        # Start recording thread
+        # Discard the previous take
+        self.discard_session()
+        
+        # Remember the chosen format
+        fmt = self.format_combo.currentData()
+        settings_path = get_app_settings_path()
+        settings = load_json(settings_path)
+        settings['recording_format'] = fmt
+        save_json(settings_path, settings)
+        self.format_combo.setEnabled(False)
+        
+        # Start recording thread; segments keep long recordings bounded
         self.recording_thread = RecordingThread(
             self.audio_device,
             self.system,
-            max_seconds=60  # 1 minute max
+            fmt=fmt
         )
         
         # Connect signals
@@ -430,8 +534,9 @@ class RecorderDialog(QDialog):
         self.recorded_seconds = seconds
         self.update_timer()
     
-    def on_recording_finished(self, file_path):
-        self.recording_file = file_path
+    def on_recording_finished(self, session_dir):
+        self.session_dir = session_dir
+        self.format_combo.setEnabled(True)
         self.is_recording = False
         self.timer.stop()
         
@@ -440,6 +545,11 @@ class RecorderDialog(QDialog):
         self.play_button.setEnabled(True)
         self.save_button.setEnabled(True)
         self.status_label.setText("Recording completed!")
+        
+        # Let a start point be picked before playing
+        self.position_slider.setRange(0, self.recorded_seconds * 1000)
+        self.position_slider.setValue(0)
+        self.position_slider.setEnabled(True)
         self.waveform.set_playing(False)
         
         # Suggest a default name
@@ -449,6 +559,11 @@ class RecorderDialog(QDialog):
     def on_recording_error(self, error_message):
         self.is_recording = False
         self.timer.stop()
+        self.format_combo.setEnabled(True)
+        
+        # Drop whatever was written before the error
+        self.session_dir = self.recording_thread.session_dir
+        self.discard_session()
         
         # Update UI
         self.record_button.setText("Record")
@@ -464,7 +579,8 @@ class RecorderDialog(QDialog):
             self.recording_thread.stop_recording()
     
     def play_recording(self):
-        if not self.recording_file or not os.path.exists(self.recording_file):
+        segments = list_segments(self.session_dir) if self.session_dir else []
+        if not segments:
             QMessageBox.warning(self, "Playback Error", "No recording available to play.")
             return
         
@@ -473,36 +589,77 @@ class RecorderDialog(QDialog):
         
         if self.is_playing:
             # Stop current playback
-            self.playback_thread.stop_playback()
-            self.is_playing = False
-            self.play_button.setText("Play")
-            self.waveform.set_playing(False)
+            self.stop_preview()
+            return
+        
+        try:
+            # Play through the mixer, from the scrub position if one was picked
+            self.preview = PreviewPlayer(segments)
+            self.position_slider.setRange(0, int(self.preview.duration * 1000))
+            position = self.position_slider.value() / 1000.0
+            if position >= self.preview.duration:
+                position = 0.0
+            self.preview.play(position)
+        except Exception as e:
+            logger.error("Playback error: %s", e, exc_info=True)
+            QMessageBox.warning(self, "Playback Error", f"Failed to play recording: {str(e)}")
+            self.preview = None
             return
         
-        # Start playback
         self.is_playing = True
         self.play_button.setText("Stop")
         self.status_label.setText("Playing recording...")
         self.waveform.set_playing(True)
+        self.position_slider.setEnabled(True)
+        self.playback_timer.start(int(METER_BLOCK_SECONDS * 1000))
+    
+    def update_playback(self):
+        if not self.preview:
+            return
         
-        # Start playback thread
-        self.playback_thread = PlaybackThread(self.recording_file)
+        # Advance through the segments; stops exactly when the mixer reports the end
+        if not self.preview.poll():
+            self.on_playback_finished()
+            return
         
-        # Connect signals
-        self.playback_thread.level_signal.connect(self.waveform.update_audio_level)
-        self.playback_thread.finished_signal.connect(self.on_playback_finished)
+        position = self.preview.position()
+        if not self.position_slider.isSliderDown():
+            self.position_slider.setValue(int(position * 1000))
+        self.update_position_label(position)
         
-        # Start thread
-        self.playback_thread.start()
+        rms, peak = self.preview.levels(METER_BLOCK_SECONDS)
+        self.waveform.update_audio_level(level_to_percent(0.7 * rms + 0.3 * peak))
+    
+    def update_position_label(self, position):
+        total = self.preview.duration if self.preview else 0
+        self.position_label.setText(
+            f"{int(position) // 60}:{int(position) % 60:02d} / {int(total) // 60}:{int(total) % 60:02d}"
+        )
+    
+    def seek_preview(self):
+        position = self.position_slider.value() / 1000.0
+        if self.is_playing and self.preview:
+            self.preview.play(position)
+        self.update_position_label(position)
+    
+    def stop_preview(self):
+        self.playback_timer.stop()
+        if self.preview:
+            self.preview.stop()
+        self.on_playback_finished()
     
     def on_playback_finished(self):
+        self.playback_timer.stop()
         self.is_playing = False
         self.play_button.setText("Play")
         self.status_label.setText("Ready")
         self.waveform.set_playing(False)
+        self.position_slider.setValue(0)
+        self.update_position_label(0)
     
     def save_recording(self):
-        if not self.recording_file or not os.path.exists(self.recording_file):
+        segments = list_segments(self.session_dir) if self.session_dir else []
+        if not segments:
             QMessageBox.warning(self, "Save Error", "No recording available to save.")
             return
         
@@ -521,7 +678,8 @@ class RecorderDialog(QDialog):
         if not os.path.exists(self.tab_dir):
             os.makedirs(self.tab_dir, exist_ok=True)
         
-        output_path = os.path.join(self.tab_dir, f"{safe_name}.wav")
+        extension = os.path.splitext(segments[0])[1]
+        output_path = os.path.join(self.tab_dir, f"{safe_name}{extension}")
         
         # Check if file already exists
         if os.path.exists(output_path):
@@ -534,11 +692,16 @@ class RecorderDialog(QDialog):
             if reply != QMessageBox.StandardButton.Yes:
                 return
         
+        # Stop playback before the segments are moved away
+        if self.is_playing:
+            self.stop_preview()
+        
         try:
-            # Copy the file
-            with open(self.recording_file, 'rb') as src_file:
-                with open(output_path, 'wb') as dst_file:
-                    dst_file.write(src_file.read())
+            # Move the segments into place (replacing, not overwriting in place,
+            # since an existing sound may be a link shared with other tabs)
+            join_segments(segments, output_path)
+            self.saved_path = output_path
+            self.discard_session()
             
             QMessageBox.information(self, "Success", f"Sound '{safe_name}' saved successfully!")
             self.accept()  # Close dialog with success
@@ -546,13 +709,28 @@ class RecorderDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save recording: {str(e)}")
     
-    def closeEvent(self, event):
-        # Clean up resources
+    def discard_session(self):
+        # Remove the segments of the current recording
+        if self.session_dir:
+            shutil.rmtree(self.session_dir, ignore_errors=True)
+            self.session_dir = None
+    
+    def stop_and_discard(self):
+        # Stop recording and playback, and throw away an unsaved recording
         if self.is_recording:
+            self.is_recording = False
             self.recording_thread.stop_recording()
+            self.recording_thread.wait()
+            self.session_dir = self.recording_thread.session_dir
         
-        if self.is_playing and self.playback_thread:
-            self.playback_thread.stop_playback()
+        if self.is_playing:
+            self.stop_preview()
+        
+        self.discard_session()
+    
+    def closeEvent(self, event):
+        # Clean up resources
+        self.stop_and_discard()
         
         # Stop timers
         self.timer.stop()
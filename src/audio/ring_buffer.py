@@ -0,0 +1,92 @@
+"""
+Fixed-size ring buffer of raw PCM for instant replay.
+
+The buffer is allocated once (as a NumPy array when NumPy is installed);
+captured audio is read straight into it with readinto, so capture allocates
+nothing per block and the memory footprint doesn't change however long
+capture runs.
+"""
+import wave
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class RingBuffer:
+    """Keeps the most recent capacity bytes of a PCM stream."""
+
+    def __init__(self, seconds, rate=44100, channels=2, sample_width=2):
+        self.rate = rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.frame_bytes = channels * sample_width
+        self.capacity = int(seconds * rate) * self.frame_bytes
+        if numpy is not None:
+            self.buffer = numpy.zeros(self.capacity, dtype=numpy.uint8)
+        else:
+            self.buffer = bytearray(self.capacity)
+        self.view = memoryview(self.buffer)
+        self.position = 0  # Where the next byte goes
+        self.filled = 0  # Bytes of valid audio, up to capacity
+
+    def _advance(self, count):
+        self.position = (self.position + count) % self.capacity
+        self.filled = min(self.capacity, self.filled + count)
+
+    def fill_from(self, stream, max_bytes):
+        """
+        Read up to max_bytes from a binary stream directly into the buffer.
+
+        Reads stop at the end of the buffer, so the returned view of the new
+        data is always contiguous. Returns that view, which is empty at the
+        end of the stream.
+        """
+        start = self.position
+        count = stream.readinto(self.view[start:start + min(max_bytes, self.capacity - start)]) or 0
+        self._advance(count)
+        return self.view[start:start + count]
+
+    def write(self, data):
+        """Copy bytes into the buffer, keeping only the newest capacity bytes."""
+        data = memoryview(data).cast('B')
+        if len(data) > self.capacity:
+            # Skip the bytes that would be overwritten, keeping frame alignment
+            skipped = len(data) - self.capacity
+            self.position = (self.position + skipped) % self.capacity
+            data = data[skipped:]
+        first = min(len(data), self.capacity - self.position)
+        self.buffer[self.position:self.position + first] = data[:first]
+        self.buffer[:len(data) - first] = data[first:]
+        self._advance(len(data))
+
+    def chunks(self):
+        """Get views of the buffered audio, oldest first, without copying."""
+        # Drop a partial frame at the start so channels stay aligned
+        if self.filled < self.capacity:
+            return [self.view[:self.filled - self.filled % self.frame_bytes]]
+        start = self.position + (-self.position) % self.frame_bytes
+        if start >= self.capacity:
+            return [self.view[:self.position - self.position % self.frame_bytes]]
+        return [self.view[start:], self.view[:self.position - self.position % self.frame_bytes]]
+
+    def duration(self):
+        """Length of the buffered audio in seconds."""
+        return self.filled / float(self.rate * self.frame_bytes)
+
+    def snapshot(self):
+        """Copy the buffered audio, oldest first, so it can be written out while the buffer keeps filling."""
+        return [bytes(chunk) for chunk in self.chunks()]
+
+    def write_wav(self, path, chunks=None):
+        """Write the buffered audio, or a snapshot() of it, to a WAV file."""
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(self.channels)
+            wf.setsampwidth(self.sample_width)
+            wf.setframerate(self.rate)
+            for chunk in self.chunks() if chunks is None else chunks:
+                wf.writeframes(chunk)
+
+    def clear(self):
+        self.position = 0
+        self.filled = 0
@@ -0,0 +1,148 @@
+"""
+Segmented recordings.
+
+Recordings are written by ffmpeg as a series of segment files in a session
+directory, so they can run for hours without any single file or buffer
+growing with the recording. Saving moves a single segment into place, or
+joins several with ffmpeg's concat demuxer (stream copy, no re-encoding).
+"""
+import os
+import re
+import time
+import wave
+import shutil
+import tempfile
+import subprocess
+
+from src.utils.file_utils import get_data_dir, ensure_dir_exists
+
+# Length of each segment file
+SEGMENT_SECONDS = 300
+
+# Formats a recording can be written in: file extension, encoder arguments and sample rate
+RECORDING_FORMATS = {
+    'wav': {'ext': '.wav', 'codec_args': ["-acodec", "pcm_s16le"], 'rate': 44100},
+    'flac': {'ext': '.flac', 'codec_args': ["-acodec", "flac"], 'rate': 44100},
+    # Opus only supports 48 kHz (and lower telephony rates)
+    'opus': {'ext': '.opus', 'codec_args': ["-acodec", "libopus", "-b:a", "128k"], 'rate': 48000},
+}
+
+SEGMENT_PATTERN = re.compile(r'^segment_(\d+)\.\w+$')
+
+# Frames copied at a time when joining WAV segments without ffmpeg
+WAV_JOIN_FRAMES = 64 * 1024
+
+def create_session_dir():
+    """
+    Create a directory for the segments of a new recording.
+
+    It lives in the data directory rather than the system temp directory, so
+    that saving a single segment into a tab is a rename on the same disk.
+    """
+    recordings_dir = ensure_dir_exists(os.path.join(get_data_dir(), "recordings"))
+    return tempfile.mkdtemp(prefix="session_", dir=recordings_dir)
+
+def remove_stale_sessions(max_age=24 * 60 * 60):
+    """Remove session directories left behind by recordings that were never saved."""
+    recordings_dir = os.path.join(get_data_dir(), "recordings")
+    try:
+        entries = list(os.scandir(recordings_dir))
+    except OSError:
+        return
+    cutoff = time.time() - max_age
+    for entry in entries:
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            continue
+
+def build_segment_output_args(session_dir, fmt="wav", channels=2, segment_seconds=SEGMENT_SECONDS):
+    """Build the ffmpeg output arguments that write a recording as rolling segments."""
+    settings = RECORDING_FORMATS[fmt]
+    return [
+        *settings['codec_args'],
+        "-ar", str(settings['rate']),
+        "-ac", str(channels),
+        "-f", "segment",
+        "-segment_time", str(segment_seconds),
+        "-reset_timestamps", "1",
+        os.path.join(session_dir, "segment_%05d" + settings['ext'])
+    ]
+
+def list_segments(session_dir):
+    """List the segment files of a recording session in order."""
+    try:
+        names = os.listdir(session_dir)
+    except OSError:
+        return []
+    segments = [(int(match.group(1)), name) for name in names for match in [SEGMENT_PATTERN.match(name)] if match]
+    return [os.path.join(session_dir, name) for _, name in sorted(segments)]
+
+def write_concat_list(segments, list_path):
+    """Write an ffmpeg concat demuxer list for the segments."""
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for segment in segments:
+            escaped = os.path.abspath(segment).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    return list_path
+
+def _move(src_path, dst_path):
+    try:
+        os.replace(src_path, dst_path)
+    except OSError:
+        # Different filesystem, fall back to copy and delete
+        shutil.move(src_path, dst_path)
+
+def _join_wav(segments, output_path):
+    # Stream the frames of each segment into one file, a chunk at a time
+    tmp_path = output_path + ".part"
+    with wave.open(segments[0], 'rb') as first:
+        params = first.getparams()
+    with wave.open(tmp_path, 'wb') as out:
+        out.setparams(params)
+        for segment in segments:
+            with wave.open(segment, 'rb') as wf:
+                while True:
+                    frames = wf.readframes(WAV_JOIN_FRAMES)
+                    if not frames:
+                        break
+                    out.writeframesraw(frames)
+    os.replace(tmp_path, output_path)
+
+def join_segments(segments, output_path, ffmpeg="ffmpeg"):
+    """
+    Combine recording segments into output_path.
+
+    A single segment is moved into place, which is a rename when both are on
+    the same filesystem. Several segments are joined with ffmpeg's concat
+    demuxer without re-encoding; WAV segments can also be joined without
+    ffmpeg. Memory use doesn't depend on the recording length either way.
+    """
+    if not segments:
+        raise ValueError("No recording segments to save")
+
+    if len(segments) == 1:
+        _move(segments[0], output_path)
+        return output_path
+
+    tool = shutil.which(ffmpeg)
+    if not tool:
+        if output_path.lower().endswith('.wav'):
+            _join_wav(segments, output_path)
+            return output_path
+        raise RuntimeError("FFmpeg is required to join the recording segments")
+
+    list_path = write_concat_list(segments, os.path.join(os.path.dirname(segments[0]), "segments.txt"))
+    tmp_path = output_path + ".part" + os.path.splitext(output_path)[1]
+    result = subprocess.run(
+        [tool, "-loglevel", "error", "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", tmp_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise RuntimeError(f"Failed to join recording segments: {result.stderr.decode('utf-8', errors='replace').strip()}")
+    os.replace(tmp_path, output_path)
+    return output_path
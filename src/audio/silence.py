@@ -0,0 +1,174 @@
+"""
+Silence detection for trimming and splitting sounds.
+
+A sound is decoded to 16-bit PCM once, cut into short frames and the energy
+of every frame is computed in one vectorized NumPy pass. Runs of frames
+above a threshold (relative to full scale) are the audible regions; the
+leading and trailing silence around them is what a trim removes, and long
+gaps between them are where a file holding several sounds is split.
+
+Trims are non-destructive: they are stored per tab as start and end times
+and only applied when a sound is played.
+"""
+import os
+import wave
+import shutil
+import subprocess
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Length of each analysis frame
+FRAME_SECONDS = 0.02
+
+# Frames quieter than this (dBFS) count as silence
+THRESHOLD_DB = -45.0
+
+# Silence kept around the audible part, so attacks and tails aren't clipped
+PAD_SECONDS = 0.05
+
+# Quieter stretches shorter than this don't end a sound
+MIN_GAP_SECONDS = 0.6
+
+# Audible regions shorter than this are treated as clicks and dropped when splitting
+MIN_SOUND_SECONDS = 0.15
+
+# Format sounds are decoded to when they aren't 16-bit WAV already
+DECODE_RATE = 44100
+DECODE_CHANNELS = 2
+
+def decode_pcm(path, ffmpeg="ffmpeg"):
+    """
+    Decode a sound file to an int16 array of shape (frames, channels).
+
+    16-bit WAV files are read directly; everything else is decoded by ffmpeg.
+    Returns (samples, rate).
+    """
+    if numpy is None:
+        raise RuntimeError("NumPy is required for silence detection")
+
+    if path.lower().endswith('.wav'):
+        try:
+            with wave.open(path, 'rb') as wf:
+                if wf.getsampwidth() == 2:
+                    channels = wf.getnchannels()
+                    data = wf.readframes(wf.getnframes())
+                    samples = numpy.frombuffer(data, dtype='<i2')
+                    samples = samples[:len(samples) - len(samples) % channels]
+                    return samples.reshape(-1, channels), wf.getframerate()
+        except (wave.Error, EOFError):
+            pass  # Not a plain PCM WAV, let ffmpeg handle it
+
+    tool = shutil.which(ffmpeg)
+    if not tool:
+        raise RuntimeError(f"FFmpeg is required to analyze {os.path.basename(path)}")
+    result = subprocess.run(
+        [tool, "-loglevel", "error", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le",
+         "-ar", str(DECODE_RATE), "-ac", str(DECODE_CHANNELS), "pipe:1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to decode {os.path.basename(path)}: {result.stderr.decode('utf-8', errors='replace').strip()}")
+    samples = numpy.frombuffer(result.stdout, dtype='<i2')
+    samples = samples[:len(samples) - len(samples) % DECODE_CHANNELS]
+    return samples.reshape(-1, DECODE_CHANNELS), DECODE_RATE
+
+def frame_energies(samples, rate, frame_seconds=FRAME_SECONDS):
+    """Get the RMS level of each frame in dBFS, across all channels."""
+    frame_length = max(1, int(rate * frame_seconds))
+    count = len(samples) // frame_length
+    if count == 0:
+        return numpy.zeros(0)
+
+    frames = samples[:count * frame_length].reshape(count, -1).astype(numpy.float32)
+    mean_square = numpy.einsum('ij,ij->i', frames, frames) / frames.shape[1]
+    with numpy.errstate(divide='ignore'):
+        return 10 * numpy.log10(mean_square / (32768.0 * 32768.0))
+
+def find_regions(energies, frame_seconds=FRAME_SECONDS, threshold_db=THRESHOLD_DB,
+                 min_gap=MIN_GAP_SECONDS, min_sound=0.0, pad=PAD_SECONDS):
+    """
+    Find the audible regions in a sequence of frame energies.
+
+    Returns a list of (start, end) times in seconds. Regions separated by
+    less than min_gap of silence are merged, regions shorter than min_sound
+    are dropped and each one is widened by pad on both sides.
+    """
+    loud = numpy.asarray(energies) > threshold_db
+    if not loud.any():
+        return []
+
+    # Frame indices where runs of loud frames start and end
+    edges = numpy.diff(numpy.concatenate(([0], loud.astype(numpy.int8), [0])))
+    starts = numpy.flatnonzero(edges == 1)
+    ends = numpy.flatnonzero(edges == -1)
+
+    # Merge runs separated by short gaps
+    gap_frames = int(round(min_gap / frame_seconds))
+    keep = numpy.concatenate(([True], starts[1:] - ends[:-1] >= gap_frames))
+    starts = starts[keep]
+    ends = numpy.concatenate((ends[numpy.flatnonzero(keep)[1:] - 1], ends[-1:]))
+
+    total = len(loud) * frame_seconds
+    regions = []
+    for start, end in zip(starts * frame_seconds, ends * frame_seconds):
+        if end - start < min_sound:
+            continue
+        regions.append((float(max(0.0, start - pad)), float(min(total, end + pad))))
+    return regions
+
+def analyze_sound(path, threshold_db=THRESHOLD_DB, min_gap=MIN_GAP_SECONDS, ffmpeg="ffmpeg"):
+    """
+    Analyze a sound for silence.
+
+    Returns a dict with the sound's 'duration', the 'trim' (start, end) that
+    drops leading and trailing silence (None if the sound is all silence)
+    and the audible 'regions' it could be split into.
+    """
+    samples, rate = decode_pcm(path, ffmpeg)
+    duration = len(samples) / float(rate)
+    energies = frame_energies(samples, rate)
+
+    audible = find_regions(energies, threshold_db=threshold_db, min_gap=min_gap)
+    trim = (audible[0][0], audible[-1][1]) if audible else None
+    regions = find_regions(energies, threshold_db=threshold_db, min_gap=min_gap, min_sound=MIN_SOUND_SECONDS)
+    return {
+        'duration': duration,
+        'trim': trim,
+        'regions': regions
+    }
+
+def is_worth_trimming(analysis, min_saving=0.1):
+    """Check whether a trim would cut off a noticeable amount of silence."""
+    trim = analysis['trim']
+    return bool(trim) and analysis['duration'] - (trim[1] - trim[0]) >= min_saving
+
+def split_sound(path, regions, output_dir, ffmpeg="ffmpeg"):
+    """
+    Write each audible region of a sound to its own WAV file.
+
+    Files are named '<name> (1).wav', '<name> (2).wav' and so on, skipping
+    names that are taken. The original file is left alone. Returns the
+    paths of the new files.
+    """
+    samples, rate = decode_pcm(path, ffmpeg)
+    name = os.path.splitext(os.path.basename(path))[0]
+    created = []
+    number = 1
+    for start, end in regions:
+        while True:
+            output_path = os.path.join(output_dir, f"{name} ({number}).wav")
+            number += 1
+            if not os.path.exists(output_path):
+                break
+        part = samples[int(start * rate):int(end * rate)]
+        with wave.open(output_path, 'wb') as wf:
+            wf.setnchannels(samples.shape[1])
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            wf.writeframes(part.astype('<i2').tobytes())
+        created.append(output_path)
+    return created
@@ -0,0 +1,105 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+from src.utils.blob_store import blob_key
+from src.utils.logger import logger
+from src.utils.perf import start_timer, log_elapsed
+from src.utils.tracing import span
+from src.utils.metrics import get_metrics
+
+# Default budget for decoded sounds kept in memory
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Cache metrics
+cache_hits_counter = get_metrics().counter("cxrruptpad_sound_cache_hits_total", "Sounds served already decoded")
+cache_misses_counter = get_metrics().counter("cxrruptpad_sound_cache_misses_total", "Sounds that had to be decoded or trimmed")
+cache_evictions_counter = get_metrics().counter("cxrruptpad_sound_cache_evictions_total", "Decoded sounds dropped to stay within budget")
+cache_bytes_gauge = get_metrics().gauge("cxrruptpad_sound_cache_bytes", "Memory held by decoded sounds")
+decode_histogram = get_metrics().histogram("cxrruptpad_decode_seconds", "Time to decode a sound file", ("ext",))
+
+class SoundCache:
+    """
+    LRU cache of decoded pygame sounds, keyed by blob.
+
+    Tab entries with the same content are links to one blob, so they share a
+    single decoded copy no matter how many tabs they appear in.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict()  # {key: (sound, size)}
+        self.lock = threading.Lock()
+
+    def get(self, path, trim=None):
+        """
+        Get the decoded sound for a file, decoding it on a cache miss.
+
+        A trim of (start, end) seconds gets just that part of the sound,
+        cut from the full decoded copy and cached alongside it.
+        """
+        key = blob_key(path)
+        if trim:
+            key += f":{trim[0]:.3f}-{trim[1]:.3f}"
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached:
+                self.entries.move_to_end(key)
+                cache_hits_counter.inc()
+                return cached[0]
+
+        cache_misses_counter.inc()
+        if trim:
+            sound = self.trim_sound(self.get(path), *trim)
+        else:
+            ext = os.path.splitext(path)[1].lower()
+            started = start_timer()
+            with span("sound.decode", ext=ext):
+                sound = pygame.mixer.Sound(path)
+            elapsed = log_elapsed("sound.decode", started, ext=ext, seconds=round(sound.get_length(), 2))
+            decode_histogram.observe(elapsed, (ext,))
+        self.put(key, sound)
+        return sound
+
+    def put(self, key, sound):
+        size = self.sound_size(sound)
+        with self.lock:
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (sound, size)
+            self.current_bytes += size
+
+            # Evict least recently used sounds (never the one just added)
+            while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                cache_evictions_counter.inc()
+            cache_bytes_gauge.set(self.current_bytes)
+        logger.debug("Cached decoded sound (%s bytes, %s total)", size, self.current_bytes)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+            cache_bytes_gauge.set(0)
+
+    @staticmethod
+    def trim_sound(sound, start, end=None):
+        # Slice the decoded samples on whole frames (end=None runs to the end)
+        frequency, size, channels = pygame.mixer.get_init()
+        frame_bytes = channels * (abs(size) // 8)
+        raw = sound.get_raw()
+        end_byte = len(raw) if end is None else int(end * frequency) * frame_bytes
+        return pygame.mixer.Sound(buffer=raw[int(start * frequency) * frame_bytes:end_byte])
+
+    @staticmethod
+    def sound_size(sound):
+        # Decoded size from the mixer format, without copying the samples
+        frequency, size, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+# Global cache instance
+sound_cache = SoundCache()
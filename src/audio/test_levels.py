@@ -0,0 +1,66 @@
+import io
+import math
+import struct
+import unittest
+import src.audio.levels as levels
+from src.audio.levels import compute_levels, level_to_percent, read_block
+
+class ShortReadStream(io.RawIOBase):
+    """A stream that returns at most a few bytes per read, like a pipe."""
+
+    def __init__(self, data, chunk):
+        self.data = io.BytesIO(data)
+        self.chunk = chunk
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.data.read(min(len(buffer), self.chunk))
+        buffer[:len(data)] = data
+        return len(data)
+
+def sine_block(amplitude, frames=4410):
+    samples = [int(amplitude * 32767 * math.sin(2 * math.pi * 440 * i / 44100)) for i in range(frames)]
+    return struct.pack(f"<{frames}h", *samples)
+
+class TestLevels(unittest.TestCase):
+    def test_sine_levels(self):
+        """Test that a sine wave gives the expected RMS and peak"""
+        rms, peak = compute_levels(memoryview(bytearray(sine_block(0.5))))
+        self.assertAlmostEqual(rms, 0.5 / math.sqrt(2), places=2)
+        self.assertAlmostEqual(peak, 0.5, places=2)
+        self.assertEqual(compute_levels(bytes(1000)), (0.0, 0.0))
+        self.assertEqual(compute_levels(b""), (0.0, 0.0))
+
+    def test_fallback_matches_numpy(self):
+        """Test that the pure Python fallback gives the same levels"""
+        block = sine_block(0.8) + struct.pack("<h", -32768)
+        expected = compute_levels(block)
+        numpy, levels.numpy = levels.numpy, None
+        try:
+            rms, peak = compute_levels(block)
+        finally:
+            levels.numpy = numpy
+        self.assertAlmostEqual(rms, expected[0])
+        self.assertEqual(peak, expected[1])
+        self.assertEqual(peak, 1.0)
+
+    def test_meter_scale(self):
+        """Test that levels map onto the meter on a dB scale"""
+        self.assertEqual(level_to_percent(1.0), 100)
+        self.assertEqual(level_to_percent(0.0), 0)
+        self.assertEqual(level_to_percent(0.0001), 0)
+        self.assertEqual(level_to_percent(10 ** (-30 / 20)), 50)
+
+    def test_read_block_fills_buffer(self):
+        """Test that short reads are combined into one full block"""
+        stream = ShortReadStream(bytes(range(256)) * 4, chunk=100)
+        view = memoryview(bytearray(600))
+        self.assertEqual(read_block(stream, view), 600)
+        self.assertEqual(bytes(view[:3]), bytes([0, 1, 2]))
+        self.assertEqual(read_block(stream, view), 424)
+        self.assertEqual(read_block(stream, view), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.audio.media_cache import MediaCache, media_key
+
+class TestMediaCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.root, "cache")
+        self.tab_dir = os.path.join(self.root, "tab")
+        os.makedirs(self.tab_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, name, size):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        return path
+
+    def test_media_key(self):
+        """Test that different URL forms of one video share a key"""
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10",
+            "https://youtu.be/dQw4w9WgXcQ?si=abc",
+            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+            "https://music.youtube.com/watch?v=dQw4w9WgXcQ"
+        ]
+        self.assertEqual({media_key(url) for url in urls}, {"youtube:dQw4w9WgXcQ"})
+        self.assertEqual(media_key("https://example.com/a", "Vimeo", "123"), "vimeo:123")
+        self.assertTrue(media_key("https://example.com/a").startswith("url:"))
+        self.assertNotEqual(media_key("https://example.com/a"), media_key("https://example.com/b"))
+
+    def test_fetch_links_cached_file(self):
+        """Test that a cached file is placed into a tab as a link"""
+        cache = MediaCache(self.cache_dir)
+        source = self.write("download.mp3", 1024)
+        cache.store("youtube:abc", source)
+        self.assertIsNone(cache.fetch("youtube:missing", os.path.join(self.tab_dir, "other")))
+
+        result = MediaCache(self.cache_dir).fetch("youtube:abc", os.path.join(self.tab_dir, "clip"))
+        self.assertEqual(result, os.path.join(self.tab_dir, "clip.mp3"))
+        self.assertTrue(os.path.samefile(result, source))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted beyond the size cap"""
+        cache = MediaCache(self.cache_dir, max_bytes=2500)
+        cache.store("a", self.write("a.mp3", 1000))
+        cache.store("b", self.write("b.mp3", 1000))
+        # Using "a" makes "b" the oldest entry
+        cache.entries["a"]['last_used'] += 10
+        self.assertIsNotNone(cache.lookup("a"))
+        cache.store("c", self.write("c.mp3", 1000))
+
+        self.assertEqual(sorted(cache.entries), ["a", "c"])
+        self.assertLessEqual(cache.total_bytes(), 2500)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, "b.mp3")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import time
+import wave
+import shutil
+import tempfile
+import unittest
+
+# Play through SDL's dummy drivers so no sound card is needed
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.audio.preview import PreviewPlayer
+from src.audio.sound_cache import sound_cache
+
+def write_wav(path, seconds, rate=44100):
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"\x00\x10" * 2 * int(seconds * rate))
+
+class TestPreviewPlayer(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        pygame.init()
+        try:
+            pygame.mixer.init(44100, -16, 2, 1024)
+        except pygame.error as e:
+            self.skipTest(f"No mixer available: {e}")
+        self.segments = []
+        for index in range(2):
+            path = os.path.join(self.root, f"segment_{index:05d}.wav")
+            write_wav(path, 0.5)
+            self.segments.append(path)
+
+    def tearDown(self):
+        sound_cache.clear()
+        pygame.mixer.quit()
+        shutil.rmtree(self.root)
+
+    def play_to_end(self, player, timeout=5):
+        deadline = time.monotonic() + timeout
+        while player.poll() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_plays_segments_back_to_back(self):
+        """Test that a take plays across its segments and reports its end"""
+        player = PreviewPlayer(self.segments)
+        self.assertAlmostEqual(player.duration, 1.0, places=2)
+        self.assertEqual(player.offsets, [0.0, 0.5])
+
+        player.play()
+        self.assertTrue(player.playing)
+        self.play_to_end(player)
+        self.assertFalse(player.playing)
+        self.assertEqual(player.index, 1)
+
+    def test_seek_into_later_segment(self):
+        """Test that seeking starts the right segment part way through"""
+        player = PreviewPlayer(self.segments)
+        player.play(0.75)
+        self.assertEqual(player.index, 1)
+        self.assertGreaterEqual(player.position(), 0.75)
+        self.assertAlmostEqual(player.channel.get_sound().get_length(), 0.25, places=2)
+        self.play_to_end(player)
+        self.assertFalse(player.playing)
+
+    def test_seek_past_end_does_nothing(self):
+        """Test that playing from the end of the take doesn't start playback"""
+        player = PreviewPlayer(self.segments)
+        player.play(5)
+        self.assertFalse(player.playing)
+        self.assertFalse(player.poll())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import os
+import wave
+import shutil
+import tempfile
+import unittest
+from src.audio.ring_buffer import RingBuffer
+
+class TestRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_keeps_newest_audio(self):
+        """Test that the buffer keeps only the most recent bytes, oldest first"""
+        ring = RingBuffer(1, rate=4, channels=1)  # 8 bytes
+        ring.write(b"abcdef")
+        self.assertEqual(b"".join(bytes(chunk) for chunk in ring.chunks()), b"abcdef")
+        ring.write(b"ghij")
+        self.assertEqual(b"".join(bytes(chunk) for chunk in ring.chunks()), b"cdefghij")
+        ring.write(b"0123456789")
+        self.assertEqual(b"".join(bytes(chunk) for chunk in ring.chunks()), b"23456789")
+        self.assertEqual(ring.duration(), 1.0)
+
+    def test_fill_from_reads_in_place(self):
+        """Test that stream data is read straight into the buffer in contiguous blocks"""
+        ring = RingBuffer(1, rate=5, channels=1)  # 10 bytes
+        stream = io.BytesIO(bytes(range(24)))
+        buffer_id = id(ring.buffer)
+        sizes = []
+        while True:
+            block = ring.fill_from(stream, 4)
+            if not len(block):
+                break
+            sizes.append(len(block))
+        self.assertEqual(sizes, [4, 4, 2, 4, 4, 2, 4])
+        self.assertEqual(id(ring.buffer), buffer_id)
+        self.assertEqual(b"".join(bytes(chunk) for chunk in ring.chunks()), bytes(range(14, 24)))
+
+    def test_partial_frames_are_dropped(self):
+        """Test that a wrapped buffer stays aligned to whole frames"""
+        ring = RingBuffer(1, rate=3, channels=2)  # 3 frames of 4 bytes
+        ring.write(b"AAAABBBBCCCCDD")
+        data = b"".join(bytes(chunk) for chunk in ring.chunks())
+        self.assertEqual(len(data) % 4, 0)
+        self.assertEqual(data, b"BBBBCCCC")
+
+    def test_write_wav(self):
+        """Test that the buffer is written out as a WAV file in order"""
+        ring = RingBuffer(0.5, rate=8, channels=2)  # 4 frames
+        ring.write(bytes(range(24)))
+        path = os.path.join(self.root, "replay.wav")
+        ring.write_wav(path)
+        with wave.open(path, 'rb') as wf:
+            self.assertEqual(wf.getnframes(), 4)
+            self.assertEqual(wf.readframes(4), bytes(range(8, 24)))
+
+    def test_snapshot_outlives_new_audio(self):
+        """Test that a snapshot still writes the audio it was taken of after the buffer moves on"""
+        ring = RingBuffer(0.5, rate=8, channels=2)  # 4 frames
+        ring.write(bytes(range(24)))
+        clip = ring.snapshot()
+        ring.write(bytes(8))
+        path = os.path.join(self.root, "replay.wav")
+        ring.write_wav(path, clip)
+        with wave.open(path, 'rb') as wf:
+            self.assertEqual(wf.readframes(4), bytes(range(8, 24)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import wave
+import shutil
+import tempfile
+import unittest
+from src.audio.segments import build_segment_output_args, join_segments, list_segments
+
+class TestSegments(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.session_dir = os.path.join(self.root, "session")
+        os.makedirs(self.session_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_segment(self, index, frames):
+        path = os.path.join(self.session_dir, f"segment_{index:05d}.wav")
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(2)
+            wf.setsampwidth(2)
+            wf.setframerate(44100)
+            wf.writeframes(frames)
+        return path
+
+    def test_segments_are_listed_in_order(self):
+        """Test that segments are ordered by number and other files are ignored"""
+        for index in (10, 2, 1):
+            self.write_segment(index, b"\0" * 4)
+        open(os.path.join(self.session_dir, "segments.txt"), 'w').close()
+        self.assertEqual([os.path.basename(path) for path in list_segments(self.session_dir)],
+                         ["segment_00001.wav", "segment_00002.wav", "segment_00010.wav"])
+        self.assertEqual(list_segments(os.path.join(self.root, "missing")), [])
+
+    def test_output_args(self):
+        """Test that ffmpeg writes rolling segments in the chosen format"""
+        args = build_segment_output_args(self.session_dir, "opus", segment_seconds=60)
+        self.assertIn("libopus", args)
+        self.assertEqual(args[args.index("-segment_time") + 1], "60")
+        self.assertEqual(args[args.index("-ar") + 1], "48000")
+        self.assertEqual(args[-1], os.path.join(self.session_dir, "segment_%05d.opus"))
+
+    def test_single_segment_is_moved(self):
+        """Test that saving a single segment is a rename, not a copy"""
+        segment = self.write_segment(0, b"\1\0" * 400)
+        inode = os.stat(segment).st_ino
+        output = os.path.join(self.root, "Saved.wav")
+        join_segments([segment], output)
+        self.assertFalse(os.path.exists(segment))
+        self.assertEqual(os.stat(output).st_ino, inode)
+
+    def test_wav_segments_join_without_ffmpeg(self):
+        """Test that WAV segments are joined frame by frame when ffmpeg is missing"""
+        segments = [self.write_segment(i, bytes([i]) * 4000) for i in range(3)]
+        output = os.path.join(self.root, "Joined.wav")
+        join_segments(segments, output, ffmpeg="ffmpeg-that-does-not-exist")
+        with wave.open(output, 'rb') as wf:
+            self.assertEqual(wf.getnframes(), 3000)
+            self.assertEqual(wf.getnchannels(), 2)
+            self.assertEqual(wf.readframes(3000), bytes([0]) * 4000 + bytes([1]) * 4000 + bytes([2]) * 4000)
+
+        with self.assertRaises(RuntimeError):
+            join_segments([path.replace(".wav", ".flac") for path in segments],
+                          output.replace(".wav", ".flac"), ffmpeg="ffmpeg-that-does-not-exist")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import wave
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from src.audio.silence import (
+    analyze_sound, find_regions, frame_energies, is_worth_trimming, split_sound, FRAME_SECONDS
+)
+
+RATE = 8000
+
+def tone(seconds, amplitude=8000):
+    t = numpy.arange(int(seconds * RATE))
+    return (amplitude * numpy.sin(2 * numpy.pi * 440 * t / RATE)).astype('<i2')
+
+def silence(seconds):
+    return numpy.zeros(int(seconds * RATE), dtype='<i2')
+
+def write_wav(path, samples):
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(samples.tobytes())
+
+class TestSilence(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_frame_energies(self):
+        """Test that frame levels are in dBFS, with silence far below any threshold"""
+        samples = numpy.concatenate((silence(0.1), numpy.full(int(0.1 * RATE), 16384, dtype='<i2')))
+        energies = frame_energies(samples.reshape(-1, 1), RATE)
+        self.assertEqual(len(energies), 10)
+        self.assertTrue(numpy.all(energies[:5] == -numpy.inf))
+        numpy.testing.assert_allclose(energies[5:], -6.02, atol=0.01)
+
+    def test_find_regions_merges_short_gaps(self):
+        """Test that short gaps are bridged while long ones separate regions"""
+        energies = numpy.full(100, -90.0)
+        energies[10:20] = -10  # 0.2s-0.4s
+        energies[25:30] = -10  # Short gap of 0.1s, merged
+        energies[70:80] = -10  # 1.4s-1.6s after a long gap
+        regions = find_regions(energies, FRAME_SECONDS, min_gap=0.5, pad=0.0)
+        self.assertEqual(len(regions), 2)
+        self.assertAlmostEqual(regions[0][0], 0.2)
+        self.assertAlmostEqual(regions[0][1], 0.6)
+        self.assertAlmostEqual(regions[1][0], 1.4)
+        self.assertAlmostEqual(regions[1][1], 1.6)
+        self.assertEqual(find_regions(numpy.full(10, -90.0)), [])
+
+    def test_trim_and_split(self):
+        """Test that leading/trailing silence is found and regions are split into new files"""
+        path = os.path.join(self.root, "take.wav")
+        write_wav(path, numpy.concatenate((silence(1), tone(0.5), silence(1), tone(0.5), silence(0.5))))
+
+        analysis = analyze_sound(path)
+        self.assertAlmostEqual(analysis['duration'], 3.5)
+        self.assertAlmostEqual(analysis['trim'][0], 0.95, places=2)
+        self.assertAlmostEqual(analysis['trim'][1], 3.05, places=2)
+        self.assertTrue(is_worth_trimming(analysis))
+        self.assertEqual(len(analysis['regions']), 2)
+
+        created = split_sound(path, analysis['regions'], self.root)
+        self.assertEqual([os.path.basename(p) for p in created], ["take (1).wav", "take (2).wav"])
+        with wave.open(created[0], 'rb') as wf:
+            self.assertAlmostEqual(wf.getnframes() / RATE, 0.6, places=2)
+        self.assertTrue(os.path.exists(path))  # Original kept
+
+    def test_silent_file(self):
+        """Test that an all-silent sound has nothing to trim to"""
+        path = os.path.join(self.root, "quiet.wav")
+        write_wav(path, silence(1))
+        analysis = analyze_sound(path)
+        self.assertIsNone(analysis['trim'])
+        self.assertFalse(is_worth_trimming(analysis))
+
+if __name__ == '__main__':
+    unittest.main()
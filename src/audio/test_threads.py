@@ -0,0 +1,70 @@
+import os
+import sys
+import wave
+import shutil
+import tempfile
+import unittest
+import subprocess
+from src.audio.threads import ImportSoundsThread, PlaylistDownloadThread
+
+def write_wav(path, frames):
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(8000)
+        wf.writeframes(bytes(frames * 2))
+
+class TestImportSoundsThread(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.pack = os.path.join(self.root, 'pack')
+        self.tab_dir = os.path.join(self.root, 'tab')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_same_names_in_subfolders(self):
+        """Test that files sharing a name in different subfolders are all imported under their own names"""
+        for i, folder in enumerate(('drums', 'drums/acoustic', 'fx')):
+            os.makedirs(os.path.join(self.pack, folder))
+            write_wav(os.path.join(self.pack, folder, 'kick.wav'), 800 * (i + 1))
+        os.makedirs(self.tab_dir)
+        write_wav(os.path.join(self.tab_dir, 'kick (2).wav'), 10)
+
+        thread = ImportSoundsThread(self.pack, self.tab_dir)
+        imported = []
+        finished = []
+        thread.sound_imported_signal.connect(lambda sound, replaced: imported.append((sound['name'], replaced)))
+        thread.finished_signal.connect(lambda count, failures, cancelled: finished.append((count, failures)))
+        thread.run()
+
+        self.assertEqual(finished, [(3, [])])
+        self.assertEqual(sorted(imported), [("kick", False), ("kick (3)", False), ("kick (4)", False)])
+        self.assertEqual(sorted(os.listdir(self.tab_dir)), ['kick (2).wav', 'kick (3).wav', 'kick (4).wav', 'kick.wav'])
+        # Every source made it in whole
+        sizes = sorted(os.path.getsize(os.path.join(self.tab_dir, name)) for name in ('kick.wav', 'kick (3).wav', 'kick (4).wav'))
+        self.assertEqual(sizes, sorted(os.path.getsize(os.path.join(self.pack, folder, 'kick.wav'))
+                                       for folder in ('drums', 'drums/acoustic', 'fx')))
+
+class TestPlaylistDownloadThread(unittest.TestCase):
+    def test_repeated_titles(self):
+        """Test that playlist entries with the same title are downloaded to different files"""
+        thread = PlaylistDownloadThread([], "/tabs/Mix", add_prefix=False)
+        paths = [thread.claim_output_path(thread.make_output_path(i, "Intro!")) for i in range(3)]
+        self.assertEqual(paths, [os.path.join("/tabs/Mix", name) for name in ("Intro", "Intro (2)", "Intro (3)")])
+
+class TestProcessPoolImports(unittest.TestCase):
+    def test_workers_stay_light(self):
+        """Test that a spawned worker re-running main.py and probing metadata imports no GUI modules"""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        code = (
+            "import runpy, sys; runpy.run_path('main.py', run_name='__mp_main__'); "
+            "from src.audio.metadata import probe_sound_file; probe_sound_file('missing.wav'); "
+            "print(sorted(m for m in ('PyQt6', 'pygame', 'src.main', 'src.utils.logger') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+if __name__ == '__main__':
+    unittest.main()
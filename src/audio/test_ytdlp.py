@@ -0,0 +1,257 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from src.audio.ytdlp import (
+    DownloadQueue, DownloadJournal, DownloadError, ProgressParser, RetryPolicy, PROGRESS_RATE,
+    download_audio, diff_playlist, entry_to_item, format_progress_stats, iter_playlist_entries
+)
+from src.audio.media_cache import MediaCache
+
+# A stand-in for yt-dlp: writes <output>.mp3 and prints progress lines in the
+# --progress-template format. URLs containing "fail" always fail, "flaky"
+# fails on the first attempt and "burst" prints a flood of progress lines.
+# With --flat-playlist it lists three entries as JSON lines instead.
+STUB_SCRIPT = '''#!{python}
+import os, sys, time, json
+args = sys.argv[1:]
+if "--flat-playlist" in args:
+    if "fail" in args[-1]:
+        print("ERROR: playlist does not exist")
+        sys.exit(1)
+    print("WARNING: listing entries")
+    for i in range(3):
+        print(json.dumps({{"id": f"vid{{i}}", "url": f"vid{{i}}", "title": f"Video {{i}}", "ie_key": "Youtube"}}), flush=True)
+    sys.exit(0)
+template = args[args.index("--output") + 1]
+url = args[-1]
+out_dir = os.path.dirname(template)
+with open(os.path.join(out_dir, "calls.log"), "a") as log:
+    log.write(f"start {{time.time()}} {{url}}\\n")
+if "fail" in url:
+    print("ERROR: unavailable video")
+    sys.exit(1)
+marker = os.path.join(out_dir, url.replace("/", "_") + ".seen")
+if "flaky" in url and not os.path.exists(marker):
+    open(marker, "w").close()
+    sys.exit(1)
+assert "--progress-template" in args
+total = 1000000
+if "burst" in url:
+    for done in range(1, 1001):
+        print(f"[cxp] {{done * total // 1000}} {{total}} NA 2097152.0 {{(1000 - done) // 500}}", flush=True)
+else:
+    for percent in (10.0, 55.5, 100.0):
+        print(f"[cxp] {{int(total * percent / 100)}} NA {{total}} 1048576.0 1", flush=True)
+        time.sleep(0.15)
+with open(template.replace("%(ext)s", "mp3"), "wb") as f:
+    f.write(b"ID3")
+with open(os.path.join(out_dir, "calls.log"), "a") as log:
+    log.write(f"end {{time.time()}} {{url}}\\n")
+'''
+
+@unittest.skipIf(os.name == 'nt', "stub downloader is a POSIX script")
+class TestYtDlp(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.tool = os.path.join(self.root, "yt-dlp")
+        with open(self.tool, 'w') as f:
+            f.write(STUB_SCRIPT.format(python=sys.executable))
+        os.chmod(self.tool, 0o755)
+        self.out_dir = os.path.join(self.root, "tab")
+        os.makedirs(self.out_dir)
+        self.no_wait = RetryPolicy(max_attempts=3, base_delay=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_download_reports_progress(self):
+        """Test that a download produces the mp3 and reports progress"""
+        progress = []
+        result = download_audio(
+            "https://example.com/ok", os.path.join(self.out_dir, "clip"),
+            tool=self.tool, retry_policy=self.no_wait, progress_callback=progress.append
+        )
+        self.assertEqual(result, os.path.join(self.out_dir, "clip.mp3"))
+        self.assertTrue(os.path.exists(result))
+        self.assertEqual(progress, [10, 55, 100, 100])
+
+    def test_download_served_from_media_cache(self):
+        """Test that a repeated video is linked from the media cache instead of downloaded"""
+        cache = MediaCache(os.path.join(self.root, "cache"))
+        url = "https://www.youtube.com/watch?v=abcdefghijk"
+        first = download_audio(url, os.path.join(self.out_dir, "first"), tool=self.tool,
+                               retry_policy=self.no_wait, media_cache=cache)
+        second = download_audio("https://youtu.be/abcdefghijk", os.path.join(self.out_dir, "second"),
+                                tool=self.tool, retry_policy=self.no_wait, media_cache=cache)
+
+        self.assertEqual(second, os.path.join(self.out_dir, "second.mp3"))
+        self.assertTrue(os.path.samefile(first, second))
+        with open(os.path.join(self.out_dir, "calls.log")) as f:
+            self.assertEqual(sum(line.startswith("start") for line in f), 1)
+
+    def test_progress_is_throttled(self):
+        """Test that a flood of progress lines is combined into a few updates with stats"""
+        progress = []
+        stats = []
+        start = time.monotonic()
+        download_audio(
+            "https://example.com/burst", os.path.join(self.out_dir, "burst"),
+            tool=self.tool, retry_policy=self.no_wait,
+            progress_callback=progress.append, stats_callback=stats.append
+        )
+        elapsed = time.monotonic() - start
+        self.assertLessEqual(len(stats), elapsed * PROGRESS_RATE + 1)
+        self.assertEqual(progress[-1], 100)
+        self.assertEqual(stats[0]['speed'], 2097152.0)
+
+    def test_progress_parser(self):
+        """Test that template and legacy progress lines give percent, speed and ETA"""
+        parser = ProgressParser()
+        self.assertEqual(parser.parse("[cxp] 512 1024 NA 2048.0 65\n"),
+                         {'percent': 50.0, 'speed': 2048.0, 'eta': 65})
+        self.assertEqual(parser.parse("[cxp] 256 NA 1024 NA NA"),
+                         {'percent': 25.0, 'speed': None, 'eta': None})
+        self.assertIsNone(parser.parse("[cxp] NA NA NA NA NA"))
+        self.assertEqual(parser.parse("[download]  55.5% of 1.00MiB at 1.50MiB/s ETA 01:05"),
+                         {'percent': 55.5, 'speed': 1.5 * 1024 * 1024, 'eta': 65})
+        self.assertIsNone(parser.parse("[youtube] Extracting URL"))
+        self.assertEqual(format_progress_stats({'percent': 55.5, 'speed': 1.5 * 1024 * 1024, 'eta': 65},
+                                               with_percent=True), "55% (1.5 MB/s, 1:05 left)")
+
+    def test_retry_and_failure(self):
+        """Test that flaky downloads are retried and broken ones give up"""
+        retries = []
+        download_audio(
+            "https://example.com/flaky", os.path.join(self.out_dir, "flaky"),
+            tool=self.tool, retry_policy=self.no_wait, retry_callback=retries.append
+        )
+        self.assertEqual(retries, [1])
+
+        with self.assertRaises(DownloadError):
+            download_audio(
+                "https://example.com/fail", os.path.join(self.out_dir, "broken"),
+                tool=self.tool, retry_policy=self.no_wait
+            )
+
+    def test_retry_delay_backoff(self):
+        """Test that retry delays grow exponentially and stay within the jitter range"""
+        policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=0.5)
+        for attempt, backoff in ((1, 1.0), (2, 2.0), (3, 4.0), (6, 10.0)):
+            delay = policy.delay(attempt)
+            self.assertGreaterEqual(delay, backoff * 0.5)
+            self.assertLessEqual(delay, backoff)
+
+    def test_playlist_entries_stream(self):
+        """Test that playlist entries are parsed line by line into download items"""
+        entries = iter_playlist_entries("https://example.com/list", tool=self.tool)
+        first = next(entries)
+        self.assertEqual(first['id'], "vid0")
+        items = [entry_to_item(first)] + [entry_to_item(entry) for entry in entries]
+        self.assertEqual([item['url'] for item in items],
+                         [f"https://www.youtube.com/watch?v=vid{i}" for i in range(3)])
+        self.assertEqual(items[2]['title'], "Video 2")
+
+        with self.assertRaises(DownloadError):
+            list(iter_playlist_entries("https://example.com/fail", tool=self.tool))
+
+    def test_diff_playlist(self):
+        """Test that a sync only downloads entries the tab doesn't have yet"""
+        items = [{'id': f"vid{i}", 'url': f"https://www.youtube.com/watch?v=vid{i}", 'title': f"Video {i}"}
+                 for i in range(4)]
+        known = {"vid0": "01 - Video 0.mp3", "gone": "05 - Gone.mp3"}
+        existing = ["01 - Video 0.mp3", "05 - Gone.mp3", "03 - Video 2.mp3", "Other.wav"]
+
+        new_items, adopted, removed = diff_playlist(known, items + [items[1]], existing)
+        self.assertEqual([item['id'] for item in new_items], ["vid1", "vid3"])
+        self.assertEqual(adopted, {"vid2": "03 - Video 2.mp3"})
+        self.assertEqual(removed, ["gone"])
+
+    def test_queue_downloads_in_parallel(self):
+        """Test that the queue runs items concurrently and reports each one"""
+        finished = []
+        failed = []
+        progress = []
+        queue = DownloadQueue(
+            workers=4, tool=self.tool, retry_policy=self.no_wait,
+            on_item_finished=lambda index, result: finished.append(index),
+            on_item_failed=lambda index, title, error: failed.append(index),
+            on_progress=lambda done, total: progress.append((done, total))
+        )
+        for i in range(4):
+            url = "https://example.com/fail" if i == 3 else f"https://example.com/ok{i}"
+            queue.submit({'url': url, 'title': f"Item {i}", 'output_path': os.path.join(self.out_dir, f"item{i}")})
+        queue.close()
+        results = queue.wait()
+
+        self.assertEqual(sorted(finished), [0, 1, 2])
+        self.assertEqual(failed, [3])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(progress[-1], (4, 4))
+
+        # Work out the peak number of downloads running at once
+        events = []
+        with open(os.path.join(self.out_dir, "calls.log")) as f:
+            for line in f:
+                kind, timestamp, _ = line.split(" ", 2)
+                if "fail" not in line:
+                    events.append((float(timestamp), 1 if kind == "start" else -1))
+        running = peak = 0
+        for _, change in sorted(events):
+            running += change
+            peak = max(peak, running)
+        self.assertGreater(peak, 1)
+
+    def test_journal_resumes_and_skips(self):
+        """Test that journaled jobs survive a restart and finished ones are not downloaded again"""
+        journal_path = os.path.join(self.root, "download_queue.json")
+        item = {'url': "https://example.com/ok", 'title': "Clip", 'tab_dir': self.out_dir,
+                'output_path': os.path.join(self.out_dir, "clip")}
+
+        # A job left pending by an interrupted run is picked up by a new journal
+        journal = DownloadJournal(journal_path)
+        job_id = journal.add(item, self.out_dir)
+        journal.update(job_id, status='running')
+        pending = DownloadJournal(journal_path).unfinished()
+        self.assertEqual([job_id for job_id, _ in pending], [job_id])
+
+        journal = DownloadJournal(journal_path)
+        queue = DownloadQueue(workers=2, tool=self.tool, retry_policy=self.no_wait, journal=journal)
+        queue.submit(dict(pending[0][1], job_id=job_id))
+        queue.close()
+        self.assertEqual(len(queue.wait()), 1)
+        self.assertEqual(journal.get(job_id)['status'], 'done')
+        self.assertEqual(journal.get(job_id)['attempts'], 1)
+
+        # Requesting the same item again reuses the finished download
+        statuses = []
+        queue = DownloadQueue(workers=2, tool=self.tool, retry_policy=self.no_wait,
+                              journal=DownloadJournal(journal_path),
+                              on_status=lambda index, message: statuses.append(message))
+        queue.submit(item)
+        queue.close()
+        self.assertEqual(len(queue.wait()), 1)
+        self.assertEqual(statuses, ["Already downloaded: Clip"])
+        with open(os.path.join(self.out_dir, "calls.log")) as f:
+            self.assertEqual(sum(line.startswith("start") for line in f), 1)
+
+    def test_journal_cancel_and_pause(self):
+        """Test that cancelling drops queued jobs while pausing keeps them for later"""
+        journal_path = os.path.join(self.root, "download_queue.json")
+        for pause, status in ((False, 'cancelled'), (True, 'pending')):
+            journal = DownloadJournal(journal_path)
+            queue = DownloadQueue(workers=1, tool=self.tool, retry_policy=self.no_wait, journal=journal)
+            job_ids = []
+            for i in range(3):
+                queue.submit({'url': f"https://example.com/{status}{i}", 'title': f"Item {i}",
+                              'tab_dir': self.out_dir, 'output_path': os.path.join(self.out_dir, f"{status}{i}")})
+                job_ids.append(journal.job_id(f"https://example.com/{status}{i}", self.out_dir))
+            queue.cancel(pause=pause)
+            queue.close()
+            queue.wait()
+            self.assertEqual(journal.get(job_ids[-1])['status'], status)
+
+if __name__ == '__main__':
+    unittest.main()
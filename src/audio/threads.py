@@ -1,32 +1,63 @@
 import os
-import json
 import time
-import pygame
-import subprocess
+import queue
+import threading
 import concurrent.futures
-import wave
 from PyQt6.QtCore import QThread, pyqtSignal
 
-try:
-    from mutagen.mp3 import MP3
-    from mutagen.oggvorbis import OggVorbis
-except ImportError:
-    MP3 = None
-    OggVorbis = None
+from src.constants import SOUND_EXTENSIONS
+from src.audio.metadata import probe_sound_file
+from src.audio.silence import analyze_sound, split_sound
+from src.audio.ytdlp import (
+    DownloadQueue, DownloadError, DownloadCancelled, RetryPolicy,
+    create_safe_title, download_audio, entry_to_item,
+    iter_playlist_entries, resolve_downloader
+)
+from src.utils.file_utils import (
+    get_sounds_dir, copy_file_fast, walk_files_parallel, CopyCancelled
+)
+from src.utils.throttle import Throttle
+from src.utils.workers import create_executor, get_worker_count
+from src.utils.perf import start_timer
+from src.utils.tracing import span
+from src.utils.metrics import get_metrics
+
+# Loading metrics
+tab_load_histogram = get_metrics().histogram(
+    "cxrruptpad_tab_load_seconds", "Time to scan a tab and probe its sounds"
+)
+sounds_loaded_counter = get_metrics().counter("cxrruptpad_sounds_loaded_total", "Sounds probed while loading tabs")
+sound_load_errors_counter = get_metrics().counter(
+    "cxrruptpad_sound_load_errors_total", "Sound files that could not be probed while loading tabs"
+)
+
+def sound_sort_key(filename):
+    """Key sounds are listed by in a tab: the file name without extension, ignoring case."""
+    return os.path.splitext(filename)[0].lower()
 
 class LoadSoundsThread(QThread):
     loading_status_signal = pyqtSignal(str)
     loading_progress_signal = pyqtSignal(int)
+    loading_batch_signal = pyqtSignal(list)
     loading_finished_signal = pyqtSignal(list, bool)
     
-    def __init__(self, tab_name):
+    # How often partial results are handed to the view (seconds)
+    BATCH_INTERVAL = 0.05
+    
+    def __init__(self, tab_name, use_processes=False):
         super().__init__()
         self.tab_name = tab_name
+        self.use_processes = use_processes
+        self.cancelled = False
+        
+    def cancel(self):
+        self.cancelled = True
         
     def run(self):
+        load_started = start_timer()
         try:
             # Get data directory
-            base_dir = os.path.join("sounds", self.tab_name)
+            base_dir = os.path.join(get_sounds_dir(), self.tab_name)
             
             if not os.path.exists(base_dir):
                 os.makedirs(base_dir, exist_ok=True)
@@ -37,7 +68,7 @@ class LoadSoundsThread(QThread):
             # Get all sound files in the directory
             sound_files = []
             for filename in os.listdir(base_dir):
-                if filename.lower().endswith(('.wav', '.mp3', '.ogg')):
+                if filename.lower().endswith(SOUND_EXTENSIONS):
                     sound_files.append(filename)
             
             # If no sounds found
@@ -46,8 +77,9 @@ class LoadSoundsThread(QThread):
                 self.loading_finished_signal.emit([], True)
                 return
             
-            # Sort files
-            sound_files.sort()
+            # Sort files into their final display order up front, so batches
+            # can be appended to the view as they arrive
+            sound_files.sort(key=sound_sort_key)
             
             # Begin loading sounds
             total_sounds = len(sound_files)
@@ -55,33 +87,42 @@ class LoadSoundsThread(QThread):
             
             # Container for loaded sounds
             sounds = []
+            batch = []
+            batch_throttle = Throttle(self.BATCH_INTERVAL)
+            paths = [os.path.join(base_dir, filename) for filename in sound_files]
             
-            # Load sounds using thread pool for faster loading
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                # Create tasks
-                future_to_file = {
-                    executor.submit(self.load_single_sound, base_dir, filename): (filename, i) 
-                    for i, filename in enumerate(sound_files)
-                }
+            # Probe metadata in a pool sized for the CPU and storage. Results
+            # come back in submission order, so each batch is already sorted.
+            workers = get_worker_count(base_dir, cpu_bound=self.use_processes)
+            # Process pools pay per task for pickling, so hand out larger chunks
+            chunksize = max(1, total_sounds // (workers * 8)) if self.use_processes else 1
+            
+            with span("tab.probe", tab=self.tab_name, sounds=total_sounds, workers=workers), \
+                    create_executor(base_dir, use_processes=self.use_processes, max_workers=workers) as executor:
+                results = executor.map(probe_sound_file, paths, chunksize=chunksize)
                 
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_file):
-                    filename, index = future_to_file[future]
-                    try:
-                        sound_data = future.result()
-                        if sound_data:
-                            sounds.append(sound_data)
-                            
-                            # Update progress
-                            progress = int((len(sounds) / total_sounds) * 100)
-                            self.loading_progress_signal.emit(progress)
-                            self.loading_status_signal.emit(f"Loaded {len(sounds)}/{total_sounds} sounds...")
-                    except Exception as e:
-                        self.loading_status_signal.emit(f"Error loading {filename}: {str(e)}")
+                for filename, sound_data in zip(sound_files, results):
+                    if self.cancelled:
+                        # Closing the result iterator cancels the pending work
+                        results.close()
+                        return
+                    
+                    if sound_data:
+                        batch.append(sound_data)
+                    else:
+                        sound_load_errors_counter.inc()
+                        self.loading_status_signal.emit(f"Error loading {filename}")
+                    
+                    # Hand over partial results and progress at a fixed rate
+                    if batch and batch_throttle.ready():
+                        self.emit_batch(sounds, batch, total_sounds)
+                        batch = []
             
-            # Final cleanup and sort by file name
-            sounds.sort(key=lambda x: x['name'].lower())
+            if batch:
+                self.emit_batch(sounds, batch, total_sounds)
             
+            tab_load_histogram.observe(time.perf_counter() - load_started)
+            sounds_loaded_counter.inc(len(sounds))
             self.loading_status_signal.emit(f"Finished loading {len(sounds)} sounds")
             self.loading_finished_signal.emit(sounds, True)
             
@@ -89,284 +130,406 @@ class LoadSoundsThread(QThread):
             self.loading_status_signal.emit(f"Error: {str(e)}")
             self.loading_finished_signal.emit([], False)
     
-    def load_single_sound(self, base_dir, filename):
-        full_path = os.path.join(base_dir, filename)
+    def emit_batch(self, sounds, batch, total_sounds):
+        sounds.extend(batch)
+        self.loading_batch_signal.emit(batch)
+        
+        # Update progress
+        progress = int((len(sounds) / total_sounds) * 100)
+        self.loading_progress_signal.emit(progress)
+        self.loading_status_signal.emit(f"Loaded {len(sounds)}/{total_sounds} sounds...")
+
+class ImportSoundsThread(QThread):
+    progress_signal = pyqtSignal(int, int)
+    status_signal = pyqtSignal(str)
+    sound_imported_signal = pyqtSignal(dict, bool)
+    finished_signal = pyqtSignal(int, list, bool)
+    
+    # How often progress is reported (seconds)
+    PROGRESS_INTERVAL = 0.1
+    
+    def __init__(self, folder_path, tab_dir, mode="copy", blob_store=None):
+        super().__init__()
+        self.folder_path = folder_path
+        self.tab_dir = tab_dir
+        self.mode = mode
+        self.blob_store = blob_store
+        self.cancel_event = threading.Event()
+        
+    def cancel(self):
+        self.cancel_event.set()
+        
+    def claim_destination(self, src_path, claimed):
+        """
+        Pick the tab path a file is imported to, on the walking thread.
+        
+        A file replaces one of the same name already in the tab, but files
+        sharing a name in different subfolders of this import are named
+        '<name> (2).wav' and so on, so parallel copies never share a path.
+        Returns the path and whether it replaces an existing sound.
+        """
+        filename = os.path.basename(src_path)
+        name, ext = os.path.splitext(filename)
+        dst_path = os.path.join(self.tab_dir, filename)
+        number = 2
+        while os.path.normcase(dst_path) in claimed:
+            # Renamed files take the next number that's free in the tab
+            while True:
+                dst_path = os.path.join(self.tab_dir, f"{name} ({number}){ext}")
+                number += 1
+                if not os.path.exists(dst_path):
+                    break
+        claimed.add(os.path.normcase(dst_path))
+        return dst_path, os.path.exists(dst_path)
+        
+    def import_file(self, src_path, dst_path, replaced):
+        # Copy one file into the tab and probe it (runs in the copy pool)
+        # Content the store already has is linked instead of copied
+        if not (self.blob_store and self.blob_store.link_duplicate(src_path, dst_path)):
+            copy_file_fast(src_path, dst_path, self.mode, self.cancel_event)
+        return probe_sound_file(dst_path), replaced
+        
+    def run(self):
+        imported = 0
+        found = 0
+        failures = []
+        progress_throttle = Throttle(self.PROGRESS_INTERVAL)
         
-        # Get file creation time or modification time as fallback
         try:
-            creation_time = os.path.getctime(full_path)
-        except:
-            creation_time = os.path.getmtime(full_path)
+            os.makedirs(self.tab_dir, exist_ok=True)
+            self.status_signal.emit("Scanning folder...")
+            
+            with create_executor(self.folder_path, max_workers=4) as walk_executor, \
+                    create_executor(self.tab_dir) as copy_executor:
+                pending = {}
+                done_queue = queue.Queue()
+                
+                def collect(future):
+                    nonlocal imported
+                    src_path = pending.pop(future)
+                    try:
+                        sound_data, replaced = future.result()
+                        if sound_data:
+                            imported += 1
+                            self.sound_imported_signal.emit(sound_data, replaced)
+                    except (CopyCancelled, concurrent.futures.CancelledError):
+                        pass
+                    except Exception as e:
+                        failures.append(f"{os.path.basename(src_path)}: {str(e)}")
+                    
+                    if progress_throttle.ready():
+                        self.progress_signal.emit(imported, found)
+                        self.status_signal.emit(f"Imported {imported} of {found} sounds found so far...")
+                
+                # Start copying files while the walk is still discovering more
+                claimed = set()
+                for src_path in walk_files_parallel(self.folder_path, SOUND_EXTENSIONS, walk_executor, self.cancel_event):
+                    found += 1
+                    dst_path, replaced = self.claim_destination(src_path, claimed)
+                    future = copy_executor.submit(self.import_file, src_path, dst_path, replaced)
+                    pending[future] = src_path
+                    future.add_done_callback(done_queue.put)
+                    
+                    # Pick up whatever has finished in the meantime
+                    while not done_queue.empty():
+                        collect(done_queue.get_nowait())
+                
+                # Wait for the remaining copies
+                while pending:
+                    if self.cancel_event.is_set():
+                        for future in pending:
+                            future.cancel()
+                    try:
+                        collect(done_queue.get(timeout=self.PROGRESS_INTERVAL))
+                    except queue.Empty:
+                        pass
+            
+            self.progress_signal.emit(imported, found)
+            self.finished_signal.emit(imported, failures, self.cancel_event.is_set())
+            
+        except Exception as e:
+            failures.append(f"Import error: {str(e)}")
+            self.finished_signal.emit(imported, failures, self.cancel_event.is_set())
+
+class DedupeSoundsThread(QThread):
+    status_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(int)
+    
+    def __init__(self, blob_store):
+        super().__init__()
+        self.blob_store = blob_store
+        self.cancel_event = threading.Event()
+        
+    def cancel(self):
+        self.cancel_event.set()
         
-        # Get duration
-        duration = ''
+    def run(self):
         try:
-            if filename.lower().endswith('.wav'):
-                with wave.open(full_path, 'rb') as wf:
-                    frames = wf.getnframes()
-                    rate = wf.getframerate()
-                    duration = frames / float(rate)
-            elif filename.lower().endswith('.mp3') and MP3:
-                audio = MP3(full_path)
-                duration = audio.info.length
-            elif filename.lower().endswith('.ogg') and OggVorbis:
-                audio = OggVorbis(full_path)
-                duration = audio.info.length
+            # Collect the sound files of every tab (the store itself is hidden)
+            sounds_dir = get_sounds_dir()
+            paths = []
+            for tab_name in sorted(os.listdir(sounds_dir)):
+                tab_dir = os.path.join(sounds_dir, tab_name)
+                if tab_name.startswith('.') or not os.path.isdir(tab_dir):
+                    continue
+                for filename in os.listdir(tab_dir):
+                    if filename.lower().endswith(SOUND_EXTENSIONS):
+                        paths.append(os.path.join(tab_dir, filename))
+            
+            self.status_signal.emit(f"Indexing {len(paths)} sounds for duplicates...")
+            saved = self.blob_store.index_files(paths, self.cancel_event)
+            self.finished_signal.emit(saved)
+        
         except Exception as e:
-            duration = ''
+            self.status_signal.emit(f"Deduplication error: {str(e)}")
+            self.finished_signal.emit(0)
+
+class SilenceAnalysisThread(QThread):
+    progress_signal = pyqtSignal(int, int)
+    result_signal = pyqtSignal(str, dict)
+    split_signal = pyqtSignal(str, list)
+    finished_signal = pyqtSignal(int, list, bool)
+    
+    def __init__(self, paths, tab_dir, split=False):
+        super().__init__()
+        self.paths = list(paths)
+        self.tab_dir = tab_dir
+        self.split = split  # Also write each audible region to a new sound
+        self.cancel_event = threading.Event()
         
-        # Create sound data object
-        sound_data = {
-            'path': full_path,
-            'name': os.path.splitext(filename)[0],  # Remove extension
-            'creation_time': creation_time,
-            'duration': duration
-        }
+    def cancel(self):
+        self.cancel_event.set()
         
-        return sound_data
+    def analyze_file(self, path):
+        # Runs in the pool; NumPy releases the GIL for the heavy lifting
+        if self.cancel_event.is_set():
+            return None, []
+        analysis = analyze_sound(path)
+        created = []
+        if self.split and len(analysis['regions']) > 1:
+            created = split_sound(path, analysis['regions'], self.tab_dir)
+        return analysis, created
+        
+    def run(self):
+        done = 0
+        failures = []
+        
+        try:
+            with create_executor(self.tab_dir, cpu_bound=True) as executor:
+                futures = {executor.submit(self.analyze_file, path): path for path in self.paths}
+                for future in concurrent.futures.as_completed(futures):
+                    path = futures[future]
+                    if self.cancel_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    try:
+                        analysis, created = future.result()
+                        if analysis:
+                            self.result_signal.emit(path, analysis)
+                        if created:
+                            self.split_signal.emit(path, created)
+                    except Exception as e:
+                        failures.append(f"{os.path.basename(path)}: {str(e)}")
+                    done += 1
+                    self.progress_signal.emit(done, len(self.paths))
+        
+        except Exception as e:
+            failures.append(f"Analysis error: {str(e)}")
+        
+        self.finished_signal.emit(done, failures, self.cancel_event.is_set())
 
 class YouTubeDownloadThread(QThread):
     progress_signal = pyqtSignal(int)
+    stats_signal = pyqtSignal(dict)
     finished_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
     
-    def __init__(self, url, output_path, max_retries=3):
+    def __init__(self, url, output_path, max_retries=3, media_cache=None):
         super().__init__()
         self.url = url
         self.output_path = output_path
         self.max_retries = max_retries
+        self.media_cache = media_cache
         
     def run(self):
         try:
-            # Create output directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-            
-            # Check if yt-dlp or youtube-dl is installed
-            cmd = "yt-dlp"
-            try:
-                subprocess.run([cmd, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-            except:
-                cmd = "youtube-dl"
-                try:
-                    subprocess.run([cmd, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-                except:
-                    self.error_signal.emit("Neither yt-dlp nor youtube-dl is installed!")
-                    return
-            
-            # Set arguments for youtube downloader
-            args = [
-                cmd,
-                "--extract-audio",
-                "--audio-format", "mp3",
-                "--audio-quality", "0",  # Best quality
-                "--embed-thumbnail",  # Add thumbnail to audio file if possible
-                "--add-metadata",  # Add metadata
-                "--output", self.output_path + ".%(ext)s",  # Add extension automatically
-                "--progress", "--newline",  # For progress parsing
-                "--no-playlist",  # Avoid downloading playlists
-                self.url
-            ]
-            
-            # Start download process
-            retries = 0
             self.progress_signal.emit(0)
+            result_file = download_audio(
+                self.url,
+                self.output_path,
+                retry_policy=RetryPolicy(max_attempts=self.max_retries),
+                progress_callback=self.progress_signal.emit,
+                stats_callback=self.stats_signal.emit,
+                media_cache=self.media_cache
+            )
             
-            while retries < self.max_retries:
-                try:
-                    process = subprocess.Popen(
-                        args, 
-                        stdout=subprocess.PIPE, 
-                        stderr=subprocess.STDOUT,
-                        universal_newlines=True,
-                        bufsize=1
-                    )
-                    
-                    # Monitor the download progress
-                    current_progress = 0
-                    for line in iter(process.stdout.readline, ''):
-                        if "of" in line and "%" in line:
-                            # Try to parse progress
-                            try:
-                                percent_part = line.split('%')[0].strip().split(' ')[-1]
-                                percent = float(percent_part)
-                                if percent > current_progress:
-                                    current_progress = percent
-                                    self.progress_signal.emit(int(percent))
-                            except:
-                                pass
-                    
-                    # Wait for process to complete
-                    process.wait()
-                    
-                    if process.returncode == 0:
-                        # Success
-                        self.progress_signal.emit(100)
-                        
-                        # Find the downloaded file (might have a different extension)
-                        result_file = None
-                        base_dir = os.path.dirname(self.output_path)
-                        base_name = os.path.basename(self.output_path)
-                        
-                        for filename in os.listdir(base_dir):
-                            if filename.startswith(base_name) and filename.endswith('.mp3'):
-                                result_file = os.path.join(base_dir, filename)
-                                # Rename to ensure it doesn't have extra extensions
-                                clean_path = self.output_path + '.mp3'
-                                if result_file != clean_path:
-                                    os.rename(result_file, clean_path)
-                                    result_file = clean_path
-                                break
-                        
-                        if not result_file:
-                            self.error_signal.emit("Download completed but file not found!")
-                            return
-                        
-                        # Emit the path to the downloaded file
-                        self.finished_signal.emit(result_file)
-                        return
-                    else:
-                        retries += 1
-                        self.progress_signal.emit(0)  # Reset progress for retry
-                
-                except Exception as e:
-                    retries += 1
-                    self.progress_signal.emit(0)  # Reset progress for retry
-                    time.sleep(1)  # Small delay before retrying
-            
-            # If we reach here, all retries failed
-            self.error_signal.emit(f"Failed to download after {self.max_retries} attempts.")
+            # Emit the path to the downloaded file
+            self.finished_signal.emit(result_file)
             
+        except DownloadError as e:
+            self.error_signal.emit(str(e))
         except Exception as e:
             self.error_signal.emit(f"Download error: {str(e)}")
 
+class PlaylistFetchThread(QThread):
+    entry_signal = pyqtSignal(dict)
+    finished_signal = pyqtSignal(int)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self.cancel_event = threading.Event()
+        
+    def cancel(self):
+        self.cancel_event.set()
+        
+    def run(self):
+        count = 0
+        try:
+            # Hand each entry over as soon as it is listed
+            for entry in iter_playlist_entries(self.url, cancel_event=self.cancel_event):
+                item = entry_to_item(entry)
+                if item['url']:
+                    count += 1
+                    self.entry_signal.emit(item)
+        except DownloadCancelled:
+            pass
+        except DownloadError as e:
+            self.error_signal.emit(str(e))
+        except Exception as e:
+            self.error_signal.emit(f"Failed to fetch playlist info: {str(e)}")
+        
+        self.finished_signal.emit(count)
+
 class PlaylistDownloadThread(QThread):
     progress_signal = pyqtSignal(int)
     status_signal = pyqtSignal(int, str)
     retry_signal = pyqtSignal(int, str, int)
     skip_signal = pyqtSignal(int, str)
     error_signal = pyqtSignal(int, str, str)
+    item_progress_signal = pyqtSignal(int, int)
+    item_stats_signal = pyqtSignal(int, dict)
+    item_finished_signal = pyqtSignal(int, dict)
+    overall_progress_signal = pyqtSignal(int, int)
     finished_signal = pyqtSignal(list)
     
-    def __init__(self, playlist_items, tab_dir, add_prefix):
+    def __init__(self, playlist_items, tab_dir, add_prefix, workers=3, retry_policy=None, streaming=False,
+                 journal=None, media_cache=None):
         super().__init__()
-        self.playlist_items = playlist_items
+        self.playlist_items = []
         self.tab_dir = tab_dir
         self.add_prefix = add_prefix
+        self.workers = workers
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.journal = journal
+        self.media_cache = media_cache
+        self.queue = None
+        self.cancelled = False
+        self.output_paths = set()  # Paths taken by items of this run
+        
+        # Items can keep arriving while downloads run (e.g. from a playlist
+        # that is still being fetched); None marks the end
+        self.incoming = queue.Queue()
+        for item in playlist_items:
+            self.add_item(item)
+        if not streaming:
+            self.finish_items()
+        
+    def add_item(self, item):
+        self.incoming.put(item)
+        
+    def finish_items(self):
+        self.incoming.put(None)
+        
+    def make_output_path(self, index, title):
+        # Create safe filename from title
+        safe_title = create_safe_title(title)
+        
+        # Add index prefix if requested
+        if self.add_prefix:
+            filename = f"{index + 1:02d} - {safe_title}"
+        else:
+            filename = safe_title
+        
+        return os.path.join(self.tab_dir, filename)
+        
+    def claim_output_path(self, path):
+        # Items with the same title run in parallel, so later ones get '<title> (2)' and so on
+        candidate = path
+        number = 2
+        while os.path.normcase(candidate) in self.output_paths:
+            candidate = f"{path} ({number})"
+            number += 1
+        self.output_paths.add(os.path.normcase(candidate))
+        return candidate
+        
+    def on_item_failed(self, index, title, message):
+        self.error_signal.emit(index, title, message)
+        self.skip_signal.emit(index, title)
+        
+    def on_progress(self, done, total):
+        self.overall_progress_signal.emit(done, total)
+        self.progress_signal.emit(int(done * 100 / total) if total else 0)
+        
+    def cancel(self, pause=False):
+        # Paused downloads stay pending in the journal and resume on next launch
+        self.cancelled = True
+        if self.queue:
+            self.queue.cancel(pause=pause)
+        self.finish_items()
+        
+    def next_items(self):
+        # Yield incoming items until the end marker
+        while not self.cancelled:
+            item = self.incoming.get()
+            if item is None:
+                return
+            self.playlist_items.append(item)
+            yield len(self.playlist_items) - 1, item
         
     def run(self):
-        results = []
-        total_items = len(self.playlist_items)
+        # Without a downloader only cached videos can be served
+        tool = resolve_downloader()
+        if not tool and not self.media_cache:
+            for i, item in self.next_items():
+                self.error_signal.emit(i, item['title'], "Neither yt-dlp nor youtube-dl is installed!")
+            self.finished_signal.emit([])
+            return
         
-        for i, item in enumerate(self.playlist_items):
-            url = item['url']
-            title = item['title']
-            index = i + 1
-            
-            # Create safe filename from title
-            safe_title = "".join([c for c in title if c.isalpha() or c.isdigit() or c in ' -_']).strip()
-            
-            # Add index prefix if requested
-            if self.add_prefix:
-                filename = f"{index:02d} - {safe_title}"
+        # Download with a pool of workers; the tool path is resolved once for all items
+        self.queue = DownloadQueue(
+            workers=self.workers,
+            tool=tool,
+            retry_policy=self.retry_policy,
+            journal=self.journal,
+            media_cache=self.media_cache,
+            on_status=self.status_signal.emit,
+            on_retry=self.retry_signal.emit,
+            on_item_progress=self.item_progress_signal.emit,
+            on_item_stats=self.item_stats_signal.emit,
+            on_item_finished=self.item_finished_signal.emit,
+            on_item_failed=self.on_item_failed,
+            on_progress=self.on_progress
+        )
+        
+        for i, item in self.next_items():
+            # Resumed items already know their job and output path
+            if item.get('job_id'):
+                output_path = item['output_path']
+                self.output_paths.add(os.path.normcase(output_path))
             else:
-                filename = safe_title
-                
-            # Output path
-            output_path = os.path.join(self.tab_dir, filename)
-            
-            # Update status
-            self.status_signal.emit(i, f"Downloading {index}/{total_items}: {title}")
-            
-            # Try to download
-            success = False
-            max_retries = 3
-            retries = 0
-            
-            while not success and retries < max_retries:
-                try:
-                    # Create download command
-                    cmd = "yt-dlp"
-                    try:
-                        subprocess.run([cmd, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-                    except:
-                        cmd = "youtube-dl"
-                        try:
-                            subprocess.run([cmd, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-                        except:
-                            self.error_signal.emit(i, title, "Neither yt-dlp nor youtube-dl is installed!")
-                            break
-                    
-                    args = [
-                        cmd,
-                        "--extract-audio",
-                        "--audio-format", "mp3",
-                        "--audio-quality", "0",
-                        "--embed-thumbnail",
-                        "--add-metadata",
-                        "--output", output_path + ".%(ext)s",
-                        "--progress", "--newline",
-                        "--no-playlist",
-                        url
-                    ]
-                    
-                    # Start download
-                    if retries > 0:
-                        self.retry_signal.emit(i, title, retries)
-                    
-                    # Run download process
-                    process = subprocess.Popen(
-                        args, 
-                        stdout=subprocess.PIPE, 
-                        stderr=subprocess.STDOUT,
-                        universal_newlines=True,
-                        bufsize=1
-                    )
-                    
-                    # Track progress
-                    for line in iter(process.stdout.readline, ''):
-                        if "of" in line and "%" in line:
-                            try:
-                                percent_part = line.split('%')[0].strip().split(' ')[-1]
-                                percent = float(percent_part)
-                                self.progress_signal.emit(int(percent))
-                            except:
-                                pass
-                    
-                    # Wait for completion
-                    process.wait()
-                    
-                    if process.returncode == 0:
-                        success = True
-                        self.progress_signal.emit(100)
-                        
-                        # Find the downloaded file
-                        result_file = None
-                        for filename in os.listdir(self.tab_dir):
-                            if filename.startswith(os.path.basename(output_path)) and filename.endswith('.mp3'):
-                                result_file = os.path.join(self.tab_dir, filename)
-                                # Rename to ensure it has the correct name
-                                clean_path = output_path + '.mp3'
-                                if result_file != clean_path:
-                                    os.rename(result_file, clean_path)
-                                    result_file = clean_path
-                                break
-                        
-                        if result_file:
-                            results.append({
-                                'path': result_file,
-                                'name': os.path.splitext(os.path.basename(result_file))[0],
-                                'creation_time': os.path.getctime(result_file)
-                            })
-                    else:
-                        retries += 1
-                
-                except Exception as e:
-                    retries += 1
-                    time.sleep(1)
-            
-            # Handle failure
-            if not success:
-                self.skip_signal.emit(i, title)
+                output_path = self.claim_output_path(item.get('output_path') or self.make_output_path(i, item['title']))
+            self.queue.submit({
+                'url': item['url'],
+                'title': item['title'],
+                'tab_dir': item.get('tab_dir', self.tab_dir),
+                'job_id': item.get('job_id'),
+                'media_key': item.get('media_key'),
+                'output_path': output_path
+            })
+        self.queue.close()
         
         # All downloads complete
-        self.finished_signal.emit(results) 
\ No newline at end of file
+        self.finished_signal.emit(self.queue.wait())
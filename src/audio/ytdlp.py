@@ -0,0 +1,702 @@
+"""
+Helpers for downloading audio with yt-dlp (or youtube-dl).
+
+Nothing in here depends on Qt, so the download logic can be driven by the
+Qt threads in src/audio/threads.py as well as tested offline against a stub
+yt-dlp executable.
+"""
+import os
+import re
+import glob
+import json
+import time
+import random
+import hashlib
+import shutil
+import threading
+import subprocess
+import concurrent.futures
+
+from src.audio.media_cache import media_key
+from src.utils.file_utils import get_data_dir, save_json, load_json
+from src.utils.throttle import Throttle
+from src.utils.logger import logger
+from src.utils.perf import start_timer, log_elapsed
+from src.utils.tracing import traced
+from src.utils.metrics import get_metrics
+
+# Downloader executables, in order of preference
+DOWNLOADER_COMMANDS = ("yt-dlp", "youtube-dl")
+
+# Download metrics; throughput is download_bytes_total over download_seconds_sum
+downloads_counter = get_metrics().counter(
+    "cxrruptpad_downloads_total", "Downloads by result (downloaded, cached, failed, cancelled)", ("result",)
+)
+download_bytes_counter = get_metrics().counter("cxrruptpad_download_bytes_total", "Bytes of audio downloaded")
+download_retries_counter = get_metrics().counter("cxrruptpad_download_retries_total", "Download attempts that were retried")
+download_histogram = get_metrics().histogram(
+    "cxrruptpad_download_seconds", "Time to download a video's audio, retries included"
+)
+download_speed_gauge = get_metrics().gauge(
+    "cxrruptpad_download_bytes_per_second", "Average speed of the last finished download"
+)
+
+_downloader = None
+_downloader_lock = threading.Lock()
+
+class DownloadError(Exception):
+    """Raised when a download fails for good."""
+
+class DownloadCancelled(DownloadError):
+    """Raised when a download is cancelled."""
+
+def resolve_downloader(refresh=False):
+    """
+    Find the downloader executable once and remember it.
+
+    Returns the full path to yt-dlp or youtube-dl, or None if neither is
+    installed.
+    """
+    global _downloader
+    with _downloader_lock:
+        if _downloader is None or refresh:
+            _downloader = None
+            for cmd in DOWNLOADER_COMMANDS:
+                path = shutil.which(cmd)
+                if path:
+                    _downloader = path
+                    logger.info("Using downloader: %s", path)
+                    break
+        return _downloader
+
+class RetryPolicy:
+    """Exponential backoff with jitter, shared by all download jobs."""
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=30.0, jitter=0.5):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        """Get the delay (seconds) before retrying after the given failed attempt (1-based)."""
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        # Randomise so parallel workers don't retry in lockstep
+        return backoff * (1 - self.jitter * random.random())
+
+# Index prefix added to playlist downloads, e.g. "03 - "
+INDEX_PREFIX_PATTERN = re.compile(r'^\d+ - ')
+
+def create_safe_title(title):
+    """Create a safe file name from a video title."""
+    return "".join([c for c in title if c.isalpha() or c.isdigit() or c in ' -_']).strip()
+
+# Machine-readable progress line printed by yt-dlp for --progress-template.
+# Fields: downloaded bytes, total bytes, estimated total, speed (B/s), ETA (s);
+# unknown values are printed as "NA".
+PROGRESS_PREFIX = "[cxp]"
+PROGRESS_TEMPLATE = (
+    PROGRESS_PREFIX + " %(progress.downloaded_bytes)s %(progress.total_bytes)s"
+    " %(progress.total_bytes_estimate)s %(progress.speed)s %(progress.eta)s"
+)
+
+# Most progress updates forwarded per second for each download
+PROGRESS_RATE = 10
+
+def supports_progress_template(tool):
+    """youtube-dl lacks --progress-template, only yt-dlp has it."""
+    return os.path.basename(tool).lower().startswith("yt-dlp")
+
+def build_download_args(tool, url, output_path):
+    """Build the downloader command line for extracting mp3 audio."""
+    if supports_progress_template(tool):
+        progress_args = ["--newline", "--progress-template", "download:" + PROGRESS_TEMPLATE]
+    else:
+        progress_args = ["--progress", "--newline"]
+    return [
+        tool,
+        "--extract-audio",
+        "--audio-format", "mp3",
+        "--audio-quality", "0",  # Best quality
+        "--embed-thumbnail",  # Add thumbnail to audio file if possible
+        "--add-metadata",  # Add metadata
+        "--output", output_path + ".%(ext)s",  # Add extension automatically
+        *progress_args,  # For progress parsing
+        "--continue",  # Resume from partial files of an earlier attempt
+        "--no-playlist",  # Avoid downloading playlists
+        url
+    ]
+
+class ProgressParser:
+    """
+    Parse downloader progress lines into stats.
+
+    Understands the --progress-template lines of yt-dlp as well as the
+    human-readable "[download]  42.0% of 3.00MiB at 1.00MiB/s ETA 00:02"
+    lines youtube-dl prints. parse() returns a dict with 'percent', 'speed'
+    (bytes per second) and 'eta' (seconds), or None for other lines.
+    Unknown values are None.
+    """
+
+    TEMPLATE_PATTERN = re.compile(re.escape(PROGRESS_PREFIX) + r' (\S+) (\S+) (\S+) (\S+) (\S+)')
+    LEGACY_PATTERN = re.compile(
+        r'\[download\]\s+([\d.]+)% of\s+~?\s*\S+'
+        r'(?:\s+at\s+([\d.]+)([KMGT]?i?B)/s)?'
+        r'(?:\s+ETA\s+([\d:]+))?'
+    )
+    UNITS = {'B': 1, 'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3, 'TiB': 1024 ** 4,
+             'KB': 1000, 'MB': 1000 ** 2, 'GB': 1000 ** 3, 'TB': 1000 ** 4}
+
+    @staticmethod
+    def _number(value):
+        try:
+            return float(value)
+        except ValueError:
+            return None  # "NA"
+
+    def parse(self, line):
+        match = self.TEMPLATE_PATTERN.match(line)
+        if match:
+            downloaded, total, estimate, speed, eta = (self._number(value) for value in match.groups())
+            total = total or estimate
+            if downloaded is None or not total:
+                return None
+            return {
+                'percent': min(100.0, downloaded * 100 / total),
+                'speed': speed,
+                'eta': int(eta) if eta is not None else None
+            }
+
+        match = self.LEGACY_PATTERN.search(line)
+        if match:
+            percent, speed, unit, eta = match.groups()
+            seconds = None
+            if eta:
+                seconds = 0
+                for part in eta.split(':'):
+                    seconds = seconds * 60 + int(part or 0)
+            return {
+                'percent': float(percent),
+                'speed': float(speed) * self.UNITS.get(unit, 1) if speed else None,
+                'eta': seconds
+            }
+        return None
+
+def format_progress_stats(stats, with_percent=False):
+    """Format the speed and ETA of progress stats for display, e.g. "1.2 MB/s, 0:42 left"."""
+    parts = []
+    if stats.get('speed'):
+        parts.append(f"{stats['speed'] / (1024 * 1024):.1f} MB/s")
+    if stats.get('eta') is not None:
+        minutes, seconds = divmod(int(stats['eta']), 60)
+        parts.append(f"{minutes}:{seconds:02d} left")
+    details = ", ".join(parts)
+    if with_percent:
+        return f"{int(stats['percent'])}% ({details})" if details else f"{int(stats['percent'])}%"
+    return details
+
+def find_output_file(output_path):
+    """Find the downloaded mp3 for output_path and give it a clean name."""
+    base_dir = os.path.dirname(output_path)
+    base_name = os.path.basename(output_path)
+    clean_path = output_path + '.mp3'
+    if os.path.exists(clean_path):
+        return clean_path
+
+    # Parallel downloads share the directory, so only match our own name
+    for filename in os.listdir(base_dir):
+        if filename.startswith(base_name + '.') and filename.endswith('.mp3'):
+            result_file = os.path.join(base_dir, filename)
+            # Rename to ensure it doesn't have extra extensions
+            if result_file != clean_path:
+                os.replace(result_file, clean_path)
+            return clean_path
+    return None
+
+@traced("download")
+def download_audio(url, output_path, tool=None, retry_policy=None, cancel_event=None,
+                   progress_callback=None, retry_callback=None, media_cache=None, cache_key=None,
+                   stats_callback=None):
+    """
+    Download the audio of a video as <output_path>.mp3.
+
+    Args:
+        url: Video URL
+        output_path: Output path without extension
+        tool: Downloader executable (resolved once if not given)
+        retry_policy: RetryPolicy to use between failed attempts
+        cancel_event: Optional threading.Event that aborts the download
+        progress_callback: Called with the percentage (0-100) as it changes,
+                           at most PROGRESS_RATE times per second
+        retry_callback: Called with the attempt number before each retry
+        media_cache: Optional MediaCache to serve repeated videos from
+        cache_key: Cache key of the video (derived from the URL if not given)
+        stats_callback: Called with the parsed stats (percent, speed, ETA)
+                        along with progress_callback
+
+    Returns the path of the downloaded file, raises DownloadError on failure.
+    """
+    download_started = start_timer()
+    
+    # Videos downloaded before are linked from the cache without a download
+    if media_cache:
+        cache_key = cache_key or media_key(url)
+        result_file = media_cache.fetch(cache_key, output_path)
+        if result_file:
+            if progress_callback:
+                progress_callback(100)
+            log_elapsed("download", download_started, cached=True)
+            downloads_counter.inc(labels=("cached",))
+            return result_file
+
+    tool = tool or resolve_downloader()
+    if not tool:
+        raise DownloadError("Neither yt-dlp nor youtube-dl is installed!")
+    retry_policy = retry_policy or RetryPolicy()
+
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    args = build_download_args(tool, url, output_path)
+    parser = ProgressParser()
+    throttle = Throttle(1.0 / PROGRESS_RATE)
+
+    last_error = "unknown error"
+    for attempt in range(1, retry_policy.max_attempts + 1):
+        if cancel_event and cancel_event.is_set():
+            downloads_counter.inc(labels=("cancelled",))
+            raise DownloadCancelled("Download cancelled")
+        if attempt > 1:
+            download_retries_counter.inc()
+            if retry_callback:
+                retry_callback(attempt - 1)
+
+        try:
+            process = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=1
+            )
+
+            # Monitor the download progress; updates in between are combined
+            current_progress = 0
+            throttle.reset()
+            for line in iter(process.stdout.readline, ''):
+                if cancel_event and cancel_event.is_set():
+                    process.terminate()
+                    process.wait()
+                    downloads_counter.inc(labels=("cancelled",))
+                    raise DownloadCancelled("Download cancelled")
+                stats = parser.parse(line)
+                if stats is None:
+                    if "ERROR" in line:
+                        last_error = line.strip()
+                    continue
+                if int(stats['percent']) > current_progress and throttle.ready():
+                    current_progress = int(stats['percent'])
+                    if progress_callback:
+                        progress_callback(current_progress)
+                    if stats_callback:
+                        stats_callback(stats)
+
+            process.wait()
+
+            if process.returncode == 0:
+                result_file = find_output_file(output_path)
+                if not result_file:
+                    downloads_counter.inc(labels=("failed",))
+                    raise DownloadError("Download completed but file not found!")
+                if media_cache:
+                    media_cache.store(cache_key, result_file)
+                if progress_callback:
+                    progress_callback(100)
+                size = os.path.getsize(result_file)
+                elapsed = log_elapsed("download", download_started, cached=False, attempts=attempt, bytes=size)
+                downloads_counter.inc(labels=("downloaded",))
+                download_bytes_counter.inc(size)
+                download_histogram.observe(elapsed)
+                if elapsed > 0:
+                    download_speed_gauge.set(size / elapsed)
+                return result_file
+
+            last_error = f"{os.path.basename(tool)} exited with code {process.returncode}: {last_error}"
+        except DownloadError:
+            raise
+        except Exception as e:
+            last_error = str(e)
+
+        logger.warning("Download attempt %s/%s failed for %s: %s", attempt, retry_policy.max_attempts, url, last_error)
+        if progress_callback:
+            progress_callback(0)  # Reset progress for retry
+
+        if attempt < retry_policy.max_attempts:
+            # Wait before retrying, but wake up straight away if cancelled
+            delay = retry_policy.delay(attempt)
+            if cancel_event:
+                cancel_event.wait(delay)
+            else:
+                time.sleep(delay)
+
+    downloads_counter.inc(labels=("failed",))
+    raise DownloadError(f"Failed to download after {retry_policy.max_attempts} attempts: {last_error}")
+
+def entry_to_item(entry):
+    """Turn a flat playlist entry into a download item with 'url' and 'title'."""
+    # Compose full URL for each entry
+    entry_url = entry.get("url")
+    if entry_url and "youtube.com" not in entry_url:
+        entry_url = f"https://www.youtube.com/watch?v={entry_url}"
+    return {
+        'url': entry_url,
+        'title': entry.get('title') or entry_url,
+        'id': entry.get('id'),
+        'extractor': entry.get('ie_key'),
+        'media_key': media_key(entry_url, entry.get('ie_key'), entry.get('id'))
+    }
+
+def diff_playlist(known, items, existing_names=()):
+    """
+    Compare a playlist listing with the entries a tab already has.
+
+    Args:
+        known: {entry id: file name} of entries fetched by earlier syncs
+        items: Download items of the current listing, in playlist order
+        existing_names: File names already in the tab. Entries whose title
+                        matches one (with or without an index prefix) are
+                        adopted instead of downloaded again.
+
+    Returns (new_items, adopted, removed_ids), where adopted maps entry ids
+    to existing file names.
+    """
+    # Match existing files by their title, ignoring extension and index prefix
+    by_title = {}
+    for name in existing_names:
+        stem = os.path.splitext(name)[0]
+        by_title.setdefault(INDEX_PREFIX_PATTERN.sub('', stem, count=1), name)
+        by_title.setdefault(stem, name)
+
+    new_items = []
+    adopted = {}
+    seen = set()
+    for item in items:
+        entry_id = item.get('id') or item['url']
+        if entry_id in seen:
+            continue
+        seen.add(entry_id)
+        if entry_id in known:
+            continue
+        name = by_title.get(create_safe_title(item['title']))
+        if name:
+            adopted[entry_id] = name
+        else:
+            new_items.append(item)
+
+    removed_ids = [entry_id for entry_id in known if entry_id not in seen]
+    return new_items, adopted, removed_ids
+
+def iter_playlist_entries(url, tool=None, cancel_event=None):
+    """
+    Yield the entries of a playlist as the downloader lists them.
+
+    Uses --flat-playlist with one JSON document per line, so entries can be
+    processed while the rest of a large playlist is still being fetched.
+    Raises DownloadError if the playlist can't be fetched.
+    """
+    tool = tool or resolve_downloader()
+    if not tool:
+        raise DownloadError("Neither yt-dlp nor youtube-dl is installed!")
+
+    process = subprocess.Popen(
+        [tool, "--flat-playlist", "--dump-json", url],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        encoding='utf-8',
+        bufsize=1
+    )
+
+    errors = []
+    try:
+        for line in iter(process.stdout.readline, ''):
+            if cancel_event and cancel_event.is_set():
+                raise DownloadCancelled("Playlist fetch cancelled")
+            line = line.strip()
+            if not line.startswith('{'):
+                # Warnings and errors share the stream with the entries
+                if line:
+                    errors.append(line)
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                errors.append(line)
+        process.wait()
+    finally:
+        if process.poll() is None:
+            process.terminate()
+            process.wait()
+        process.stdout.close()
+
+    if process.returncode != 0:
+        message = errors[-1] if errors else f"exit code {process.returncode}"
+        raise DownloadError(f"Failed to fetch playlist info: {message}")
+
+class DownloadJournal:
+    """
+    Download queue state persisted to disk, so batch jobs survive restarts.
+
+    Each job records its URL, target tab directory, output path, status
+    ('pending', 'running', 'done', 'failed' or 'cancelled'), attempt count and
+    any partial files yt-dlp left behind. Jobs are keyed by URL and tab, so
+    requesting the same item again reuses the job instead of repeating work.
+    """
+
+    # Finished jobs kept around so repeated requests can be skipped
+    MAX_FINISHED_JOBS = 5000
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_data_dir(), "download_queue.json")
+        self.lock = threading.Lock()
+        self.jobs = load_json(self.path).get('jobs', {})
+
+    @staticmethod
+    def job_id(url, tab_dir):
+        return hashlib.sha1(f"{url}\n{os.path.abspath(tab_dir)}".encode('utf-8')).hexdigest()[:16]
+
+    def save(self):
+        with self.lock:
+            # Forget the oldest finished jobs beyond the limit
+            finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('done', 'failed', 'cancelled')]
+            if len(finished) > self.MAX_FINISHED_JOBS:
+                finished.sort(key=lambda job_id: self.jobs[job_id].get('updated', 0))
+                for job_id in finished[:len(finished) - self.MAX_FINISHED_JOBS]:
+                    del self.jobs[job_id]
+            save_json(self.path, {'jobs': self.jobs})
+
+    def add(self, item, tab_dir):
+        """Record a job for an item and return its id. Existing jobs are reused."""
+        job_id = self.job_id(item['url'], tab_dir)
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['status'] in ('failed', 'cancelled'):
+                self.jobs[job_id] = {
+                    'url': item['url'],
+                    'title': item.get('title', item['url']),
+                    'tab_dir': tab_dir,
+                    # Reuse the earlier output path so yt-dlp finds its partial files
+                    'output_path': job['output_path'] if job else item['output_path'],
+                    'status': 'pending',
+                    'attempts': job['attempts'] if job else 0,
+                    'partial': job.get('partial', []) if job else [],
+                    'updated': time.time()
+                }
+        self.save()
+        return job_id
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, save=True, **fields):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            job['updated'] = time.time()
+        if save:
+            self.save()
+
+    def unfinished(self):
+        """Get (job id, job) pairs that still need downloading, oldest first."""
+        with self.lock:
+            jobs = [(job_id, dict(job)) for job_id, job in self.jobs.items() if job['status'] in ('pending', 'running')]
+        return sorted(jobs, key=lambda pair: pair[1].get('updated', 0))
+
+_download_journal = None
+_download_journal_lock = threading.Lock()
+
+def get_download_journal():
+    """Get the shared download journal."""
+    global _download_journal
+    with _download_journal_lock:
+        if _download_journal is None:
+            _download_journal = DownloadJournal()
+        return _download_journal
+
+def find_partial_files(output_path):
+    """List the partial download files yt-dlp left for an output path."""
+    return sorted(glob.glob(glob.escape(output_path) + ".*.part"))
+
+class DownloadQueue:
+    """
+    Download many items with a fixed number of parallel workers.
+
+    Items are dicts with 'url', 'title' and 'output_path' keys, and
+    optionally a 'media_key' for the media cache. Items can be
+    added while downloads are already running; call close() once no more
+    items will be added, then wait() for the queue to drain. Callbacks are
+    invoked from worker threads with the item index:
+
+        on_status(index, message)
+        on_retry(index, title, attempt)
+        on_item_progress(index, percent)  # at most PROGRESS_RATE times per second
+        on_item_stats(index, stats)       # percent, speed and ETA
+        on_item_finished(index, result)   # result is the sound data dict
+        on_item_failed(index, title, error)
+        on_progress(done, total)
+    """
+
+    def __init__(self, workers=3, tool=None, retry_policy=None, journal=None, media_cache=None, **callbacks):
+        self.tool = tool
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.journal = journal
+        self.media_cache = media_cache
+        self.callbacks = callbacks
+        self.job_ids = []
+        self.pausing = False
+        self.cancel_event = threading.Event()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers))
+        self.lock = threading.Lock()
+        self.futures = []
+        self.total = 0
+        self.done = 0
+        self.results = []
+        self.failed = []
+
+    def _callback(self, name, *args):
+        callback = self.callbacks.get(name)
+        if callback:
+            callback(*args)
+
+    def submit(self, item):
+        """
+        Queue an item for download and return its index.
+
+        With a journal, the item may carry a 'job_id' (when resuming),
+        otherwise it needs a 'tab_dir' so a job can be recorded for it.
+        """
+        if self.journal:
+            item = dict(item)
+            if not item.get('job_id'):
+                item['job_id'] = self.journal.add(item, item['tab_dir'])
+            # The journal decides the output path, so partial files are reused
+            item['output_path'] = self.journal.get(item['job_id'])['output_path']
+
+        with self.lock:
+            index = self.total
+            self.total += 1
+            if self.journal:
+                self.job_ids.append(item['job_id'])
+            self.futures.append(self.executor.submit(self._run_item, index, item))
+        self._callback('on_progress', self.done, self.total)
+        return index
+
+    def _count_attempt(self, job_id):
+        if self.journal and job_id:
+            job = self.journal.get(job_id)
+            if job:
+                self.journal.update(job_id, attempts=job['attempts'] + 1)
+
+    def _run_item(self, index, item):
+        title = item.get('title', item['url'])
+        job_id = item.get('job_id')
+        if self.cancel_event.is_set():
+            return
+
+        try:
+            # Items that already succeeded in an earlier run are not downloaded again
+            job = self.journal.get(job_id) if self.journal else None
+            result_file = find_output_file(item['output_path']) if job and job['status'] == 'done' else None
+
+            if result_file:
+                self._callback('on_status', index, f"Already downloaded: {title}")
+            else:
+                self._callback('on_status', index, f"Downloading: {title}")
+                if job:
+                    self.journal.update(job_id, status='running')
+                self._count_attempt(job_id)
+
+                def on_retry(attempt):
+                    self._count_attempt(job_id)
+                    self._callback('on_retry', index, title, attempt)
+
+                result_file = download_audio(
+                    item['url'],
+                    item['output_path'],
+                    tool=self.tool,
+                    retry_policy=self.retry_policy,
+                    cancel_event=self.cancel_event,
+                    progress_callback=lambda percent: self._callback('on_item_progress', index, percent),
+                    stats_callback=lambda stats: self._callback('on_item_stats', index, stats),
+                    retry_callback=on_retry,
+                    media_cache=self.media_cache,
+                    cache_key=item.get('media_key')
+                )
+                if job:
+                    self.journal.update(job_id, status='done', path=result_file, partial=[])
+            result = {
+                'path': result_file,
+                'name': os.path.splitext(os.path.basename(result_file))[0],
+                'creation_time': os.path.getctime(result_file)
+            }
+            with self.lock:
+                self.results.append(result)
+            self._callback('on_item_finished', index, result)
+        except DownloadCancelled:
+            if self.journal and job_id:
+                # Paused jobs are resumed next time; partial files are kept for that
+                self.journal.update(
+                    job_id,
+                    status='pending' if self.pausing else 'cancelled',
+                    partial=find_partial_files(item['output_path'])
+                )
+            return
+        except Exception as e:
+            if self.journal and job_id:
+                self.journal.update(job_id, status='failed', error=str(e),
+                                    partial=find_partial_files(item['output_path']))
+            with self.lock:
+                self.failed.append(title)
+            self._callback('on_item_failed', index, title, str(e))
+
+        with self.lock:
+            self.done += 1
+            done, total = self.done, self.total
+        self._callback('on_progress', done, total)
+
+    def close(self):
+        """Signal that no more items will be added."""
+        self.executor.shutdown(wait=False)
+
+    def wait(self):
+        """Wait for every queued item to finish (or be cancelled)."""
+        self.executor.shutdown(wait=True)
+        return self.results
+
+    def cancel(self, pause=False):
+        """
+        Stop all running downloads and drop the queued ones.
+
+        With pause=True the journal keeps the unfinished jobs pending, so they
+        are resumed next time instead of being marked cancelled.
+        """
+        # The first cancel decides whether unfinished jobs are kept
+        if self.cancel_event.is_set():
+            return
+        self.pausing = pause
+        self.cancel_event.set()
+        with self.lock:
+            for future in self.futures:
+                future.cancel()
+            job_ids = list(self.job_ids)
+
+        # Jobs that never started are still 'pending' in the journal
+        if self.journal and not pause:
+            for job_id in job_ids:
+                job = self.journal.get(job_id)
+                if job and job['status'] == 'pending':
+                    self.journal.update(job_id, save=False, status='cancelled')
+            self.journal.save()
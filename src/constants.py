@@ -25,9 +25,15 @@ APP_VERSION = "1.0.0"
 # App name
 APP_NAME = "CxrruptPad"
 
+# Sound file extensions recognised in tabs
+SOUND_EXTENSIONS = ('.wav', '.mp3', '.ogg', '.flac', '.opus')
+
 # Sound end event for pygame
 SOUND_END_EVENT = 25  # pygame.USEREVENT + 1
 
+# End event of the recorder's preview channel
+PREVIEW_END_EVENT = 26
+
 # Function to get system information
 def detect_system():
     system = platform.system()
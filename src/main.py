@@ -17,7 +17,14 @@ from src.soundpad import SoundPad
 from src.dependencies.dependency_checker import DependencyChecker
 from src.audio.audio_utils import initialize_audio
 # Import our logger
-from src.utils.logger import logger
+from src.utils.logger import (
+    logger, get_log_file_path, start_log_retention,
+    LOG_KEEP_COUNT, LOG_KEEP_DAYS, LOG_KEEP_MB
+)
+from src.utils.file_utils import get_app_settings_path, load_json
+from src.utils.metrics import get_metrics_port, start_metrics_server
+from src.utils.tracing import span
+from src.utils.profiling import get_profiler, install_profile_signal, start_profile_from_env
 
 def main():
     logger.info("Starting CxrruptPad application")
@@ -106,12 +113,13 @@ def main():
         app.processEvents()  # Update UI
         time.sleep(0.5)  # Small delay for visual feedback
         
-        all_deps_installed = dependency_checker.check_dependencies()
+        with span("startup.dependencies"):
+            all_deps_installed = dependency_checker.check_dependencies()
         
         # Show dependency status
         missing_deps = dependency_checker.missing_deps
         if missing_deps:
-            logger.warning(f"Missing dependencies: {', '.join(missing_deps)}")
+            logger.warning("Missing dependencies: %s", ', '.join(missing_deps))
             status_label.setText(f"Missing dependencies: {', '.join(missing_deps)}")
         else:
             logger.info("All dependencies found")
@@ -131,12 +139,37 @@ def main():
         
         # Initialize pygame mixer with a sample rate that works well on both Windows and Linux
         logger.info("Initializing audio system")
-        initialize_audio()
+        with span("startup.audio"):
+            initialize_audio()
+        
+        # Profiling on request: SIGUSR1 toggles it, the environment can profile startup
+        install_profile_signal()
+        start_profile_from_env()
         
         # Create and show main window
         logger.info("Starting main application window")
-        window = SoundPad()
-        window.show()
+        with span("startup.window"):
+            window = SoundPad()
+        with span("startup.show"):
+            window.show()
+        
+        # Compress and prune old logs in the background
+        settings = load_json(get_app_settings_path())
+        start_log_retention(
+            max_count=settings.get('log_keep_count', LOG_KEEP_COUNT),
+            max_age_days=settings.get('log_keep_days', LOG_KEEP_DAYS),
+            max_total_mb=settings.get('log_keep_mb', LOG_KEEP_MB)
+        )
+        
+        # Serve runtime metrics on localhost when a port is configured
+        metrics_server = None
+        metrics_port = get_metrics_port(settings)
+        if metrics_port:
+            try:
+                metrics_server = start_metrics_server(metrics_port)
+                logger.info("Serving metrics on http://127.0.0.1:%s/metrics", metrics_port)
+            except OSError as e:
+                logger.warning("Could not serve metrics on port %s: %s", metrics_port, e)
         
         # Use a clean exit
         logger.debug("Entering main application loop")
@@ -145,14 +178,17 @@ def main():
         # Additional cleanup
         logger.info("Application closing, performing cleanup")
         window.cleanup()
+        get_profiler().stop()
+        if metrics_server:
+            metrics_server.shutdown()
         pygame.quit()
         
-        logger.info(f"Application exited with code: {exit_code}")
+        logger.info("Application exited with code: %s", exit_code)
         sys.exit(exit_code)
         
     except Exception as e:
         # Log the exception with full traceback
-        logger.critical(f"Fatal error during startup: {str(e)}", exc_info=True)
+        logger.critical("Fatal error during startup: %s", e, exc_info=True)
         
         # Show error message if something goes wrong during startup
         from PyQt6.QtWidgets import QMessageBox
@@ -160,7 +196,7 @@ def main():
         error_dialog.setIcon(QMessageBox.Icon.Critical)
         error_dialog.setWindowTitle("Application Error")
         error_dialog.setText(f"Error starting {APP_NAME}:")
-        error_dialog.setDetailedText(f"{str(e)}\n\nPlease check the log file at:\n{os.path.join(logger.handlers[1].baseFilename)}")
+        error_dialog.setDetailedText(f"{str(e)}\n\nPlease check the log file at:\n{get_log_file_path()}")
         error_dialog.setStandardButtons(QMessageBox.StandardButton.Ok)
         error_dialog.exec()
         sys.exit(1)
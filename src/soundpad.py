@@ -1,5 +1,6 @@
 import os
 import sys
+import platform
 import json
 import pygame
 import time
@@ -8,18 +9,46 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QMessageBox, QInputDialog,
     QMenu, QSlider, QDialog, QFileDialog
 )
-from PyQt6.QtGui import QIcon, QAction
+from PyQt6.QtGui import QIcon, QAction, QShortcut, QKeySequence
 from PyQt6.QtCore import Qt, QTimer, QSize
 
 from src.constants import APP_STYLE, APP_NAME, APP_VERSION, SOUND_END_EVENT, detect_system
 from src.ui.components import LogoWidget, WaveformVisualizer
-from src.audio.recorder import RecorderDialog
+from src.audio.recorder import RecorderDialog, ReplayCaptureThread
+from src.audio.audio_utils import get_default_audio_device
+from src.audio.metadata import probe_sound_file
+from src.audio.sound_cache import sound_cache
+from src.audio.threads import DedupeSoundsThread, PlaylistDownloadThread
+from src.audio.ytdlp import get_download_journal
+from src.audio.media_cache import get_media_cache
 from src.utils.file_utils import (
     get_sounds_dir, get_tab_dir, get_data_dir,
-    save_json, load_json, get_app_settings_path
+    save_json, load_json, get_app_settings_path, rename_tab_data, delete_tab_data
 )
+from src.utils.blob_store import get_blob_store
 from src.tabpage import TabPage
 from src.utils.logger import logger
+from src.utils.perf import start_timer, log_elapsed
+from src.utils.metrics import get_metrics
+from src.utils.watchdog import StallWatchdog
+from src.utils.profiling import get_profiler, PROFILE_SECONDS
+from src.utils.tracing import (
+    traced, is_enabled as is_tracing_enabled, enable_tracing, disable_tracing,
+    span_count, dump_trace, get_default_trace_path
+)
+
+# Playback metrics
+plays_counter = get_metrics().counter("cxrruptpad_plays_total", "Sounds started")
+play_failures_counter = get_metrics().counter(
+    "cxrruptpad_play_failures_total", "Triggers that could not play their sound", ("reason",)
+)
+channel_steals_counter = get_metrics().counter(
+    "cxrruptpad_channel_steals_total", "Sounds stopped early to free a channel for a new one"
+)
+active_voices_gauge = get_metrics().gauge("cxrruptpad_active_voices", "Sounds playing right now")
+trigger_histogram = get_metrics().histogram(
+    "cxrruptpad_trigger_seconds", "Time from a trigger until its sound starts playing"
+)
 
 class SoundPad(QWidget):
     def __init__(self):
@@ -34,6 +63,7 @@ class SoundPad(QWidget):
         # State variables
         self.current_tab_index = 0
         self.currently_playing = {}  # {channel: (tab_name, sound_index)}
+        self.replay_thread = None  # Instant replay capture, when enabled
         
         # Setup UI
         logger.debug("Setting up user interface")
@@ -52,8 +82,20 @@ class SoundPad(QWidget):
         self.check_timer.timeout.connect(self.check_sound_status)
         self.check_timer.start(100)  # Check every 100ms
         
+        # Log where the GUI thread was whenever it blocks the event loop
+        self.stall_watchdog = StallWatchdog(parent=self)
+        self.stall_watchdog.start_watching()
+        
         # Add a pygame event handler for sound end events
         pygame.event.set_allowed(SOUND_END_EVENT)
+        
+        # Deduplicate sounds across tabs in the background once the UI is up
+        self.dedupe_thread = None
+        QTimer.singleShot(5000, self.start_dedupe)
+        
+        # Pick up downloads that were interrupted by the last shutdown or crash
+        self.resume_thread = None
+        QTimer.singleShot(1000, self.resume_downloads)
         logger.debug("SoundPad initialization complete")
     
     def init_ui(self):
@@ -69,6 +111,10 @@ class SoundPad(QWidget):
         self.logo = LogoWidget()
         header_layout.addWidget(self.logo)
         
+        # Right-clicking the logo opens the diagnostics menu
+        self.logo.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.logo.customContextMenuRequested.connect(self.show_diagnostics_menu)
+        
         # Add spacer to push buttons to the right
         header_layout.addStretch()
         
@@ -76,6 +122,31 @@ class SoundPad(QWidget):
         tab_controls = QHBoxLayout()
         tab_controls.setSpacing(5)
         
+        # Instant replay toggle; Ctrl+Shift+C saves the last seconds of input
+        self.replay_btn = QPushButton("Replay Off")
+        self.replay_btn.setCheckable(True)
+        self.replay_btn.setToolTip("Keep the last seconds of input audio (Ctrl+Shift+C to save a clip)")
+        self.replay_btn.toggled.connect(self.toggle_replay)
+        self.replay_btn.setStyleSheet(f"""
+            QPushButton {{
+                background: #555555;
+                color: {APP_STYLE['text_color']};
+                border: none;
+                border-radius: 6px;
+                padding: 8px 12px;
+            }}
+            QPushButton:hover {{
+                background: #666666;
+            }}
+            QPushButton:checked {{
+                background: {APP_STYLE['accent_color']};
+                font-weight: bold;
+            }}
+        """)
+        tab_controls.addWidget(self.replay_btn)
+        self.replay_shortcut = QShortcut(QKeySequence("Ctrl+Shift+C"), self)
+        self.replay_shortcut.activated.connect(self.save_replay)
+        
         # Add Tab button
         self.add_tab_btn = QPushButton("+ Add Tab")
         self.add_tab_btn.clicked.connect(lambda: self.add_tab())
@@ -252,7 +323,7 @@ class SoundPad(QWidget):
         
         # Save the volume setting
         self.save_volume_setting(value)
-        logger.debug(f"Volume set to {value}%")
+        logger.debug("Volume set to %s%%", value)
     
     def save_volume_setting(self, volume):
         # Get settings path
@@ -267,7 +338,7 @@ class SoundPad(QWidget):
         # Update volume setting
         settings['volume'] = volume
         save_json(settings_path, settings)
-        logger.debug(f"Volume setting saved: {volume}%")
+        logger.debug("Volume setting saved: %s%%", volume)
     
     def load_volume_setting(self):
         # Default volume
@@ -281,11 +352,12 @@ class SoundPad(QWidget):
             settings = load_json(settings_path)
             if 'volume' in settings:
                 volume = settings['volume']
-                logger.debug(f"Loaded volume setting: {volume}%")
+                logger.debug("Loaded volume setting: %s%%", volume)
         
         # Set the volume slider and apply the volume
         self.volume_slider.setValue(volume)
     
+    @traced("tabs.load")
     def load_tabs(self):
         # Clear existing tabs
         logger.debug("Clearing existing tabs")
@@ -298,10 +370,11 @@ class SoundPad(QWidget):
         # Ensure the tabs directory exists
         if not os.path.exists(tabs_dir):
             os.makedirs(tabs_dir)
-            logger.info(f"Created tabs directory: {tabs_dir}")
+            logger.info("Created tabs directory: %s", tabs_dir)
         
-        # Get all subdirectories in the tabs directory (each is a tab)
-        tab_dirs = [d for d in os.listdir(tabs_dir) if os.path.isdir(os.path.join(tabs_dir, d))]
+        # Get all subdirectories in the tabs directory (each is a tab, hidden ones like the blob store aren't)
+        tab_dirs = [d for d in os.listdir(tabs_dir)
+                    if not d.startswith('.') and os.path.isdir(os.path.join(tabs_dir, d))]
         
         # If no tabs exist, create a default one
         if not tab_dirs:
@@ -310,7 +383,7 @@ class SoundPad(QWidget):
         else:
             # Load each tab
             for tab_name in sorted(tab_dirs):
-                logger.debug(f"Loading tab: {tab_name}")
+                logger.debug("Loading tab: %s", tab_name)
                 tab_page = TabPage(tab_name, self)
                 self.tab_widget.addTab(tab_page, tab_name)
                 tab_page.load_sounds()  # Auto-load sounds for all tabs
@@ -321,7 +394,7 @@ class SoundPad(QWidget):
                 settings = load_json(settings_path)
                 if 'current_tab' in settings and settings['current_tab'] < len(tab_dirs):
                     self.tab_widget.setCurrentIndex(settings['current_tab'])
-                    logger.debug(f"Set current tab to saved index: {settings['current_tab']}")
+                    logger.debug("Set current tab to saved index: %s", settings['current_tab'])
     
     def add_tab(self, name=None, prompt=True):
         if prompt:
@@ -343,7 +416,7 @@ class SoundPad(QWidget):
             # Tab already exists
             QMessageBox.warning(self, "Tab Exists", 
                               f"A tab named '{name}' already exists.")
-            logger.warning(f"Attempted to create tab that already exists: {name}")
+            logger.warning("Attempted to create tab that already exists: %s", name)
             return
         
         # Create the directory
@@ -356,7 +429,7 @@ class SoundPad(QWidget):
         index = self.tab_widget.addTab(tab_page, name)
         self.tab_widget.setCurrentIndex(index)
         
-        logger.info(f"Created new tab: {name}")
+        logger.info("Created new tab: %s", name)
     
     def rename_tab(self):
         # Get current tab index
@@ -387,13 +460,14 @@ class SoundPad(QWidget):
         if os.path.exists(tab_dir):
             QMessageBox.warning(self, "Tab Exists", 
                               f"A tab named '{new_name}' already exists.")
-            logger.warning(f"Attempted to rename tab to existing name: {new_name}")
+            logger.warning("Attempted to rename tab to existing name: %s", new_name)
             return
         
         # Rename the directory
         old_dir = os.path.join(get_tab_dir(), old_name)
         try:
             os.rename(old_dir, tab_dir)
+            rename_tab_data(old_name, new_name)
             
             # Update the tab widget
             self.tab_widget.setTabText(index, new_name)
@@ -403,11 +477,11 @@ class SoundPad(QWidget):
             if tab_page:
                 tab_page.tab_name = new_name
                 
-            logger.info(f"Renamed tab from '{old_name}' to '{new_name}'")
+            logger.info("Renamed tab from '%s' to '%s'", old_name, new_name)
         except Exception as e:
             QMessageBox.critical(self, "Rename Failed", 
                                f"Failed to rename tab: {str(e)}")
-            logger.error(f"Failed to rename tab from '{old_name}' to '{new_name}': {str(e)}")
+            logger.error("Failed to rename tab from '%s' to '%s': %s", old_name, new_name, e)
     
     def delete_tab(self):
         # Get current tab index
@@ -439,11 +513,12 @@ class SoundPad(QWidget):
         try:
             import shutil
             shutil.rmtree(tab_dir)
-            logger.info(f"Deleted tab: {tab_name}")
+            delete_tab_data(tab_name)
+            logger.info("Deleted tab: %s", tab_name)
         except Exception as e:
             QMessageBox.critical(self, "Delete Failed", 
                                f"Failed to delete tab directory: {str(e)}")
-            logger.error(f"Failed to delete tab directory for '{tab_name}': {str(e)}")
+            logger.error("Failed to delete tab directory for '%s': %s", tab_name, e)
             return
         
         # If no tabs left, create a default one
@@ -464,9 +539,12 @@ class SoundPad(QWidget):
                 channel.stop()
                 del self.currently_playing[channel]
                 
-        logger.debug(f"Stopped {len(channels_to_stop)} sounds from tab: {tab_name}")
+        logger.debug("Stopped %s sounds from tab: %s", len(channels_to_stop), tab_name)
     
+    @traced("sound.trigger")
     def toggle_sound(self, tab_name, index):
+        trigger_started = start_timer()
+        
         # Get a free channel for this sound
         try:
             # Check if this sound is already playing
@@ -475,7 +553,8 @@ class SoundPad(QWidget):
                     # Stop the sound
                     channel.stop()
                     del self.currently_playing[channel]
-                    logger.debug(f"Stopped sound {index} in tab '{tab_name}'")
+                    active_voices_gauge.set(len(self.currently_playing))
+                    logger.debug("Stopped sound %s in tab '%s'", index, tab_name)
                     return
             
             # Sound is not playing, so play it
@@ -487,47 +566,47 @@ class SoundPad(QWidget):
                     break
             
             if not tab_page:
-                logger.error(f"Could not find tab page for '{tab_name}'")
+                logger.error("Could not find tab page for '%s'", tab_name)
+                play_failures_counter.inc(labels=("no_tab",))
                 return
             
             # Get the sound data
             sound_data = tab_page.get_sound_data(index)
             if not sound_data:
-                logger.warning(f"No sound data found for index {index} in tab '{tab_name}'")
+                logger.warning("No sound data found for index %s in tab '%s'", index, tab_name)
+                play_failures_counter.inc(labels=("no_sound",))
                 return
             
             sound_path = sound_data.get('path', '')
             if not sound_path or not os.path.exists(sound_path):
-                logger.error(f"Sound file not found: {sound_path}")
+                logger.error("Sound file not found: %s", sound_path)
+                play_failures_counter.inc(labels=("missing_file",))
                 return
             
             # Get a free channel
             channel = pygame.mixer.find_channel()
             if not channel:
-                # No free channels, stop the oldest sound
+                # No free channels, stop the oldest sound (channels are kept in the order their sounds started)
                 oldest_channel = None
-                oldest_time = float('inf')
-                for ch, _ in self.currently_playing.items():
+                for ch in self.currently_playing:
                     if ch.get_sound() and ch.get_busy():
-                        sound_pos = ch.get_pos() / 1000.0  # Convert to seconds
-                        sound_length = ch.get_sound().get_length()
-                        time_left = sound_length - sound_pos
-                        if time_left < oldest_time:
-                            oldest_time = time_left
-                            oldest_channel = ch
+                        oldest_channel = ch
+                        break
                 
                 if oldest_channel:
                     oldest_channel.stop()
                     del self.currently_playing[oldest_channel]
                     channel = oldest_channel
+                    channel_steals_counter.inc()
                     logger.debug("Stopped oldest sound to free up a channel")
                 else:
                     logger.warning("No channels available to play sound")
+                    play_failures_counter.inc(labels=("no_channel",))
                     return
             
-            # Load and play the sound
+            # Load and play the sound (decoded once per blob, shared across tabs)
             try:
-                sound = pygame.mixer.Sound(sound_path)
+                sound = sound_cache.get(sound_path, tab_page.get_sound_trim(index))
                 
                 # Get the volume
                 volume = self.volume_slider.value() / 100.0
@@ -537,11 +616,14 @@ class SoundPad(QWidget):
                 
                 # Play the sound
                 channel.play(sound)
+                trigger_histogram.observe(log_elapsed("sound.trigger", trigger_started))
+                plays_counter.inc()
                 
                 # Store the playing sound
                 self.currently_playing[channel] = (tab_name, index)
+                active_voices_gauge.set(len(self.currently_playing))
                 
-                logger.debug(f"Playing sound {index} from tab '{tab_name}': {os.path.basename(sound_path)}")
+                logger.debug("Playing sound %s from tab '%s': %s", index, tab_name, os.path.basename(sound_path))
                 
                 # Set the channel's endevent
                 channel.set_endevent(SOUND_END_EVENT)
@@ -553,12 +635,13 @@ class SoundPad(QWidget):
                 self.waveform.set_playing(True)
                 
             except Exception as e:
-                logger.error(f"Error playing sound {index} from tab '{tab_name}': {str(e)}")
+                logger.error("Error playing sound %s from tab '%s': %s", index, tab_name, e)
+                play_failures_counter.inc(labels=("error",))
                 QMessageBox.critical(self, "Playback Error", 
                                    f"Failed to play sound: {str(e)}")
         
         except Exception as e:
-            logger.error(f"Error in toggle_sound: {str(e)}", exc_info=True)
+            logger.error("Error in toggle_sound: %s", e, exc_info=True)
     
     def check_sound_status(self):
         # Check for sound end events
@@ -574,15 +657,129 @@ class SoundPad(QWidget):
                         if self.tab_widget.tabText(i) == tab_name:
                             tab_page = self.tab_widget.widget(i)
                             tab_page.set_button_playing_state(index, False)
-                            logger.debug(f"Sound {index} in tab '{tab_name}' finished playing")
+                            logger.debug("Sound %s in tab '%s' finished playing", index, tab_name)
                             break
         
+        active_voices_gauge.set(len(self.currently_playing))
+        
         # Update waveform visualizer
         if pygame.mixer.get_busy():
             self.waveform.update_waveform()
         else:
             self.waveform.clear_waveform()
     
+    def start_dedupe(self):
+        # Only one deduplication pass at a time
+        if self.dedupe_thread and self.dedupe_thread.isRunning():
+            return
+        
+        self.dedupe_thread = DedupeSoundsThread(get_blob_store())
+        self.dedupe_thread.status_signal.connect(logger.debug)
+        self.dedupe_thread.finished_signal.connect(self.on_dedupe_finished)
+        self.dedupe_thread.start()
+    
+    def on_dedupe_finished(self, saved_bytes):
+        if saved_bytes:
+            logger.info("Deduplicated sounds, freed %.1f MB", saved_bytes / (1024 * 1024))
+    
+    def resume_downloads(self):
+        journal = get_download_journal()
+        items = []
+        for job_id, job in journal.unfinished():
+            # Drop jobs for tabs that were deleted in the meantime
+            if not os.path.isdir(job['tab_dir']):
+                journal.update(job_id, status='cancelled')
+                continue
+            items.append({
+                'url': job['url'],
+                'title': job['title'],
+                'tab_dir': job['tab_dir'],
+                'job_id': job_id,
+                'output_path': job['output_path']
+            })
+        if not items:
+            return
+        
+        logger.info("Resuming %s unfinished download(s)", len(items))
+        settings = load_json(get_app_settings_path())
+        workers = int(settings.get('download_workers', 3))
+        self.resume_thread = PlaylistDownloadThread(
+            items, get_sounds_dir(), False, workers=workers, journal=journal, media_cache=get_media_cache()
+        )
+        self.resume_thread.item_finished_signal.connect(self.on_resumed_download_finished)
+        self.resume_thread.error_signal.connect(
+            lambda index, title, msg: logger.error("Failed to resume download '%s': %s", title, msg)
+        )
+        self.resume_thread.finished_signal.connect(
+            lambda results: logger.info("Resumed downloads finished (%s/%s succeeded)", len(results), len(items))
+        )
+        self.resume_thread.start()
+    
+    def on_resumed_download_finished(self, index, result):
+        # Reload the tab the download belongs to, if it's still open
+        tab_name = os.path.basename(os.path.dirname(result['path']))
+        for i in range(self.tab_widget.count()):
+            if self.tab_widget.tabText(i) == tab_name:
+                self.tab_widget.widget(i).add_sound_entry(result)
+                break
+    
+    def toggle_replay(self, enabled):
+        if enabled:
+            settings = load_json(get_app_settings_path())
+            seconds = int(settings.get('replay_seconds', 30))
+            self.replay_thread = ReplayCaptureThread(get_default_audio_device(), platform.system(), seconds)
+            self.replay_thread.level_signal.connect(self.waveform.update_audio_level)
+            self.replay_thread.saved_signal.connect(self.on_replay_saved)
+            self.replay_thread.error_signal.connect(self.on_replay_error)
+            self.replay_thread.start()
+            self.replay_btn.setText(f"Replay {seconds}s")
+        else:
+            self.stop_replay()
+            self.replay_btn.setText("Replay Off")
+    
+    def stop_replay(self):
+        if self.replay_thread:
+            self.replay_thread.stop()
+            self.replay_thread.wait()
+            self.replay_thread = None
+    
+    def save_replay(self):
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        if not self.replay_thread:
+            current_tab.status_label.setText("Turn on Replay to capture clips")
+            return
+        if not self.replay_thread.isRunning():
+            # Capture ended (ffmpeg exited), so nothing would write the clip
+            logger.warning("Replay save requested, but capture is no longer running")
+            self.replay_btn.setChecked(False)
+            current_tab.status_label.setText("Replay capture stopped; turn on Replay again to capture clips")
+            return
+        
+        # Capture keeps running while the clip is written
+        path = os.path.join(get_tab_dir(current_tab.tab_name), f"Replay_{time.strftime('%Y%m%d_%H%M%S')}.wav")
+        self.replay_thread.request_save(path)
+    
+    def on_replay_saved(self, path):
+        # Add the clip to its tab, if it's still open
+        tab_name = os.path.basename(os.path.dirname(path))
+        for i in range(self.tab_widget.count()):
+            if self.tab_widget.tabText(i) == tab_name:
+                tab_page = self.tab_widget.widget(i)
+                sound_data = probe_sound_file(path)
+                if sound_data:
+                    tab_page.add_sound_entry(sound_data)
+                tab_page.status_label.setText(f"Saved replay: {os.path.basename(path)}")
+                break
+    
+    def on_replay_error(self, message):
+        logger.error(message)
+        # Capture errors end the thread; reflect that on the button
+        if self.replay_thread and self.replay_thread.isFinished():
+            self.replay_btn.setChecked(False)
+        QMessageBox.warning(self, "Instant Replay", message)
+    
     def stop_all_sounds(self):
         logger.debug("Stopping all sounds")
         # Stop all currently playing sounds
@@ -610,7 +807,7 @@ class SoundPad(QWidget):
         settings = load_json(settings_path) if os.path.exists(settings_path) else {}
         settings['current_tab'] = index
         save_json(settings_path, settings)
-        logger.debug(f"Changed to tab index {index}")
+        logger.debug("Changed to tab index %s", index)
     
     def keyPressEvent(self, event):
         # Handle spacebar to stop all sounds
@@ -634,17 +831,81 @@ class SoundPad(QWidget):
         
         # Play the sound at the given shortcut index
         current_tab.play_sound_by_index(shortcut_idx)
-        logger.debug(f"Triggered sound via keyboard shortcut: {shortcut_idx + 1}")
+        logger.debug("Triggered sound via keyboard shortcut: %s", shortcut_idx + 1)
+    
+    def show_diagnostics_menu(self, pos):
+        menu = QMenu(self)
+        
+        # Tracing actions
+        trace_action = QAction("Stop Tracing" if is_tracing_enabled() else "Start Tracing", self)
+        trace_action.triggered.connect(self.toggle_tracing)
+        menu.addAction(trace_action)
+        
+        save_trace_action = QAction(f"Save Trace ({span_count()} spans)...", self)
+        save_trace_action.triggered.connect(self.save_trace)
+        save_trace_action.setEnabled(span_count() > 0)
+        menu.addAction(save_trace_action)
+        
+        menu.addSeparator()
+        
+        # Profiling actions
+        profiler = get_profiler()
+        profile_action = QAction(
+            "Stop Profiling" if profiler.is_running() else f"Profile CPU and Memory ({PROFILE_SECONDS} s)", self
+        )
+        profile_action.triggered.connect(lambda: profiler.toggle())
+        menu.addAction(profile_action)
+        
+        # Show the menu
+        menu.exec(self.logo.mapToGlobal(pos))
+    
+    def toggle_tracing(self):
+        if is_tracing_enabled():
+            disable_tracing()
+            logger.info("Tracing stopped with %s spans", span_count())
+        else:
+            enable_tracing()
+            logger.info("Tracing started")
+    
+    def save_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Trace", get_default_trace_path(), "Chrome Trace Files (*.json)"
+        )
+        if not path:
+            return
+        try:
+            dump_trace(path)
+            logger.info("Saved trace to %s", path)
+        except OSError as e:
+            logger.error("Failed to save trace: %s", e)
+            QMessageBox.warning(self, "Save Trace", f"Failed to save trace: {str(e)}")
     
     def cleanup(self):
         logger.info("Performing application cleanup")
         # Stop the check timer
         if hasattr(self, 'check_timer'):
             self.check_timer.stop()
+        if hasattr(self, 'stall_watchdog'):
+            self.stall_watchdog.stop_watching()
         
         # Stop all sounds
         self.stop_all_sounds()
         
+        # Stop background work in the tabs
+        for i in range(self.tab_widget.count()):
+            self.tab_widget.widget(i).cleanup()
+        
+        if self.dedupe_thread and self.dedupe_thread.isRunning():
+            self.dedupe_thread.cancel()
+            self.dedupe_thread.wait()
+        
+        self.stop_replay()
+        
+        # Unfinished downloads stay in the journal for the next launch
+        if self.resume_thread and self.resume_thread.isRunning():
+            self.resume_thread.cancel(pause=True)
+            self.resume_thread.wait()
+        
         # Save the current tab index
         settings_path = get_app_settings_path()
         settings = load_json(settings_path) if os.path.exists(settings_path) else {}
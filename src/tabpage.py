@@ -1,26 +1,47 @@
 import os
+import bisect
 import pygame
 import concurrent.futures
-import subprocess
-import json
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, 
     QPushButton, QLabel, QMessageBox, QMenu, QDialog,
     QFileDialog, QInputDialog, QGridLayout, QProgressBar,
-    QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView
+    QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView, QListWidget
 )
 from PyQt6.QtGui import QAction, QIcon, QColor
 from PyQt6.QtCore import Qt, QSize, pyqtSignal
 
-from src.constants import APP_STYLE
+from src.constants import APP_STYLE, SOUND_EXTENSIONS
 from src.ui.components import GlowingButton, WaveformVisualizer
-from src.audio.threads import LoadSoundsThread, YouTubeDownloadThread, PlaylistDownloadThread
+from src.audio.threads import (
+    LoadSoundsThread, ImportSoundsThread, YouTubeDownloadThread,
+    PlaylistDownloadThread, PlaylistFetchThread, SilenceAnalysisThread, sound_sort_key
+)
 from src.audio.recorder import RecorderDialog
+from src.audio.ytdlp import get_download_journal, diff_playlist, create_safe_title, format_progress_stats
+from src.audio.media_cache import get_media_cache
+from src.audio.metadata import probe_sound_file
+from src.audio.silence import is_worth_trimming
 from src.utils.file_utils import (
-    get_tab_dir, get_tab_favorites_path, save_json, load_json,
-    create_safe_filename, delete_file_safely, move_file_safely
+    get_tab_dir, get_tab_favorites_path, get_tab_playlist_path, get_tab_trims_path, get_app_settings_path,
+    save_json, load_json, create_safe_filename, delete_file_safely, move_file_safely
 )
+from src.utils.blob_store import get_blob_store
 from src.utils.logger import logger
+from src.utils.perf import start_timer, log_elapsed
+from src.utils.tracing import traced
+
+class SortKeys:
+    """Read-only view of the sort keys of a sound list, for bisect."""
+    
+    def __init__(self, sounds):
+        self.sounds = sounds
+    
+    def __len__(self):
+        return len(self.sounds)
+    
+    def __getitem__(self, index):
+        return sound_sort_key(os.path.basename(self.sounds[index]['path']))
 
 class TabPage(QWidget):
     def __init__(self, tab_name, parent=None):
@@ -32,14 +53,18 @@ class TabPage(QWidget):
         self.sound_buttons_layout = None
         self.favorites = {}
         self.hotkeys = {}
+        self.trims = {}  # {filename: [start, end]} applied at playback
         
-        logger.debug(f"Initializing TabPage for tab: {tab_name}")
+        logger.debug("Initializing TabPage for tab: %s", tab_name)
         
         # Initialize UI
         self.init_ui()
         
         # Load favorites and hotkeys
         self.load_favorites()
+        
+        # Load silence trims
+        self.trims = load_json(get_tab_trims_path(self.tab_name))
     
     def init_ui(self):
         # Main layout
@@ -131,6 +156,24 @@ class TabPage(QWidget):
         self.playlist_btn.clicked.connect(self.show_playlist_dialog)
         controls_layout.addWidget(self.playlist_btn)
         
+        # Tools button
+        self.tools_btn = QPushButton("Tools")
+        self.tools_btn.setStyleSheet(f"""
+            QPushButton {{
+                background: #2E6B8A;
+                color: {APP_STYLE['text_color']};
+                border: none;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background: #245670;
+            }}
+        """)
+        self.tools_btn.clicked.connect(self.show_tools_menu)
+        controls_layout.addWidget(self.tools_btn)
+        
         # Stop All button
         self.stop_all_btn = QPushButton("Stop All")
         self.stop_all_btn.setStyleSheet(f"""
@@ -235,19 +278,48 @@ class TabPage(QWidget):
         self.buttons = []
     
     def load_sounds(self):
+        # Stop a load that is still running so its results don't mix with ours
+        if hasattr(self, 'load_thread') and self.load_thread.isRunning():
+            self.load_thread.cancel()
+        
         # Clear existing sound buttons
         self.clear_sound_buttons()
+        self.sounds = []
+        self.sound_table.setRowCount(0)
         
         # Update status
         self.status_label.setText("Loading sounds...")
-        logger.info(f"Loading sounds for tab: {self.tab_name}")
+        logger.info("Loading sounds for tab: %s", self.tab_name)
+        
+        # Tag parsing can optionally run in a process pool for huge tabs; off by default, since
+        # each worker process takes ~0.15 s to start, which only pays off with thousands of sounds
+        settings = load_json(get_app_settings_path())
+        use_processes = bool(settings.get('metadata_process_pool', False))
         
         # Start thread to load sounds
-        self.load_thread = LoadSoundsThread(self.tab_name)
-        self.load_thread.loading_status_signal.connect(self.status_label.setText)
+        self.load_started = start_timer()
+        self.load_thread = LoadSoundsThread(self.tab_name, use_processes=use_processes)
+        self.load_thread.loading_status_signal.connect(self.on_loading_status)
+        self.load_thread.loading_batch_signal.connect(self.on_sounds_batch)
         self.load_thread.loading_finished_signal.connect(self.on_sounds_loaded)
         self.load_thread.start()
     
+    def on_loading_status(self, message):
+        # Ignore stragglers from a cancelled load
+        if self.sender() is self.load_thread:
+            self.status_label.setText(message)
+    
+    @traced("tab.add_batch")
+    def on_sounds_batch(self, batch):
+        # Ignore stragglers from a cancelled load
+        if self.sender() is not self.load_thread:
+            return
+        
+        # Batches arrive in display order, so just append them
+        start = len(self.sounds)
+        self.sounds.extend(batch)
+        self.append_sound_rows(start)
+    
     def clear_sound_buttons(self):
         # Remove all buttons from layout
         if self.sound_buttons_layout:
@@ -260,73 +332,91 @@ class TabPage(QWidget):
         self.buttons.clear()
     
     def on_sounds_loaded(self, sounds, success):
+        # Ignore stragglers from a cancelled load
+        if self.sender() is not self.load_thread:
+            return
+        
         # Set sounds list
         self.sounds = sounds
         
         if success:
-            # Create buttons for sounds
-            self.create_sound_buttons()
+            # Rows were already added batch by batch; only rebuild if they differ
+            if self.sound_table.rowCount() != len(sounds):
+                self.create_sound_buttons()
             self.status_label.setText(f"Loaded {len(sounds)} sounds")
-            logger.info(f"Successfully loaded {len(sounds)} sounds for tab: {self.tab_name}")
+            logger.info("Successfully loaded %s sounds for tab: %s", len(sounds), self.tab_name)
+            log_elapsed("tab.load", self.load_started, sounds=len(sounds))
         else:
             self.status_label.setText("Failed to load sounds")
-            logger.error(f"Failed to load sounds for tab: {self.tab_name}")
+            logger.error("Failed to load sounds for tab: %s", self.tab_name)
     
     def create_sound_buttons(self):
         # Instead of buttons, populate the table
         self.sound_table.setRowCount(0)
         self.buttons = []
-        for i, sound in enumerate(self.sounds):
-            self.sound_table.insertRow(i)
-            # Index
-            idx_item = QTableWidgetItem(str(i))
-            idx_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.sound_table.setItem(i, 0, idx_item)
-            # Name
-            name_item = QTableWidgetItem(sound['name'])
-            self.sound_table.setItem(i, 1, name_item)
-            # Duration
-            duration = sound.get('duration', '')
-            duration_str = ''
-            try:
-                if isinstance(duration, (int, float)) and duration:
-                    mins = int(duration) // 60
-                    secs = int(duration) % 60
-                    duration_str = f"{mins}:{secs:02d}"
-                elif isinstance(duration, str) and duration:
-                    # Try to parse as float
-                    d = float(duration)
-                    mins = int(d) // 60
-                    secs = int(d) % 60
-                    duration_str = f"{mins}:{secs:02d}"
-            except:
-                duration_str = ''
-            duration_item = QTableWidgetItem(duration_str)
-            duration_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.sound_table.setItem(i, 2, duration_item)
-            # Hotkey
-            hotkey = ''
-            for key, value in self.hotkeys.items():
-                if value == str(i):
-                    try:
-                        key_num = int(key)
-                        if 0 <= key_num <= 8:
-                            hotkey = f"{key_num + 1}"
-                        elif 9 <= key_num <= 20:
-                            hotkey = f"F{key_num - 8}"
-                    except:
-                        pass
-            hotkey_item = QTableWidgetItem(hotkey)
-            hotkey_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.sound_table.setItem(i, 3, hotkey_item)
+        self.append_sound_rows(0)
+    
+    def append_sound_rows(self, start):
+        # Add table rows for self.sounds[start:]
+        self.sound_table.setUpdatesEnabled(False)
+        self.sound_table.setRowCount(len(self.sounds))
+        search_text = self.search_bar.text().lower()
+        for i in range(start, len(self.sounds)):
+            self.set_sound_row(i, self.sounds[i])
+            if search_text:
+                self.sound_table.setRowHidden(i, search_text not in self.sounds[i]['name'].lower())
             self.buttons.append(None)  # For compatibility
         self.sound_table.resizeRowsToContents()
+        self.sound_table.setUpdatesEnabled(True)
+    
+    def set_sound_row(self, i, sound):
+        # Index
+        idx_item = QTableWidgetItem(str(i))
+        idx_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.sound_table.setItem(i, 0, idx_item)
+        # Name
+        name_item = QTableWidgetItem(sound['name'])
+        self.sound_table.setItem(i, 1, name_item)
+        # Duration
+        duration = sound.get('duration', '')
+        duration_str = ''
+        try:
+            if isinstance(duration, (int, float)) and duration:
+                mins = int(duration) // 60
+                secs = int(duration) % 60
+                duration_str = f"{mins}:{secs:02d}"
+            elif isinstance(duration, str) and duration:
+                # Try to parse as float
+                d = float(duration)
+                mins = int(d) // 60
+                secs = int(d) % 60
+                duration_str = f"{mins}:{secs:02d}"
+        except:
+            duration_str = ''
+        duration_item = QTableWidgetItem(duration_str)
+        duration_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.sound_table.setItem(i, 2, duration_item)
+        # Hotkey
+        hotkey = ''
+        for key, value in self.hotkeys.items():
+            if value == str(i):
+                try:
+                    key_num = int(key)
+                    if 0 <= key_num <= 8:
+                        hotkey = f"{key_num + 1}"
+                    elif 9 <= key_num <= 20:
+                        hotkey = f"F{key_num - 8}"
+                except:
+                    pass
+        hotkey_item = QTableWidgetItem(hotkey)
+        hotkey_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.sound_table.setItem(i, 3, hotkey_item)
     
     def toggle_sound(self, index):
         # Call the parent's toggle sound method
         if index < len(self.sounds):
             self.parent.toggle_sound(self.tab_name, index)
-            logger.debug(f"Toggle sound at index {index} in tab: {self.tab_name}")
+            logger.debug("Toggle sound at index %s in tab: %s", index, self.tab_name)
     
     def get_sound_data(self, index):
         # Return sound data at the specified index
@@ -334,6 +424,14 @@ class TabPage(QWidget):
             return self.sounds[index]
         return None
     
+    def get_sound_trim(self, index):
+        # Return the (start, end) a sound is trimmed to, or None
+        if 0 <= index < len(self.sounds):
+            trim = self.trims.get(os.path.basename(self.sounds[index]['path']))
+            if trim:
+                return tuple(trim)
+        return None
+    
     def update_button_playing_state(self, index, is_playing):
         # No-op: No buttons to update in table mode
         pass
@@ -345,7 +443,7 @@ class TabPage(QWidget):
     def stop_all_sounds(self):
         # Tell parent to stop all sounds
         self.parent.stop_all_sounds()
-        logger.debug(f"Stopping all sounds from tab: {self.tab_name}")
+        logger.debug("Stopping all sounds from tab: %s", self.tab_name)
     
     def show_add_sound_menu(self):
         # Create context menu
@@ -363,19 +461,67 @@ class TabPage(QWidget):
         # Show the menu
         menu.exec(self.add_sound_btn.mapToGlobal(self.add_sound_btn.rect().bottomLeft()))
     
+    def show_tools_menu(self):
+        # Create context menu
+        menu = QMenu(self)
+        link = load_json(get_tab_playlist_path(self.tab_name))
+        
+        # Playlist actions
+        link_action = QAction("Change Linked Playlist" if link.get('url') else "Link Playlist", self)
+        link_action.triggered.connect(self.link_playlist)
+        menu.addAction(link_action)
+        
+        sync_action = QAction("Sync Playlist", self)
+        sync_action.triggered.connect(self.sync_playlist)
+        sync_action.setEnabled(bool(link.get('url')))
+        menu.addAction(sync_action)
+        
+        unlink_action = QAction("Unlink Playlist", self)
+        unlink_action.triggered.connect(self.unlink_playlist)
+        unlink_action.setEnabled(bool(link.get('url')))
+        menu.addAction(unlink_action)
+        
+        menu.addSeparator()
+        
+        # Silence actions, on the selected sounds or the whole tab
+        selected = self.get_selected_paths()
+        
+        trim_selected_action = QAction("Trim Silence (Selected)", self)
+        trim_selected_action.triggered.connect(lambda: self.analyze_silence(selected))
+        trim_selected_action.setEnabled(bool(selected))
+        menu.addAction(trim_selected_action)
+        
+        trim_all_action = QAction("Trim Silence (Whole Tab)", self)
+        trim_all_action.triggered.connect(lambda: self.analyze_silence([sound['path'] for sound in self.sounds]))
+        trim_all_action.setEnabled(bool(self.sounds))
+        menu.addAction(trim_all_action)
+        
+        split_action = QAction("Split Selected at Silence", self)
+        split_action.triggered.connect(lambda: self.analyze_silence(selected, split=True))
+        split_action.setEnabled(bool(selected))
+        menu.addAction(split_action)
+        
+        clear_trims_action = QAction("Clear Trims (Selected)", self)
+        clear_trims_action.triggered.connect(lambda: self.clear_trims(selected))
+        clear_trims_action.setEnabled(any(os.path.basename(path) in self.trims for path in selected))
+        menu.addAction(clear_trims_action)
+        
+        # Show the menu
+        menu.exec(self.tools_btn.mapToGlobal(self.tools_btn.rect().bottomLeft()))
+    
     def add_sound_file(self):
         # Show file open dialog
         files, _ = QFileDialog.getOpenFileNames(
             self,
             "Select Sound Files",
             "",
-            "Sound Files (*.mp3 *.wav *.ogg);;All Files (*)"
+            "Sound Files (*.mp3 *.wav *.ogg *.flac *.opus);;All Files (*)"
         )
         
         if not files:
             return
         
-        logger.info(f"Adding {len(files)} sound files to tab: {self.tab_name}")
+        logger.info("Adding %s sound files to tab: %s", len(files), self.tab_name)
         
         # Get tab directory
         tab_dir = get_tab_dir(self.tab_name)
@@ -397,10 +543,10 @@ class TabPage(QWidget):
                 
                 move_file_safely(file_path, dest_path, copy=True)
                 success_count += 1
-                logger.debug(f"Added sound file: {safe_filename} to tab: {self.tab_name}")
+                logger.debug("Added sound file: %s to tab: %s", safe_filename, self.tab_name)
                 
             except Exception as e:
-                logger.error(f"Error adding sound file {file_path}: {str(e)}")
+                logger.error("Error adding sound file %s: %s", file_path, e)
                 QMessageBox.critical(self,
                                    "Error Adding Sound",
                                    f"Failed to add {os.path.basename(file_path)}: {str(e)}")
@@ -409,7 +555,7 @@ class TabPage(QWidget):
             # Reload sounds
             self.load_sounds()
             self.status_label.setText(f"Added {success_count} sound(s)")
-            logger.info(f"Successfully added {success_count} sounds to tab: {self.tab_name}")
+            logger.info("Successfully added %s sounds to tab: %s", success_count, self.tab_name)
     
     def add_sound_folder(self):
         # Show folder select dialog
@@ -421,62 +567,166 @@ class TabPage(QWidget):
         if not folder_path:
             return
         
+        # Ask how the files should be brought into the tab
+        import_modes = {
+            "Copy": "copy",
+            "Reflink (copy-on-write clone, falls back to copy)": "reflink",
+            "Hardlink (no extra disk space, falls back to copy)": "hardlink"
+        }
+        mode_name, ok = QInputDialog.getItem(
+            self,
+            "Add Sound Folder",
+            "Import mode:",
+            list(import_modes.keys()),
+            0,
+            False
+        )
+        
+        if not ok:
+            return
+        
         # Get tab directory
         tab_dir = get_tab_dir(self.tab_name)
+        logger.info("Importing sound folder %s into tab: %s (%s)", folder_path, self.tab_name, import_modes[mode_name])
         
-        # Find all sound files in the folder
-        sound_files = []
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.lower().endswith(('.mp3', '.wav', '.ogg')):
-                    sound_files.append(os.path.join(root, file))
+        # Progress dialog (non-modal, the tab stays usable during the import)
+        progress_dialog = QDialog(self)
+        progress_dialog.setWindowTitle("Importing Sounds")
+        progress_dialog.setMinimumWidth(400)
+        progress_dialog.setStyleSheet(f"""
+            QDialog {{ background: {APP_STYLE['darker_color']}; }}
+            QLabel {{ color: {APP_STYLE['text_color']}; }}
+            QProgressBar {{
+                border: 1px solid {APP_STYLE['primary_color']};
+                border-radius: 5px;
+                background: #252535;
+                text-align: center;
+            }}
+            QProgressBar::chunk {{
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 {APP_STYLE['primary_color']},
+                                          stop:1 {APP_STYLE['secondary_color']});
+                border-radius: 4px;
+            }}
+        """)
+        layout = QVBoxLayout(progress_dialog)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(10)
+        status_label = QLabel("Scanning folder...")
+        layout.addWidget(status_label)
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 0)  # Indeterminate until files are found
+        layout.addWidget(progress_bar)
+        cancel_button = QPushButton("Cancel")
+        layout.addWidget(cancel_button)
         
-        if not sound_files:
-            QMessageBox.information(self, "No Sound Files", "No sound files found in the selected folder.")
-            return
+        # Start import thread
+        import_thread = ImportSoundsThread(folder_path, tab_dir, import_modes[mode_name], get_blob_store())
+        self._import_thread = import_thread  # Keep reference to prevent GC
         
-        # Ask if user wants to add sound files
-        reply = QMessageBox.question(
-            self,
-            "Add Sound Files",
-            f"Found {len(sound_files)} sound files. Add them to the tab?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.Yes
-        )
+        def on_progress(imported, found):
+            progress_bar.setRange(0, max(1, found))
+            progress_bar.setValue(imported)
         
-        if reply != QMessageBox.StandardButton.Yes:
-            return
+        def on_sound_imported(sound_data, replaced):
+            # Files that replaced an existing sound are already in the list
+            if not replaced:
+                self.add_sound_entry(sound_data)
         
-        # Copy files to tab directory
-        success_count = 0
+        def on_finished(imported, failures, cancelled):
+            progress_dialog.accept()
+            self._import_thread = None
+            
+            # Share storage with identical sounds in other tabs
+            if imported:
+                self.parent.start_dedupe()
+            
+            if cancelled:
+                msg = f"Import cancelled after {imported} sounds."
+            else:
+                msg = f"Successfully imported {imported} sounds."
+            self.status_label.setText(msg)
+            logger.info("%s (%s failed) Tab: %s", msg, len(failures), self.tab_name)
+            
+            if failures:
+                for failure in failures:
+                    logger.error("Failed to import %s", failure)
+                details = "\n".join(failures[:20])
+                if len(failures) > 20:
+                    details += f"\n... and {len(failures) - 20} more"
+                QMessageBox.warning(
+                    self,
+                    "Import Complete",
+                    f"{msg}\nFailed to import {len(failures)} file(s):\n{details}"
+                )
+            else:
+                QMessageBox.information(self, "Import Complete", msg)
+        
+        def on_cancel():
+            status_label.setText("Cancelling...")
+            cancel_button.setEnabled(False)
+            import_thread.cancel()
+        
+        import_thread.progress_signal.connect(on_progress)
+        import_thread.status_signal.connect(status_label.setText)
+        import_thread.sound_imported_signal.connect(on_sound_imported)
+        import_thread.finished_signal.connect(on_finished)
+        cancel_button.clicked.connect(on_cancel)
+        progress_dialog.rejected.connect(import_thread.cancel)
+        
+        import_thread.start()
+        progress_dialog.show()
+    
+    def add_sound_entry(self, sound_data):
+        # Insert a single sound at its sorted position without reloading the whole tab
+        position = bisect.bisect_right(SortKeys(self.sounds), sound_sort_key(os.path.basename(sound_data['path'])))
+        if position == len(self.sounds):
+            self.sounds.append(sound_data)
+            self.append_sound_rows(position)
+            return
         
-        for src_path in sound_files:
+        # Sounds after it move down a row, along with their favorites, hotkeys and playing state
+        self.sounds.insert(position, sound_data)
+        self.remap_sound_indices(lambda index: index + 1 if index >= position else index)
+        self.sound_table.setUpdatesEnabled(False)
+        self.sound_table.insertRow(position)
+        for i in range(position, len(self.sounds)):
+            self.set_sound_row(i, self.sounds[i])
+        search_text = self.search_bar.text().lower()
+        self.sound_table.setRowHidden(position, bool(search_text) and search_text not in sound_data['name'].lower())
+        self.buttons.append(None)  # For compatibility
+        self.sound_table.resizeRowToContents(position)
+        self.sound_table.setUpdatesEnabled(True)
+    
+    def remap_sound_indices(self, new_index):
+        """
+        Re-key everything that refers to sounds by index after rows moved.
+        
+        new_index(old) gives a sound's new index, or None if it was removed;
+        removed sounds lose their favorite and hotkeys and stop playing.
+        """
+        def remap(index):
             try:
-                # Get file name
-                file_name = os.path.basename(src_path)
-                
-                # Create destination path
-                dst_path = os.path.join(tab_dir, file_name)
-                
-                # Copy file (overwrite if exists)
-                with open(src_path, 'rb') as src_file:
-                    with open(dst_path, 'wb') as dst_file:
-                        dst_file.write(src_file.read())
-                
-                success_count += 1
-                
-            except Exception as e:
-                pass  # Skip failed files
-        
-        # Show result
-        QMessageBox.information(
-            self,
-            "Import Complete",
-            f"Successfully imported {success_count} out of {len(sound_files)} sounds."
-        )
+                return new_index(int(index))
+            except ValueError:
+                return None
+        
+        favorites = {str(new): value for key, value in self.favorites.items() if (new := remap(key)) is not None}
+        hotkeys = {key: str(new) for key, value in self.hotkeys.items() if (new := remap(value)) is not None}
+        if favorites != self.favorites or hotkeys != self.hotkeys:
+            self.favorites, self.hotkeys = favorites, hotkeys
+            self.save_favorites()
         
-        # Reload sounds
-        self.load_sounds()
+        if self.parent:
+            for channel, (tab_name, index) in list(self.parent.currently_playing.items()):
+                if tab_name != self.tab_name:
+                    continue
+                new = new_index(index)
+                if new is None:
+                    channel.stop()
+                    del self.parent.currently_playing[channel]
+                else:
+                    self.parent.currently_playing[channel] = (tab_name, new)
     
     def show_recorder(self):
         # Get tab directory
@@ -489,6 +739,7 @@ class TabPage(QWidget):
         # Reload sounds if changes were made
         if result == QDialog.DialogCode.Accepted:
             self.load_sounds()
+            self.auto_trim(dialog.saved_path)
     
     def show_youtube_dialog(self):
         # Prompt for YouTube URL
@@ -566,10 +817,13 @@ class TabPage(QWidget):
         layout.addWidget(progress_bar)
         
         # Create download thread
-        download_thread = YouTubeDownloadThread(url, output_path)
+        download_thread = YouTubeDownloadThread(url, output_path, media_cache=get_media_cache())
         
         # Connect signals
         download_thread.progress_signal.connect(progress_bar.setValue)
+        download_thread.stats_signal.connect(
+            lambda stats: status_label.setText(f"Downloading '{safe_name}' from YouTube... {format_progress_stats(stats)}")
+        )
         
         def on_download_finished(file_path):
             progress_dialog.accept()
@@ -582,6 +836,7 @@ class TabPage(QWidget):
             
             # Reload sounds
             self.load_sounds()
+            self.auto_trim(file_path)
         
         def on_download_error(error_message):
             progress_dialog.reject()
@@ -602,54 +857,10 @@ class TabPage(QWidget):
         progress_dialog.setModal(True)
         progress_dialog.exec()
     
-    def show_playlist_dialog(self):
-        # Prompt for playlist URL
-        url, ok = QInputDialog.getText(
-            self,
-            "Playlist Download",
-            "Enter playlist URL:"
-        )
-        if not ok or not url:
-            return
-
-        # Ask if user wants to add index prefix
-        add_prefix = QMessageBox.question(
-            self,
-            "Add Index Prefix",
-            "Add index prefix to filenames?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.Yes
-        ) == QMessageBox.StandardButton.Yes
-
-        # Get tab directory
-        tab_dir = get_tab_dir(self.tab_name)
-
-        # Fetch playlist info using yt-dlp or youtube-dl
-        playlist_items = []
-        try:
-            cmd = ["yt-dlp", "--flat-playlist", "-J", url]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            data = json.loads(result.stdout)
-            for entry in data.get("entries", []):
-                # Compose full URL for each entry
-                entry_url = entry.get("url")
-                if entry_url and "youtube.com" not in entry_url:
-                    entry_url = f"https://www.youtube.com/watch?v={entry_url}"
-                playlist_items.append({
-                    'url': entry_url,
-                    'title': entry.get('title', entry_url)
-                })
-        except Exception as e:
-            QMessageBox.critical(self, "Playlist Error", f"Failed to fetch playlist info: {e}")
-            return
-
-        if not playlist_items:
-            QMessageBox.warning(self, "No Items", "No items found in the playlist.")
-            return
-
-        # Show progress dialog
+    def create_playlist_progress_dialog(self, title):
+        # Progress dialog with an overall bar and a list of per-item states
         progress_dialog = QDialog(self)
-        progress_dialog.setWindowTitle("Downloading Playlist")
+        progress_dialog.setWindowTitle(title)
         progress_dialog.setMinimumWidth(400)
         progress_dialog.setStyleSheet(f"""
             QDialog {{ background: {APP_STYLE['darker_color']}; }}
@@ -670,57 +881,429 @@ class TabPage(QWidget):
         layout = QVBoxLayout(progress_dialog)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(10)
-        status_label = QLabel("Starting playlist download...")
+        status_label = QLabel("Fetching playlist info...")
         layout.addWidget(status_label)
         progress_bar = QProgressBar()
-        progress_bar.setRange(0, len(playlist_items))
-        progress_bar.setValue(0)
+        progress_bar.setRange(0, 0)  # Indeterminate until entries arrive
         layout.addWidget(progress_bar)
+        
+        # Per-item progress
+        item_list = QListWidget()
+        item_list.setStyleSheet(f"""
+            QListWidget {{
+                background: #181825;
+                color: {APP_STYLE['text_color']};
+                border: 1px solid {APP_STYLE['primary_color']};
+                border-radius: 5px;
+            }}
+        """)
+        layout.addWidget(item_list)
+        return progress_dialog, status_label, progress_bar, item_list
+    
+    def show_playlist_dialog(self):
+        # Prompt for playlist URL
+        url, ok = QInputDialog.getText(
+            self,
+            "Playlist Download",
+            "Enter playlist URL:"
+        )
+        if not ok or not url:
+            return
 
-        # Start playlist download thread (one at a time)
-        results = []
-        current_idx = [0]
-        total = len(playlist_items)
-        self._playlist_thread = None  # Keep reference to prevent GC
-        failed_songs = []
+        # Ask if user wants to add index prefix
+        add_prefix = QMessageBox.question(
+            self,
+            "Add Index Prefix",
+            "Add index prefix to filenames?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        ) == QMessageBox.StandardButton.Yes
 
-        def download_next():
-            if current_idx[0] >= total:
-                progress_dialog.accept()
-                msg = "Playlist download finished."
-                if failed_songs:
-                    msg += f"\nFailed to download {len(failed_songs)} song(s):\n" + "\n".join(failed_songs)
-                QMessageBox.information(self, "Download Complete", msg)
-                self.load_sounds()
+        # Get tab directory
+        tab_dir = get_tab_dir(self.tab_name)
+
+        # Show progress dialog
+        progress_dialog, status_label, progress_bar, item_list = self.create_playlist_progress_dialog("Downloading Playlist")
+        
+        # Download several items at once, starting while the playlist is still being fetched
+        settings = load_json(get_app_settings_path())
+        workers = int(settings.get('download_workers', 3))
+        thread = PlaylistDownloadThread([], tab_dir, add_prefix, workers=workers, streaming=True,
+                                        journal=get_download_journal(), media_cache=get_media_cache())
+        fetch_thread = PlaylistFetchThread(url)
+        self._playlist_thread = thread  # Keep references to prevent GC
+        self._playlist_fetch_thread = fetch_thread
+        playlist_items = []
+        failed_songs = []
+        fetch_errors = []
+        
+        def set_item_text(index, text):
+            item_list.item(index).setText(f"{text} - {playlist_items[index]['title']}")
+        
+        def on_entry(item):
+            playlist_items.append(item)
+            item_list.addItem(f"Queued - {item['title']}")
+            thread.add_item(item)
+        
+        def on_fetch_finished(count):
+            thread.finish_items()
+            if count == 0 and not fetch_errors:
+                progress_dialog.reject()
+                QMessageBox.warning(self, "No Items", "No items found in the playlist.")
+        
+        def on_fetch_error(message):
+            fetch_errors.append(message)
+            logger.error("Playlist fetch failed for %s: %s", url, message)
+            if not playlist_items:
+                progress_dialog.reject()
+                QMessageBox.critical(self, "Playlist Error", message)
+            else:
+                status_label.setText(f"Playlist listing stopped early: {message}")
+        
+        def on_overall_progress(done, total):
+            progress_bar.setRange(0, total)
+            progress_bar.setValue(done)
+            more = "" if fetch_thread.isFinished() else "+"
+            status_label.setText(f"Downloaded {done}/{total}{more} ({workers} at a time)")
+        
+        def on_error(index, title, msg):
+            failed_songs.append(title)
+            set_item_text(index, "Failed")
+            logger.error("Failed to download playlist item '%s': %s", title, msg)
+        
+        def on_finished(results):
+            if not progress_dialog.isVisible():
+                return
+            progress_dialog.accept()
+            msg = "Playlist download finished."
+            if failed_songs:
+                msg += f"\nFailed to download {len(failed_songs)} song(s):\n" + "\n".join(failed_songs)
+            QMessageBox.information(self, "Download Complete", msg)
+            self.load_sounds()
+        
+        fetch_thread.entry_signal.connect(on_entry)
+        fetch_thread.error_signal.connect(on_fetch_error)
+        fetch_thread.finished_signal.connect(on_fetch_finished)
+        thread.item_stats_signal.connect(
+            lambda index, stats: set_item_text(index, format_progress_stats(stats, with_percent=True))
+        )
+        thread.retry_signal.connect(lambda index, title, attempt: set_item_text(index, f"Retry {attempt}"))
+        thread.item_finished_signal.connect(lambda index, result: set_item_text(index, "Done"))
+        thread.overall_progress_signal.connect(on_overall_progress)
+        thread.error_signal.connect(on_error)
+        thread.finished_signal.connect(on_finished)
+        thread.start()
+        fetch_thread.start()
+        
+        # Stop fetching and downloading if the dialog is closed
+        def stop_threads():
+            fetch_thread.cancel()
+            thread.cancel()
+        
+        def on_close(event):
+            stop_threads()
+            thread.wait()
+            event.accept()
+        progress_dialog.closeEvent = on_close
+        progress_dialog.rejected.connect(stop_threads)
+        progress_dialog.setModal(True)
+        progress_dialog.exec()
+    
+    def link_playlist(self):
+        link_path = get_tab_playlist_path(self.tab_name)
+        link = load_json(link_path)
+        
+        # Prompt for playlist URL
+        url, ok = QInputDialog.getText(
+            self,
+            "Link Playlist",
+            "Playlist URL to keep this tab in sync with:",
+            text=link.get('url', '')
+        )
+        if not ok or not url.strip():
+            return
+        
+        # Ask if user wants to add index prefix
+        add_prefix = QMessageBox.question(
+            self,
+            "Add Index Prefix",
+            "Add index prefix to filenames?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes if link.get('add_prefix', True) else QMessageBox.StandardButton.No
+        ) == QMessageBox.StandardButton.Yes
+        
+        # Entries fetched for another playlist don't belong to the new one
+        entries = link.get('entries', {}) if link.get('url') == url.strip() else {}
+        save_json(link_path, {'url': url.strip(), 'add_prefix': add_prefix, 'entries': entries})
+        logger.info("Linked tab %s to playlist %s", self.tab_name, url.strip())
+        
+        if QMessageBox.question(
+            self,
+            "Sync Playlist",
+            "Sync the tab with the playlist now?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        ) == QMessageBox.StandardButton.Yes:
+            self.sync_playlist()
+    
+    def unlink_playlist(self):
+        delete_file_safely(get_tab_playlist_path(self.tab_name))
+        self.status_label.setText("Playlist unlinked")
+        logger.info("Unlinked playlist from tab: %s", self.tab_name)
+    
+    def sync_playlist(self):
+        link_path = get_tab_playlist_path(self.tab_name)
+        link = load_json(link_path)
+        url = link.get('url')
+        if not url:
+            return
+        known = link.setdefault('entries', {})
+        tab_dir = get_tab_dir(self.tab_name)
+        
+        # Show progress dialog
+        progress_dialog, status_label, progress_bar, item_list = self.create_playlist_progress_dialog("Syncing Playlist")
+        
+        # List the whole playlist first; removals can only be judged from a complete listing
+        fetch_thread = PlaylistFetchThread(url)
+        self._playlist_fetch_thread = fetch_thread  # Keep references to prevent GC
+        self._playlist_thread = None
+        listing = []
+        fetch_errors = []
+        state = {'new_items': [], 'removed': [], 'failed': []}
+        
+        def on_entry(item):
+            listing.append(item)
+            status_label.setText(f"Fetching playlist info... ({len(listing)} entries)")
+        
+        def on_fetch_error(message):
+            fetch_errors.append(message)
+            logger.error("Playlist fetch failed for %s: %s", url, message)
+            progress_dialog.reject()
+            QMessageBox.critical(self, "Playlist Error", message)
+        
+        def on_fetch_finished(count):
+            if fetch_errors or not progress_dialog.isVisible():
+                return
+            
+            # Existing files with matching titles are adopted instead of downloaded
+            existing = [name for name in os.listdir(tab_dir) if name.lower().endswith(SOUND_EXTENSIONS)]
+            new_items, adopted, removed = diff_playlist(known, listing, existing)
+            known.update(adopted)
+            save_json(link_path, link)
+            state['removed'] = removed
+            logger.info("Playlist sync for %s: %s new, %s matched, %s removed",
+                        self.tab_name, len(new_items), len(adopted), len(removed))
+            
+            if not new_items:
+                finish_sync()
                 return
-            item = playlist_items[current_idx[0]]
-            status_label.setText(f"Downloading {current_idx[0]+1}/{total}: {item['title']}")
-            thread = PlaylistDownloadThread([item], tab_dir, add_prefix)
+            
+            # Name new items by their position in the playlist
+            positions = {id(item): i for i, item in enumerate(listing)}
+            for item in new_items:
+                safe_title = create_safe_title(item['title'])
+                if link.get('add_prefix', True):
+                    safe_title = f"{positions[id(item)] + 1:02d} - {safe_title}"
+                item['output_path'] = os.path.join(tab_dir, safe_title)
+                item_list.addItem(f"Queued - {item['title']}")
+            state['new_items'] = new_items
+            
+            settings = load_json(get_app_settings_path())
+            thread = PlaylistDownloadThread(
+                new_items, tab_dir, False, workers=int(settings.get('download_workers', 3)),
+                journal=get_download_journal(), media_cache=get_media_cache()
+            )
             self._playlist_thread = thread
-            def on_finished(res):
-                results.extend(res)
-                progress_bar.setValue(current_idx[0]+1)
-                current_idx[0] += 1
-                download_next()
-            def on_error(idx, title, msg):
-                failed_songs.append(item['title'])
-                progress_bar.setValue(current_idx[0]+1)
-                current_idx[0] += 1
-                download_next()
-            thread.finished_signal.connect(on_finished)
+            thread.item_stats_signal.connect(
+                lambda index, stats: set_item_text(index, format_progress_stats(stats, with_percent=True))
+            )
+            thread.retry_signal.connect(lambda index, title, attempt: set_item_text(index, f"Retry {attempt}"))
+            thread.item_finished_signal.connect(on_item_finished)
+            thread.overall_progress_signal.connect(on_overall_progress)
             thread.error_signal.connect(on_error)
+            thread.finished_signal.connect(lambda results: finish_sync())
             thread.start()
-        download_next()
-
-        # Ensure thread is stopped/waited for if dialog is closed
+        
+        def set_item_text(index, text):
+            item_list.item(index).setText(f"{text} - {state['new_items'][index]['title']}")
+        
+        def on_item_finished(index, result):
+            set_item_text(index, "Done")
+            item = state['new_items'][index]
+            known[item.get('id') or item['url']] = os.path.basename(result['path'])
+        
+        def on_overall_progress(done, total):
+            progress_bar.setRange(0, total)
+            progress_bar.setValue(done)
+            status_label.setText(f"Downloaded {done}/{total} new item(s)")
+        
+        def on_error(index, title, msg):
+            state['failed'].append(title)
+            set_item_text(index, "Failed")
+            logger.error("Failed to download playlist item '%s': %s", title, msg)
+        
+        def finish_sync():
+            save_json(link_path, link)
+            if not progress_dialog.isVisible():
+                return
+            progress_dialog.accept()
+            
+            # Optionally delete the sounds of entries that left the playlist
+            removed = state['removed']
+            deleted = 0
+            if removed and QMessageBox.question(
+                self,
+                "Removed Items",
+                f"{len(removed)} item(s) were removed from the playlist.\nDelete them from this tab?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            ) == QMessageBox.StandardButton.Yes:
+                deleted = self.delete_sounds_by_name([known[entry_id] for entry_id in removed])
+            for entry_id in removed:
+                known.pop(entry_id, None)
+            save_json(link_path, link)
+            
+            msg = f"Downloaded {len(state['new_items']) - len(state['failed'])} new item(s)."
+            if deleted:
+                msg += f"\nDeleted {deleted} removed item(s)."
+            if state['failed']:
+                msg += f"\nFailed to download {len(state['failed'])} item(s):\n" + "\n".join(state['failed'])
+            QMessageBox.information(self, "Sync Complete", msg)
+            self.load_sounds()
+        
+        fetch_thread.entry_signal.connect(on_entry)
+        fetch_thread.error_signal.connect(on_fetch_error)
+        fetch_thread.finished_signal.connect(on_fetch_finished)
+        fetch_thread.start()
+        
+        # Stop fetching and downloading if the dialog is closed
+        def stop_threads():
+            fetch_thread.cancel()
+            if self._playlist_thread:
+                self._playlist_thread.cancel()
+        
         def on_close(event):
-            if self._playlist_thread and self._playlist_thread.isRunning():
-                self._playlist_thread.wait(2000)  # Wait up to 2 seconds
+            stop_threads()
+            if self._playlist_thread:
+                self._playlist_thread.wait()
             event.accept()
         progress_dialog.closeEvent = on_close
+        progress_dialog.rejected.connect(stop_threads)
         progress_dialog.setModal(True)
         progress_dialog.exec()
     
+    def delete_sounds_by_name(self, names):
+        # Delete several sounds at once; the rest move up with their favorites, hotkeys and playing state
+        names = set(names)
+        removed = [i for i, sound in enumerate(self.sounds) if os.path.basename(sound['path']) in names]
+        for index in removed:
+            delete_file_safely(self.sounds[index]['path'])
+            logger.info("Deleted sound file: %s from tab: %s", self.sounds[index]['name'], self.tab_name)
+        
+        if removed:
+            # Each remaining sound moves up by the number of removed sounds before it
+            removed_set = set(removed)
+            self.remap_sound_indices(
+                lambda index: None if index in removed_set else index - bisect.bisect_left(removed, index)
+            )
+            self.sounds = [sound for i, sound in enumerate(self.sounds) if i not in removed_set]
+            self.create_sound_buttons()
+        self.forget_trims(names)
+        return len(removed)
+    
+    def get_selected_paths(self):
+        # Paths of the sounds selected in the table
+        rows = sorted(index.row() for index in self.sound_table.selectionModel().selectedRows())
+        return [self.sounds[row]['path'] for row in rows if row < len(self.sounds)]
+    
+    def analyze_silence(self, paths, split=False, quiet=False):
+        # Detect silence in a pool, trimming (and optionally splitting) each sound
+        if not paths:
+            return
+        if getattr(self, '_silence_thread', None) and self._silence_thread.isRunning():
+            if not quiet:
+                QMessageBox.information(self, "Silence Analysis", "An analysis is already running in this tab.")
+            return
+        
+        thread = SilenceAnalysisThread(paths, get_tab_dir(self.tab_name), split=split)
+        self._silence_thread = thread  # Keep reference to prevent GC
+        trimmed = []
+        
+        if quiet:
+            # Background pass on a new sound, no dialog
+            progress_dialog = item_list = None
+        else:
+            progress_dialog, status_label, progress_bar, item_list = self.create_playlist_progress_dialog(
+                "Splitting Sounds" if split else "Trimming Silence"
+            )
+            status_label.setText(f"Analyzing {len(paths)} sounds...")
+            progress_bar.setRange(0, len(paths))
+            thread.progress_signal.connect(lambda done, total: progress_bar.setValue(done))
+            progress_dialog.rejected.connect(thread.cancel)
+        
+        def on_result(path, analysis):
+            name = os.path.basename(path)
+            if is_worth_trimming(analysis):
+                self.trims[name] = [round(analysis['trim'][0], 3), round(analysis['trim'][1], 3)]
+                trimmed.append(name)
+                saved = analysis['duration'] - (analysis['trim'][1] - analysis['trim'][0])
+                text = f"{name}: trimmed {saved:.1f}s of silence"
+            else:
+                self.trims.pop(name, None)
+                text = f"{name}: no silence to trim"
+            if item_list is not None:
+                item_list.addItem(text)
+        
+        def on_split(path, created):
+            for new_path in created:
+                sound_data = probe_sound_file(new_path)
+                if sound_data:
+                    self.add_sound_entry(sound_data)
+            if item_list is not None:
+                item_list.addItem(f"{os.path.basename(path)}: split into {len(created)} sounds")
+        
+        def on_finished(done, failures, cancelled):
+            self._silence_thread = None
+            save_json(get_tab_trims_path(self.tab_name), self.trims)
+            
+            msg = f"Trimmed silence from {len(trimmed)} of {done} sounds."
+            if cancelled:
+                msg = f"Silence analysis cancelled. {msg}"
+            self.status_label.setText(msg)
+            logger.info("%s (%s failed) Tab: %s", msg, len(failures), self.tab_name)
+            for failure in failures:
+                logger.error("Failed to analyze %s", failure)
+            
+            if progress_dialog is not None:
+                progress_dialog.accept()
+                if failures:
+                    details = "\n".join(failures[:20])
+                    if len(failures) > 20:
+                        details += f"\n... and {len(failures) - 20} more"
+                    QMessageBox.warning(self, "Silence Analysis", f"{msg}\nFailed to analyze {len(failures)} file(s):\n{details}")
+        
+        thread.result_signal.connect(on_result)
+        thread.split_signal.connect(on_split)
+        thread.finished_signal.connect(on_finished)
+        thread.start()
+        
+        if progress_dialog is not None:
+            progress_dialog.show()
+    
+    def auto_trim(self, path):
+        # Trim new recordings and downloads when the auto_trim_silence setting is on (off by default)
+        if path and load_json(get_app_settings_path()).get('auto_trim_silence', False):
+            self.analyze_silence([path], quiet=True)
+    
+    def clear_trims(self, paths):
+        self.forget_trims([os.path.basename(path) for path in paths])
+        self.status_label.setText(f"Cleared trims of {len(paths)} sounds")
+    
+    def forget_trims(self, names):
+        # Drop the trims of sounds that were removed or reset
+        removed = [name for name in names if self.trims.pop(name, None)]
+        if removed:
+            save_json(get_tab_trims_path(self.tab_name), self.trims)
+    
     def show_sound_context_menu(self, pos, index):
         # Get the button that was right-clicked
         button = self.sender()
@@ -813,6 +1396,12 @@ class TabPage(QWidget):
             # Rename the file
             os.rename(current_path, new_path)
             
+            # Keep its trim
+            trim = self.trims.pop(os.path.basename(current_path), None)
+            if trim:
+                self.trims[os.path.basename(new_path)] = trim
+                save_json(get_tab_trims_path(self.tab_name), self.trims)
+            
             # Reload sounds
             self.load_sounds()
             
@@ -835,28 +1424,22 @@ class TabPage(QWidget):
         if result != QMessageBox.StandardButton.Yes:
             return
         
-        # Remove sound from favorites and hotkeys if present
-        self.remove_from_favorites(index)
-        self.clear_hotkey(index)
-        
-        # Stop the sound if it's playing
-        for channel, (tab_name, sound_index) in list(self.parent.currently_playing.items()):
-            if tab_name == self.tab_name and sound_index == index:
-                channel.stop()
-                del self.parent.currently_playing[channel]
-                break
+        # Stop the sound if it's playing and drop its favorite and hotkeys; the
+        # sounds after it move up a row and take theirs along
+        self.remap_sound_indices(lambda i: None if i == index else i - (i > index))
         
         # Delete the sound file
         try:
             if sound_path and os.path.exists(sound_path):
                 delete_file_safely(sound_path)
-                logger.info(f"Deleted sound file: {sound_name} from tab: {self.tab_name}")
+                logger.info("Deleted sound file: %s from tab: %s", sound_name, self.tab_name)
+                self.forget_trims([os.path.basename(sound_path)])
                 
                 # Reload sounds
                 self.load_sounds()
                 self.status_label.setText(f"Deleted sound: {sound_name}")
             else:
-                logger.warning(f"Sound file not found for deletion: {sound_path}")
+                logger.warning("Sound file not found for deletion: %s", sound_path)
                 QMessageBox.warning(self,
                                   "File Not Found",
                                   f"Could not find the sound file to delete.")
@@ -864,7 +1447,7 @@ class TabPage(QWidget):
                 # Reload sounds to remove it from the list
                 self.load_sounds()
         except Exception as e:
-            logger.error(f"Error deleting sound file {sound_path}: {str(e)}")
+            logger.error("Error deleting sound file %s: %s", sound_path, e)
             QMessageBox.critical(self,
                                "Delete Error",
                                f"Failed to delete sound: {str(e)}")
@@ -902,14 +1485,14 @@ class TabPage(QWidget):
             del self.favorites[index_str]
             
             # Update button styling
-            if 0 <= index < len(self.buttons):
+            if 0 <= index < len(self.buttons) and self.buttons[index]:
                 self.buttons[index].set_favorite(False)
         else:
             # Add to favorites
             self.favorites[index_str] = True
             
             # Update button styling
-            if 0 <= index < len(self.buttons):
+            if 0 <= index < len(self.buttons) and self.buttons[index]:
                 self.buttons[index].set_favorite(True)
         
         # Save favorites
@@ -924,7 +1507,7 @@ class TabPage(QWidget):
             del self.favorites[index_str]
             
             # Update button styling
-            if 0 <= index < len(self.buttons):
+            if 0 <= index < len(self.buttons) and self.buttons[index]:
                 self.buttons[index].set_favorite(False)
             
             # Save favorites
@@ -970,7 +1553,26 @@ class TabPage(QWidget):
         if hasattr(self, 'load_thread') and self.load_thread.isRunning():
             self.load_thread.terminate()
             self.load_thread.wait()
-            logger.debug(f"Stopped loading thread for tab: {self.tab_name}")
+            logger.debug("Stopped loading thread for tab: %s", self.tab_name)
+        
+        # Cancel a running import; partially copied files are removed
+        if getattr(self, '_import_thread', None) and self._import_thread.isRunning():
+            self._import_thread.cancel()
+            self._import_thread.wait()
+            logger.debug("Cancelled import for tab: %s", self.tab_name)
+        
+        # Cancel a running silence analysis
+        if getattr(self, '_silence_thread', None) and self._silence_thread.isRunning():
+            self._silence_thread.cancel()
+            self._silence_thread.wait()
+            logger.debug("Cancelled silence analysis for tab: %s", self.tab_name)
+        
+        # Pause a running playlist download; it resumes on the next launch
+        if getattr(self, '_playlist_thread', None) and self._playlist_thread.isRunning():
+            self._playlist_fetch_thread.cancel()
+            self._playlist_thread.cancel(pause=True)
+            self._playlist_thread.wait()
+            logger.debug("Paused playlist download for tab: %s", self.tab_name)
     
     def filter_sounds(self, text):
         # Filter the table rows based on the search text
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+from PyQt6.QtWidgets import QApplication
+from src.tabpage import TabPage
+
+def make_sound(name):
+    return {'name': name, 'path': f"/sounds/Test/{name}.wav", 'duration': 1.0}
+
+class TestTabPage(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.environ = dict(os.environ)
+        os.environ['CXRRUPTPAD_DATA_DIR'] = os.path.join(self.root, 'data')
+        os.environ['CXRRUPTPAD_SOUNDS_DIR'] = os.path.join(self.root, 'sounds')
+        self.page = TabPage("Test")
+        self.page.sounds = [make_sound(name) for name in ("alarm", "Crash", "echo")]
+        self.page.favorites = {"1": True}
+        self.page.hotkeys = {"0": "2"}
+        self.page.create_sound_buttons()
+
+    def tearDown(self):
+        self.page.deleteLater()
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.root)
+
+    def table_column(self, column):
+        return [self.page.sound_table.item(row, column).text() for row in range(self.page.sound_table.rowCount())]
+
+    def test_added_sounds_keep_sorted_order(self):
+        """Test that added sounds are inserted in load order, with favorites and hotkeys following their sounds"""
+        self.page.add_sound_entry(make_sound("bell"))
+        self.page.add_sound_entry(make_sound("zap"))
+        self.assertEqual([sound['name'] for sound in self.page.sounds], ["alarm", "bell", "Crash", "echo", "zap"])
+        self.assertEqual(self.table_column(1), ["alarm", "bell", "Crash", "echo", "zap"])
+        self.assertEqual(self.table_column(0), ["0", "1", "2", "3", "4"])
+        self.assertEqual(self.page.favorites, {"2": True})
+        self.assertEqual(self.page.hotkeys, {"0": "3"})
+        self.assertEqual(self.table_column(3), ["", "", "", "1", ""])
+
+    def test_deleted_sounds_shift_the_rest(self):
+        """Test that deleting sounds by name moves later favorites and hotkeys up and stops the deleted sounds"""
+        class Channel:
+            stopped = False
+            def stop(self):
+                self.stopped = True
+        class Parent:
+            currently_playing = {}
+        deleted, echo = Channel(), Channel()
+        self.page.parent = Parent()
+        self.page.parent.currently_playing = {deleted: ("Test", 0), echo: ("Test", 2)}
+        self.page.favorites = {"2": True}
+
+        self.assertEqual(self.page.delete_sounds_by_name(["alarm.wav"]), 1)
+        self.assertEqual([sound['name'] for sound in self.page.sounds], ["Crash", "echo"])
+        self.assertEqual(self.table_column(1), ["Crash", "echo"])
+        self.assertEqual(self.page.favorites, {"1": True})
+        self.assertEqual(self.page.hotkeys, {"0": "1"})
+        self.assertEqual(self.table_column(3), ["", "1"])
+        self.assertTrue(deleted.stopped)
+        self.assertFalse(echo.stopped)
+        self.assertEqual(self.page.parent.currently_playing, {echo: ("Test", 1)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,2 +1,10 @@
-# Import and expose the logger
-from src.utils.logger import logger, get_log_directory, setup_logger
+# Expose the logger, imported lazily so that tools which only read logs
+# (e.g. log_viewer) don't start a log session just by importing this package
+import importlib
+
+def __getattr__(name):
+    if name in ('logger', 'get_log_directory', 'setup_logger'):
+        value = getattr(importlib.import_module('src.utils.logger'), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
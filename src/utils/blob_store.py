@@ -0,0 +1,272 @@
+import os
+import hashlib
+import threading
+
+from src.utils.file_utils import (
+    get_sounds_dir, get_data_dir, ensure_dir_exists,
+    save_json, load_json, delete_file_safely
+)
+
+# Bytes hashed from each end of a file for the partial hash
+PARTIAL_HASH_BYTES = 64 * 1024
+
+# Chunk size used when hashing whole files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Name of the blob directory inside the sounds directory
+STORE_DIR_NAME = ".store"
+
+def partial_hash(path, size=None):
+    """Hash the size and both ends of a file. Cheap, used to rule out duplicates."""
+    if size is None:
+        size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(PARTIAL_HASH_BYTES))
+        if size > PARTIAL_HASH_BYTES * 2:
+            f.seek(-PARTIAL_HASH_BYTES, os.SEEK_END)
+            digest.update(f.read(PARTIAL_HASH_BYTES))
+    return digest.hexdigest()
+
+def full_hash(path, cancel_event=None):
+    """Hash the whole content of a file."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        while True:
+            if cancel_event and cancel_event.is_set():
+                return None
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def blob_key(path):
+    """
+    Get a key identifying the content behind a path, for caching.
+
+    Duplicates in the store are hardlinks to one blob, so they share an inode
+    and therefore a key. The size and mtime are included so edited files
+    never hit a stale cache entry.
+    """
+    st = os.stat(path)
+    return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+class BlobStore:
+    """
+    Content-addressed store for sound files shared between tabs.
+
+    Tab entries stay ordinary files under sounds/<tab>/, but once two entries
+    have the same content they become hardlinks to a single blob under
+    sounds/.store/, so the data exists once on disk. Files are only fully
+    hashed when their size and partial hash collide with another file.
+    """
+
+    def __init__(self, sounds_dir=None, index_path=None):
+        self.sounds_dir = sounds_dir or get_sounds_dir()
+        self.store_dir = os.path.join(self.sounds_dir, STORE_DIR_NAME)
+        self.index_path = index_path or os.path.join(get_data_dir(), "blob_index.json")
+        self.lock = threading.RLock()
+
+        index = load_json(self.index_path)
+        # {relative path: {"size", "mtime_ns", "partial", "hash"}}
+        self.files = index.get('files', {})
+        # {hash: {"path", "size", "partial"}}
+        self.blobs = index.get('blobs', {})
+
+    def save(self):
+        with self.lock:
+            save_json(self.index_path, {'files': self.files, 'blobs': self.blobs})
+
+    def _relpath(self, path):
+        return os.path.relpath(os.path.abspath(path), self.sounds_dir)
+
+    def _abspath(self, relpath):
+        return os.path.join(self.sounds_dir, relpath)
+
+    def blob_path(self, digest, ext):
+        return os.path.join(self.store_dir, digest[:2], digest + ext.lower())
+
+    def _file_entry(self, path):
+        """Get the index entry for a file, refreshing it if the file changed."""
+        st = os.stat(path)
+        relpath = self._relpath(path)
+        with self.lock:
+            entry = self.files.get(relpath)
+            if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                return entry
+
+        entry = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'partial': partial_hash(path, st.st_size),
+            'hash': None
+        }
+        with self.lock:
+            self.files[relpath] = entry
+        return entry
+
+    def _ensure_full_hash(self, path, entry, cancel_event=None):
+        if entry['hash'] is None:
+            entry['hash'] = full_hash(path, cancel_event)
+        return entry['hash']
+
+    def _link_to_blob(self, path, digest):
+        """Make path a hardlink to the blob with the given hash, creating the blob if needed."""
+        with self.lock:
+            blob = self.blobs.get(digest)
+            if blob and not os.path.exists(self._abspath(blob['path'])):
+                blob = None
+
+            if blob is None:
+                # The first copy of this content becomes the blob
+                blob_path = self.blob_path(digest, os.path.splitext(path)[1])
+                ensure_dir_exists(os.path.dirname(blob_path))
+                if not os.path.exists(blob_path):
+                    os.link(path, blob_path)
+                entry = self.files[self._relpath(path)]
+                blob = {'path': self._relpath(blob_path), 'size': entry['size'], 'partial': entry['partial']}
+                self.blobs[digest] = blob
+
+        blob_path = self._abspath(blob['path'])
+        if os.path.samefile(path, blob_path):
+            return 0
+
+        # Swap the file for a link, via a temporary name so it's never missing
+        tmp_path = path + ".link"
+        delete_file_safely(tmp_path)
+        os.link(blob_path, tmp_path)
+        os.replace(tmp_path, path)
+
+        st = os.stat(path)
+        with self.lock:
+            self.files[self._relpath(path)] = {
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'partial': blob['partial'],
+                'hash': digest
+            }
+        return st.st_size
+
+    def index_files(self, paths, cancel_event=None, progress_callback=None):
+        """
+        Index files and turn duplicates into links to shared blobs.
+
+        Unchanged files are skipped using the saved size and mtime, and full
+        hashes are only computed for files whose size and partial hash match
+        another file or blob. Returns the number of bytes freed.
+        """
+        groups = {}
+        total = len(paths)
+        for i, path in enumerate(paths):
+            if cancel_event and cancel_event.is_set():
+                break
+            try:
+                entry = self._file_entry(path)
+            except OSError:
+                continue
+            groups.setdefault((entry['size'], entry['partial']), []).append((path, entry))
+            if progress_callback:
+                progress_callback(i + 1, total)
+
+        # Existing blobs are candidates too, so new copies link to them
+        with self.lock:
+            blob_groups = {(blob['size'], blob['partial']) for blob in self.blobs.values()}
+
+        saved = 0
+        for key, members in groups.items():
+            if cancel_event and cancel_event.is_set():
+                break
+
+            # Different names for one inode are already deduplicated
+            inodes = set()
+            for path, _ in members:
+                try:
+                    st = os.stat(path)
+                    inodes.add((st.st_dev, st.st_ino))
+                except OSError:
+                    pass
+            if len(inodes) < 2 and key not in blob_groups:
+                continue
+
+            by_hash = {}
+            for path, entry in members:
+                try:
+                    digest = self._ensure_full_hash(path, entry, cancel_event)
+                except OSError:
+                    continue
+                if digest:
+                    by_hash.setdefault(digest, []).append(path)
+
+            for digest, same_paths in by_hash.items():
+                if len(same_paths) < 2 and digest not in self.blobs:
+                    continue
+                for path in same_paths:
+                    try:
+                        saved += self._link_to_blob(path, digest)
+                    except OSError:
+                        continue
+
+        self.prune()
+        self.save()
+        return saved
+
+    def link_duplicate(self, src_path, dst_path):
+        """
+        Link dst_path to an existing blob with the same content as src_path.
+
+        Used by imports to skip copying content the store already has.
+        Returns True if dst_path was created as a link.
+        """
+        try:
+            size = os.path.getsize(src_path)
+            with self.lock:
+                candidates = [(digest, blob) for digest, blob in self.blobs.items() if blob['size'] == size]
+            if not candidates:
+                return False
+
+            partial = partial_hash(src_path, size)
+            candidates = [(digest, blob) for digest, blob in candidates if blob['partial'] == partial]
+            if not candidates:
+                return False
+
+            digest = full_hash(src_path)
+            for candidate_digest, blob in candidates:
+                blob_path = self._abspath(blob['path'])
+                if candidate_digest == digest and os.path.exists(blob_path):
+                    tmp_path = dst_path + ".link"
+                    delete_file_safely(tmp_path)
+                    os.link(blob_path, tmp_path)
+                    os.replace(tmp_path, dst_path)
+                    return True
+        except OSError:
+            pass
+        return False
+
+    def prune(self):
+        """Drop index entries for missing files and blobs no tab entry uses any more."""
+        with self.lock:
+            for relpath in list(self.files):
+                if not os.path.exists(self._abspath(relpath)):
+                    del self.files[relpath]
+
+            for digest, blob in list(self.blobs.items()):
+                blob_path = self._abspath(blob['path'])
+                try:
+                    # Only the store itself still links to this blob
+                    if os.stat(blob_path).st_nlink <= 1:
+                        delete_file_safely(blob_path)
+                        del self.blobs[digest]
+                except OSError:
+                    del self.blobs[digest]
+
+_blob_store = None
+_blob_store_lock = threading.Lock()
+
+def get_blob_store():
+    """Get the shared blob store for the sounds directory."""
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            _blob_store = BlobStore()
+        return _blob_store
@@ -1,6 +1,17 @@
 import os
 import json
 import shutil
+import platform
+import concurrent.futures
+
+# Chunk size for streaming copies, small enough to react to cancellation quickly
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Linux ioctl for copy-on-write clones (btrfs, xfs, bcachefs, ...)
+FICLONE = 0x40049409
+
+class CopyCancelled(Exception):
+    """Raised when a streaming copy is cancelled part way through."""
 
 def ensure_dir_exists(directory):
     """Ensure that a directory exists, creating it if necessary."""
@@ -9,13 +20,17 @@ def ensure_dir_exists(directory):
     return directory
 
 def get_data_dir():
-    """Get the data directory for storing application data."""
-    base_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+    """Get the data directory for storing application data (CXRRUPTPAD_DATA_DIR overrides it)."""
+    base_dir = os.getenv('CXRRUPTPAD_DATA_DIR') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data"
+    )
     return ensure_dir_exists(base_dir)
 
 def get_sounds_dir():
-    """Get the sounds directory for storing sound files."""
-    sounds_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "sounds")
+    """Get the sounds directory for storing sound files (CXRRUPTPAD_SOUNDS_DIR overrides it)."""
+    sounds_dir = os.getenv('CXRRUPTPAD_SOUNDS_DIR') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "sounds"
+    )
     return ensure_dir_exists(sounds_dir)
 
 def get_tab_dir(tab_name=None):
@@ -37,9 +52,11 @@ def get_tab_dir(tab_name=None):
     return ensure_dir_exists(tab_dir)
 
 def save_json(file_path, data):
-    """Save data to a JSON file."""
-    with open(file_path, 'w', encoding='utf-8') as f:
+    """Save data to a JSON file, replacing it atomically so a crash never leaves it half written."""
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2)
+    os.replace(tmp_path, file_path)
 
 def load_json(file_path, default=None):
     """Load data from a JSON file, returning default if file not found."""
@@ -57,6 +74,31 @@ def get_tab_favorites_path(tab_name):
     data_dir = get_data_dir()
     return os.path.join(data_dir, f"{tab_name}_favorites.json")
 
+def get_tab_playlist_path(tab_name):
+    """Get the path to the file linking a tab to a playlist."""
+    data_dir = get_data_dir()
+    return os.path.join(data_dir, f"{tab_name}_playlist.json")
+
+def get_tab_trims_path(tab_name):
+    """Get the path to a tab's silence trims file."""
+    data_dir = get_data_dir()
+    return os.path.join(data_dir, f"{tab_name}_trims.json")
+
+def rename_tab_data(old_name, new_name):
+    """Move a tab's favorites, playlist link and trims files along with the renamed tab."""
+    for get_path in (get_tab_favorites_path, get_tab_playlist_path, get_tab_trims_path):
+        old_path, new_path = get_path(old_name), get_path(new_name)
+        if os.path.exists(old_path):
+            os.replace(old_path, new_path)
+        else:
+            # Don't let a file left over from an older tab of that name come back
+            delete_file_safely(new_path)
+
+def delete_tab_data(tab_name):
+    """Delete a tab's favorites, playlist link and trims files."""
+    for get_path in (get_tab_favorites_path, get_tab_playlist_path, get_tab_trims_path):
+        delete_file_safely(get_path(tab_name))
+
 def get_app_settings_path():
     """Get the path to the application settings file."""
     data_dir = get_data_dir()
@@ -99,4 +141,128 @@ def move_file_safely(src_path, dst_path, copy=False):
             shutil.move(src_path, dst_path)
         return True
     except Exception:
-        return False 
\ No newline at end of file
+        return False
+
+def _copy_stream(src_file, dst_file, cancel_event=None):
+    """Copy between two open files, letting the kernel move the data where possible."""
+    src_fd = src_file.fileno()
+    dst_fd = dst_file.fileno()
+    remaining = os.fstat(src_fd).st_size
+    
+    # copy_file_range and sendfile never bring the data into user space
+    for kernel_copy in ('copy_file_range', 'sendfile'):
+        if not hasattr(os, kernel_copy):
+            continue
+        offset = 0
+        try:
+            while remaining > 0:
+                if cancel_event and cancel_event.is_set():
+                    raise CopyCancelled()
+                count = min(COPY_CHUNK_SIZE, remaining)
+                if kernel_copy == 'copy_file_range':
+                    copied = os.copy_file_range(src_fd, dst_fd, count)
+                else:
+                    copied = os.sendfile(dst_fd, src_fd, offset, count)
+                if copied == 0:
+                    # Source ended early or the call isn't really supported
+                    raise OSError("Kernel copy made no progress")
+                offset += copied
+                remaining -= copied
+            return
+        except OSError:
+            # Not supported for this file system pair; fall through if nothing was copied yet
+            if offset:
+                raise
+    
+    # Portable fallback: stream through a fixed size buffer
+    while True:
+        if cancel_event and cancel_event.is_set():
+            raise CopyCancelled()
+        chunk = src_file.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            break
+        dst_file.write(chunk)
+
+def _try_reflink(src_path, tmp_path):
+    """Try to create tmp_path as a copy-on-write clone of src_path."""
+    if platform.system() != "Linux":
+        return False
+    import fcntl
+    try:
+        with open(src_path, 'rb') as src_file, open(tmp_path, 'wb') as dst_file:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        return True
+    except OSError:
+        delete_file_safely(tmp_path)
+        return False
+
+def copy_file_fast(src_path, dst_path, mode="copy", cancel_event=None):
+    """
+    Copy a file without reading it into memory.
+    
+    Args:
+        src_path: Source file path
+        dst_path: Destination file path (replaced if it exists)
+        mode: "copy", "reflink" (copy-on-write clone) or "hardlink". Reflinks
+              and hardlinks fall back to a normal copy when unsupported.
+        cancel_event: Optional threading.Event that aborts the copy when set
+    
+    The data is written to a temporary file first and moved into place, so an
+    existing destination is never left half written.
+    """
+    tmp_path = dst_path + ".part"
+    delete_file_safely(tmp_path)
+    
+    try:
+        if mode == "hardlink":
+            try:
+                os.link(src_path, tmp_path)
+                os.replace(tmp_path, dst_path)
+                return
+            except OSError:
+                delete_file_safely(tmp_path)
+        
+        if mode == "reflink" and _try_reflink(src_path, tmp_path):
+            os.replace(tmp_path, dst_path)
+            return
+        
+        with open(src_path, 'rb') as src_file, open(tmp_path, 'wb') as dst_file:
+            _copy_stream(src_file, dst_file, cancel_event)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        delete_file_safely(tmp_path)
+        raise
+
+def walk_files_parallel(folder, extensions, executor, cancel_event=None):
+    """
+    Walk a directory tree, listing subdirectories in parallel.
+    
+    Yields the paths of files ending with one of the given extensions as soon
+    as their directory has been listed.
+    """
+    def list_dir(path):
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.path)
+                        elif entry.name.lower().endswith(extensions) and entry.is_file():
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return dirs, sorted(files)
+    
+    pending = {executor.submit(list_dir, folder)}
+    while pending:
+        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            dirs, files = future.result()
+            if cancel_event and cancel_event.is_set():
+                return
+            for path in dirs:
+                pending.add(executor.submit(list_dir, path))
+            yield from files
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Synthetic sound library generator for CxrruptPad.
+
+Creates N tabs x M sounds of generated tones, with favorites and hotkeys,
+to test how the app scales without copying real media around:
+
+    python -m src.utils.library_generator --tabs 50 --sounds 200
+    python -m src.utils.library_generator --sounds 2000 --formats wav,ogg,mp3 --lengths lognormal:1.5,1
+
+The library is written to <output>/sounds and <output>/data (a new temp
+directory unless --output is given) and the app is pointed at it with
+CXRRUPTPAD_SOUNDS_DIR and CXRRUPTPAD_DATA_DIR. OGG and MP3 files are
+encoded by ffmpeg when it's installed; WAV is written directly.
+
+With --stress, the app is then started headless on the library and driven
+through tab switches, searches and rapid sound triggers, reporting the
+latency of each and the process memory.
+"""
+import os
+import sys
+import math
+import time
+import wave
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+import statistics
+import concurrent.futures
+
+# Add parent directory to path if needed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.utils.file_utils import save_json
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Encoder arguments for the formats ffmpeg writes
+FFMPEG_CODECS = {
+    'ogg': ['-c:a', 'libvorbis', '-q:a', '3'],
+    'mp3': ['-c:a', 'libmp3lame', '-q:a', '5'],
+    'flac': ['-c:a', 'flac'],
+    'opus': ['-c:a', 'libopus', '-b:a', '64k']
+}
+
+DEFAULT_RATES = (22050, 44100, 48000)
+
+# Words sound names are made of, so searches match a realistic share of them
+NAME_WORDS = (
+    "airhorn", "applause", "bass", "beep", "bell", "boing", "bruh", "buzzer", "clap", "crash",
+    "crowd", "ding", "drum", "explosion", "fail", "fanfare", "glitch", "gong", "horn", "laugh",
+    "meme", "noise", "oof", "pop", "punch", "rimshot", "scream", "siren", "slap", "sting",
+    "swoosh", "thunder", "vine", "whistle", "wow", "yeet", "zap"
+)
+
+# Silence around each tone, like real clips have before trimming
+PAD_SECONDS = 0.05
+
+def parse_lengths(spec):
+    """
+    Parse a length distribution into a function of a random.Random giving seconds.
+
+    'fixed:S', 'uniform:MIN,MAX' or 'lognormal:MEDIAN,SIGMA' (most sounds short,
+    a long tail of long ones, as in real soundboards). Lengths are at least 0.05 s.
+    """
+    kind, _, params = spec.partition(':')
+    try:
+        values = [float(v) for v in params.split(',')] if params else []
+    except ValueError:
+        raise ValueError(f"Invalid length distribution: {spec}")
+    if kind == 'fixed' and len(values) == 1:
+        sample = lambda rng: values[0]
+    elif kind == 'uniform' and len(values) == 2:
+        sample = lambda rng: rng.uniform(values[0], values[1])
+    elif kind == 'lognormal' and len(values) == 2:
+        sample = lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    else:
+        raise ValueError(f"Invalid length distribution: {spec}")
+    return lambda rng: max(0.05, sample(rng))
+
+def get_available_formats(ffmpeg="ffmpeg"):
+    """Get the formats that can be generated: WAV always, the rest if ffmpeg is installed."""
+    formats = ['wav']
+    if shutil.which(ffmpeg):
+        formats += list(FFMPEG_CODECS)
+    return formats
+
+def make_tone(seconds, rate, rng):
+    """Get 16-bit mono samples of a fading tone between short silences."""
+    frames = int(seconds * rate)
+    pad = min(int(PAD_SECONDS * rate), frames // 4)
+    tone_frames = frames - 2 * pad
+    frequency = rng.uniform(110, 880)
+    amplitude = rng.uniform(0.2, 0.8) * 32767
+    if numpy is not None:
+        t = numpy.arange(tone_frames) / rate
+        fade = numpy.minimum(1.0, numpy.minimum(t, t[::-1]) / 0.01)
+        tone = (numpy.sin(2 * math.pi * frequency * t) * fade * amplitude).astype('<i2').tobytes()
+    else:
+        # Repeat one cycle; slower to build, but without NumPy there's no fast way to synthesize
+        cycle = [int(math.sin(2 * math.pi * i * frequency / rate) * amplitude) for i in range(max(1, int(rate / frequency)))]
+        tone = b''.join(sample.to_bytes(2, 'little', signed=True) for sample in cycle)
+        tone = (tone * (tone_frames // len(cycle) + 1))[:tone_frames * 2]
+    silence = bytes(pad * 2)
+    return silence + tone + silence
+
+def write_wav(path, samples, rate):
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(samples)
+
+def encode(wav_path, path, fmt, ffmpeg="ffmpeg"):
+    """Encode a WAV file with ffmpeg and remove the WAV. Raises RuntimeError on failure."""
+    result = subprocess.run(
+        [ffmpeg, "-loglevel", "error", "-y", "-i", wav_path] + FFMPEG_CODECS[fmt] + [path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    os.remove(wav_path)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to encode {os.path.basename(path)}: {result.stderr.decode('utf-8', errors='replace').strip()}")
+
+def make_sound_name(index, rng):
+    # The index prefix keeps the app's (alphabetical) order equal to generation order
+    return f"{index:05d} {rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)}"
+
+def generate_library(output_dir, tabs=5, sounds=100, formats=('wav',), lengths='lognormal:1.5,0.8',
+                     rates=DEFAULT_RATES, favorites=0.1, hotkeys=21, seed=0, ffmpeg="ffmpeg",
+                     workers=None, progress=None):
+    """
+    Generate a library in output_dir/sounds and output_dir/data.
+
+    Each sound picks a format, sample rate and length at random (from seed, so
+    the same arguments give the same library); a share of each tab is marked
+    favorite and the first hotkeys sounds get hotkeys. Formats ffmpeg can't
+    write here are left out. progress(done, total) is called as sounds are
+    written. Returns a summary dict.
+    """
+    sample_length = parse_lengths(lengths)
+    available = get_available_formats(ffmpeg)
+    usable = [fmt for fmt in formats if fmt in available]
+    skipped = [fmt for fmt in formats if fmt not in available]
+    if not usable:
+        raise ValueError(f"None of the formats can be generated here: {', '.join(formats)}")
+
+    sounds_dir = os.path.join(output_dir, 'sounds')
+    data_dir = os.path.join(output_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    rng = random.Random(seed)
+
+    # Plan every sound first, so the result doesn't depend on how encoding is scheduled
+    jobs = []
+    for tab_index in range(tabs):
+        tab_name = f"Tab {tab_index + 1:03d}"
+        os.makedirs(os.path.join(sounds_dir, tab_name), exist_ok=True)
+        for i in range(sounds):
+            fmt = rng.choice(usable)
+            path = os.path.join(sounds_dir, tab_name, f"{make_sound_name(i, rng)}.{fmt}")
+            jobs.append((path, fmt, rng.choice(rates), sample_length(rng), random.Random(rng.random())))
+
+        # Favorites and hotkeys are keyed by the sound's index in the tab
+        favorite_indices = sorted(rng.sample(range(sounds), int(sounds * favorites)))
+        save_json(os.path.join(data_dir, f"{tab_name}_favorites.json"), {
+            'favorites': {str(i): True for i in favorite_indices},
+            'hotkeys': {str(key): str(key) for key in range(min(hotkeys, sounds))}
+        })
+
+    def write_sound(job):
+        path, fmt, rate, seconds, tone_rng = job
+        samples = make_tone(seconds, rate, tone_rng)
+        if fmt == 'wav':
+            write_wav(path, samples, rate)
+        else:
+            wav_path = os.path.splitext(path)[0] + '.tmp.wav'
+            write_wav(wav_path, samples, rate)
+            encode(wav_path, path, fmt, ffmpeg)
+        return seconds
+
+    # ffmpeg runs in its own process, so encoding in threads keeps every core busy
+    total_seconds = 0.0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4) as executor:
+        for done, seconds in enumerate(executor.map(write_sound, jobs), 1):
+            total_seconds += seconds
+            if progress:
+                progress(done, len(jobs))
+
+    return {
+        'sounds_dir': sounds_dir,
+        'data_dir': data_dir,
+        'tabs': tabs,
+        'sounds': len(jobs),
+        'formats': usable,
+        'skipped_formats': skipped,
+        'audio_seconds': total_seconds
+    }
+
+def get_memory_usage():
+    """Get the process's (current, peak) resident memory in bytes; current is None where unknown."""
+    current = None
+    try:
+        # Linux
+        with open('/proc/self/statm', 'r') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        peak = peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        peak = None
+    return current, peak
+
+def summarize_latencies(times):
+    times = sorted(times)
+    return {
+        'count': len(times),
+        'p50': statistics.median(times),
+        'p95': times[min(len(times) - 1, int(len(times) * 0.95))],
+        'max': times[-1]
+    }
+
+def run_stress(library, switches=100, searches=50, triggers=500, seed=0, report=print):
+    """
+    Start the app headless on a generated library and drive it.
+
+    Measures, on the GUI thread: loading every tab, switching tabs, typing a
+    search into the current tab and triggering random sounds in quick
+    succession (each followed by one pass of the event loop, as a user
+    clicking would get). Returns the latency summaries and memory usage.
+    """
+    os.environ['CXRRUPTPAD_SOUNDS_DIR'] = library['sounds_dir']
+    os.environ['CXRRUPTPAD_DATA_DIR'] = library['data_dir']
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    # Keep the app's own logging from burying the report
+    os.environ.setdefault('CXRRUPTPAD_LOG_LEVEL', 'WARNING')
+
+    import pygame
+    from PyQt6.QtWidgets import QApplication
+    from src.soundpad import SoundPad
+    from src.utils.watchdog import stalls_counter
+
+    pygame.init()
+    pygame.mixer.init()
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(seed)
+    results = {'memory_start': get_memory_usage()}
+    stalls_before = stalls_counter.snapshot()[()]
+
+    def timed(action):
+        started = time.perf_counter()
+        action()
+        app.processEvents()
+        return time.perf_counter() - started
+
+    def tabs_loaded():
+        for i in range(window.tab_widget.count()):
+            thread = getattr(window.tab_widget.widget(i), 'load_thread', None)
+            if thread is None or not thread.isFinished():
+                return False
+        return True
+
+    # Startup, until every tab's sounds are in its table
+    started = time.perf_counter()
+    window = SoundPad()
+    window.show()
+    while not tabs_loaded():
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    results['load_seconds'] = time.perf_counter() - started
+    results['memory_loaded'] = get_memory_usage()
+    report(f"Loaded {window.tab_widget.count()} tabs in {results['load_seconds']:.2f} s")
+
+    try:
+        tab_count = window.tab_widget.count()
+        results['tab_switch'] = summarize_latencies([
+            timed(lambda: window.tab_widget.setCurrentIndex(rng.randrange(tab_count)))
+            for _ in range(switches)
+        ])
+
+        # A search typed letter by letter, then cleared, like in the search bar
+        search_times = []
+        for _ in range(searches):
+            page = window.tab_widget.currentWidget()
+            query = rng.choice(NAME_WORDS)
+            for length in range(1, len(query) + 1):
+                search_times.append(timed(lambda: page.search_bar.setText(query[:length])))
+            search_times.append(timed(page.search_bar.clear))
+        results['search_keystroke'] = summarize_latencies(search_times)
+
+        trigger_times = []
+        for _ in range(triggers):
+            page = window.tab_widget.widget(rng.randrange(tab_count))
+            if page.sounds:
+                trigger_times.append(timed(lambda: window.toggle_sound(page.tab_name, rng.randrange(len(page.sounds)))))
+        if trigger_times:
+            results['trigger'] = summarize_latencies(trigger_times)
+        results['gui_stalls'] = stalls_counter.snapshot()[()] - stalls_before
+    finally:
+        window.cleanup()
+        window.deleteLater()
+        app.processEvents()
+    results['memory_end'] = get_memory_usage()
+    return results
+
+def format_bytes(size):
+    return "?" if size is None else f"{size / (1024 * 1024):.0f} MiB"
+
+def print_stress_results(results):
+    print(f"\n{'Action':<18} {'count':>6} {'p50':>10} {'p95':>10} {'max':>10}")
+    for action in ('tab_switch', 'search_keystroke', 'trigger'):
+        if action in results:
+            stats = results[action]
+            print(f"{action:<18} {stats['count']:>6} {stats['p50'] * 1000:>8.2f}ms "
+                  f"{stats['p95'] * 1000:>8.2f}ms {stats['max'] * 1000:>8.2f}ms")
+    print(f"\nGUI stalls: {results.get('gui_stalls', 0)}")
+    print("Memory (resident now / peak):")
+    for label, key in (("start", 'memory_start'), ("after loading", 'memory_loaded'), ("end", 'memory_end')):
+        current, peak = results[key]
+        print(f"  {label:<14} {format_bytes(current)} / {format_bytes(peak)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='CxrruptPad Synthetic Library Generator')
+    parser.add_argument('-o', '--output', help='Directory for sounds/ and data/ (defaults to a new temp directory)')
+    parser.add_argument('-t', '--tabs', type=int, default=5, help='Number of tabs')
+    parser.add_argument('-n', '--sounds', type=int, default=100, help='Sounds per tab')
+    parser.add_argument('--formats', default='wav', help="Comma separated formats to mix (wav, ogg, mp3, flac, opus; all but wav need ffmpeg)")
+    parser.add_argument('--lengths', default='lognormal:1.5,0.8', help="Length distribution: 'fixed:S', 'uniform:MIN,MAX' or 'lognormal:MEDIAN,SIGMA' (seconds)")
+    parser.add_argument('--rates', default=','.join(str(rate) for rate in DEFAULT_RATES), help='Comma separated sample rates to mix')
+    parser.add_argument('--favorites', type=float, default=0.1, help='Share of each tab marked favorite')
+    parser.add_argument('--hotkeys', type=int, default=21, help='Hotkeys assigned per tab (at most 21)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed; the same arguments and seed give the same library')
+    parser.add_argument('--stress', action='store_true', help='Run the app headless on the library and report latency and memory')
+    parser.add_argument('--switches', type=int, default=100, help='Tab switches in the stress run')
+    parser.add_argument('--searches', type=int, default=50, help='Searches typed in the stress run')
+    parser.add_argument('--triggers', type=int, default=500, help='Sound triggers in the stress run')
+    parser.add_argument('--keep', action='store_true', help='Keep a temp library after the stress run')
+
+    args = parser.parse_args()
+
+    try:
+        formats = [fmt.strip().lower() for fmt in args.formats.split(',') if fmt.strip()]
+        rates = [int(rate) for rate in args.rates.split(',')]
+        parse_lengths(args.lengths)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    output_dir = args.output or tempfile.mkdtemp(prefix='cxrruptpad_library_')
+    started = time.perf_counter()
+    def progress(done, total):
+        if done % 500 == 0 or done == total:
+            print(f"\rGenerated {done}/{total} sounds", end='', flush=True)
+    try:
+        library = generate_library(output_dir, args.tabs, args.sounds, formats, args.lengths, rates,
+                                   args.favorites, min(args.hotkeys, 21), args.seed, progress=progress)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"\nError: {e}")
+        return 1
+
+    print(f"\nGenerated {library['sounds']} sounds ({library['audio_seconds'] / 60:.1f} min of audio) "
+          f"in {time.perf_counter() - started:.1f} s")
+    if library['skipped_formats']:
+        print(f"Skipped {', '.join(library['skipped_formats'])}: ffmpeg is not installed")
+
+    if not args.stress:
+        print("\nRun the app on it with:")
+        print(f"  CXRRUPTPAD_SOUNDS_DIR=\"{library['sounds_dir']}\" CXRRUPTPAD_DATA_DIR=\"{library['data_dir']}\" python main.py")
+        return 0
+
+    try:
+        print_stress_results(run_stress(library, args.switches, args.searches, args.triggers, args.seed))
+    finally:
+        if not args.output and not args.keep:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
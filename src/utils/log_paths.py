@@ -0,0 +1,25 @@
+"""
+Where log files live.
+
+Kept apart from the logger module, which sets up (and archives) the session
+log on import; tools that only read logs import this instead.
+"""
+import os
+import platform
+
+def get_log_directory():
+    """Get the appropriate directory for storing log files based on the platform."""
+    system = platform.system()
+    
+    if system == "Windows":
+        log_dir = os.path.join(os.getenv('APPDATA'), 'CxrruptPad', 'logs')
+    elif system == "Linux":
+        log_dir = os.path.join(os.path.expanduser('~'), '.config', 'CxrruptPad', 'logs')
+    else:
+        # Fallback for other platforms
+        log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
+    
+    # Create the directory if it doesn't exist
+    os.makedirs(log_dir, exist_ok=True)
+    
+    return log_dir
@@ -6,24 +6,52 @@ This script provides a simple utility to view and analyze CxrruptPad log files.
 import os
 import sys
 import re
+import gzip
+import json
+import time
+import bisect
 import datetime
+import collections
 import argparse
 from pathlib import Path
 
 # Add parent directory to path if needed
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-# Fix the import to use the proper module path
-from src.utils.logger import get_log_directory
+# Reading logs must not start (and archive) a log session of its own
+from src.utils.log_paths import get_log_directory
+from src.utils.perf import parse_perf_message
+
+LOG_LINE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(\w+)\] (.*)')
+
+# Distance between the byte offsets recorded in an archive's time index
+INDEX_STEP = 1024 * 1024
+INDEX_VERSION = 1
+
+# Upper bounds (ms) of the latency histogram buckets
+PERF_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000, float('inf'))
+
+# Slowdown of a session over the ones before it that counts as a regression
+REGRESSION_THRESHOLD = 0.2
+REGRESSION_MIN_SAMPLES = 5
+
+# Units of relative --since/--until values
+TIME_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}
+
+# Size of the blocks read when scanning a file backwards
+REVERSE_BLOCK = 64 * 1024
 
 def parse_log_line(line):
     """Parse a log line into timestamp and content."""
     # Expected format: 2023-02-15 14:22:33 [LEVEL] Message
-    match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(\w+)\] (.*)', line)
+    # Cheap check first, most continuation lines fail it
+    if len(line) < 22 or line[4] != '-' or line[19:21] != ' [':
+        return None
+    match = LOG_LINE_PATTERN.match(line)
     if match:
         timestamp_str, level, message = match.groups()
         try:
-            timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
+            timestamp = datetime.datetime.fromisoformat(timestamp_str)
             return {
                 'timestamp': timestamp,
                 'level': level,
@@ -33,59 +61,322 @@ def parse_log_line(line):
             pass
     return None
 
+def open_log_file(log_file):
+    """Open a log file for reading text, decompressing gzipped archives."""
+    if str(log_file).endswith('.gz'):
+        return gzip.open(log_file, 'rt', encoding='utf-8', errors='replace')
+    return open(log_file, 'r', encoding='utf-8', errors='replace')
+
+def iter_entries(lines):
+    """
+    Parse log lines into entries as they are read.
+
+    Lines that don't start a new entry (e.g. tracebacks) are continuation
+    lines and are appended to the message of the entry before them.
+    """
+    entry = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        parsed = parse_log_line(line)
+        if parsed:
+            if entry:
+                yield entry
+            entry = parsed
+        elif entry and line:
+            entry['message'] += '\n' + line
+    if entry:
+        yield entry
+
 def read_log_file(log_file):
     """Read and parse a log file."""
-    log_entries = []
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                entry = parse_log_line(line.strip())
-                if entry:
-                    log_entries.append(entry)
+        with open_log_file(log_file) as f:
+            return list(iter_entries(f))
     except Exception as e:
         print(f"Error reading log file: {e}")
-    return log_entries
+        return []
 
-def filter_logs(entries, level=None, search_term=None):
-    """Filter log entries by level and/or search term."""
-    filtered = entries
-    
-    if level:
-        filtered = [entry for entry in filtered if entry['level'] == level.upper()]
-    
-    if search_term:
-        filtered = [entry for entry in filtered 
-                   if search_term.lower() in entry['message'].lower()]
-    
-    return filtered
+def iter_lines_reversed(log_file):
+    """Yield the lines of a plain log file from the last to the first, reading backwards in blocks."""
+    with open(log_file, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b''
+        while position > 0:
+            size = min(REVERSE_BLOCK, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b'\n')
+            # The first piece may be the tail of a line that starts in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode('utf-8', errors='replace')
+        yield remainder.decode('utf-8', errors='replace')
 
-def display_logs(entries, show_count=None):
-    """Display log entries."""
-    if not entries:
-        print("No log entries found.")
+def iter_entries_reversed(log_file):
+    """Yield the entries of a log file newest first."""
+    if str(log_file).endswith('.gz'):
+        # Compressed files can only be read forwards
+        yield from reversed(read_log_file(log_file))
         return
-    
+
+    continuation = []
+    for line in iter_lines_reversed(log_file):
+        line = line.rstrip('\r')
+        entry = parse_log_line(line)
+        if entry:
+            if continuation:
+                entry['message'] += '\n' + '\n'.join(reversed(continuation))
+                continuation = []
+            yield entry
+        elif line:
+            continuation.append(line)
+
+def format_stamp(timestamp):
+    """Format a datetime like log timestamps, which sort in time order as text."""
+    return timestamp.strftime('%Y-%m-%d %H:%M:%S')
+
+def parse_time_arg(value, now=None):
+    """
+    Parse a --since/--until value.
+
+    Accepts 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM[:SS]' or a time ago such as
+    '30m', '2h' or '7d'.
+    """
+    now = now or datetime.datetime.now()
+    match = re.fullmatch(r'(\d+)\s*([smhd])', value.strip())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        return now - datetime.timedelta(**{TIME_UNITS[unit]: amount})
+    return datetime.datetime.fromisoformat(value.strip())
+
+def make_filter(level=None, search_term=None, since=None, until=None):
+    """Build a predicate that checks an entry against all the given filters."""
+    level = level.upper() if level else None
+    search_term = search_term.lower() if search_term else None
+
+    def matches(entry):
+        if level and entry['level'] != level:
+            return False
+        if since and entry['timestamp'] < since:
+            return False
+        if until and entry['timestamp'] > until:
+            return False
+        return not search_term or search_term in entry['message'].lower()
+    return matches
+
+def filter_logs(entries, level=None, search_term=None, since=None, until=None):
+    """Filter log entries by level, search term and/or time range."""
+    matches = make_filter(level, search_term, since, until)
+    return [entry for entry in entries if matches(entry)]
+
+def list_log_files(log_dir):
+    """List the archived logs oldest first, followed by latest.log."""
+    archives = sorted(
+        name for name in os.listdir(log_dir)
+        if name.startswith('log_') and name.endswith(('.log', '.log.gz'))
+    )
+    files = [os.path.join(log_dir, name) for name in archives]
+    latest = os.path.join(log_dir, 'latest.log')
+    if os.path.exists(latest):
+        files.append(latest)
+    return files
+
+def build_index(log_file):
+    """
+    Scan a log file for its time index.
+
+    The index holds the first and last timestamp, the entry count per level
+    and, for plain files, the byte offset of an entry every INDEX_STEP bytes
+    so reads can start close to a point in time.
+    """
+    st = os.stat(log_file)
+    index = {
+        'version': INDEX_VERSION,
+        'size': st.st_size,
+        'mtime': st.st_mtime,
+        'first': None,
+        'last': None,
+        'levels': {},
+        'checkpoints': []
+    }
+    compressed = str(log_file).endswith('.gz')
+    offset = 0
+    next_checkpoint = 0
+    with (gzip.open(log_file, 'rb') if compressed else open(log_file, 'rb')) as f:
+        levels = collections.Counter()
+        for raw in f:
+            # Header lines are checked by shape only, the index doesn't need a full parse
+            if raw[4:5] == b'-' and raw[19:21] == b' [' and raw[:4].isdigit():
+                end = raw.find(b']', 21)
+                if end < 0:
+                    offset += len(raw)
+                    continue
+                levels[raw[21:end]] += 1
+                last = raw[:19]
+                if index['first'] is None:
+                    index['first'] = last.decode('ascii', errors='replace')
+                if not compressed and offset >= next_checkpoint:
+                    stamp = last.decode('ascii', errors='replace')
+                    index['checkpoints'].append([stamp, offset])
+                    next_checkpoint = offset + INDEX_STEP
+            offset += len(raw)
+    if index['first'] is not None:
+        index['last'] = last.decode('ascii', errors='replace')
+    index['levels'] = {level.decode('ascii', errors='replace'): count for level, count in levels.items()}
+    return index
+
+def load_index(log_file):
+    """
+    Get the time index of an archived log, building it on first use.
+
+    The index is kept next to the archive as <name>.idx and rebuilt if the
+    archive changes. latest.log is still being written and isn't indexed.
+    """
+    index_path = str(log_file) + '.idx'
+    st = os.stat(log_file)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION and index['size'] == st.st_size and index['mtime'] == st.st_mtime:
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = build_index(log_file)
+    try:
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+    except OSError:
+        pass  # Read-only log directory, the index just isn't cached
+    return index
+
+def iter_file_entries(log_file, level=None, since=None, until=None, use_index=True):
+    """
+    Stream the entries of one file, using its index to skip what can't match.
+
+    Files whose time range or level counts rule out any match aren't read at
+    all, and plain archives are read from the checkpoint just before since.
+    """
+    start = 0
+    if use_index and os.path.basename(log_file) != 'latest.log':
+        index = load_index(log_file)
+        if index['first'] is None:
+            return
+        if since and index['last'] < format_stamp(since):
+            return
+        if until and index['first'] > format_stamp(until):
+            return
+        if level and not index['levels'].get(level.upper()):
+            return
+        if since:
+            for stamp, offset in index['checkpoints']:
+                if stamp >= format_stamp(since):
+                    break
+                start = offset
+
+    with open_log_file(log_file) as f:
+        if start:
+            f.seek(start)
+        for entry in iter_entries(f):
+            # Entries are in time order, nothing later can match
+            if until and entry['timestamp'] > until:
+                return
+            yield entry
+
+def iter_all_entries(log_files, matches, level=None, since=None, until=None):
+    """Stream the matching entries of several files, oldest first."""
+    for log_file in log_files:
+        for entry in iter_file_entries(log_file, level, since, until):
+            if matches(entry):
+                yield entry
+
+def last_entries(log_files, count, matches):
+    """Get the last count matching entries, reading each file from its end."""
+    found = []
+    for log_file in reversed(log_files):
+        for entry in iter_entries_reversed(log_file):
+            if matches(entry):
+                found.append(entry)
+                if len(found) >= count:
+                    return list(reversed(found))
+    return list(reversed(found))
+
+def print_entry(entry):
+    """Print one entry, colored by level."""
+    timestamp = entry['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
+    level = entry['level']
+
+    # Color the output based on log level
+    if level == "ERROR" or level == "CRITICAL":
+        level_color = "\033[91m"  # Red
+    elif level == "WARNING":
+        level_color = "\033[93m"  # Yellow
+    elif level == "INFO":
+        level_color = "\033[92m"  # Green
+    else:
+        level_color = "\033[0m"   # Default
+
+    reset_color = "\033[0m"
+    print(f"{timestamp} {level_color}[{level}]{reset_color} {entry['message']}")
+
+def follow_log(log_file, matches, poll_interval=0.25):
+    """
+    Print entries as they are appended to a log file, like tail -f.
+
+    Continuation lines are printed with the entry they belong to. When the
+    file is rotated (replaced or truncated) it is reopened from the start.
+    Runs until interrupted.
+    """
+    f = open(log_file, 'r', encoding='utf-8', errors='replace')
+    f.seek(0, os.SEEK_END)
+    showing = False
+    pending = ''
+    try:
+        while True:
+            line = f.readline()
+            if line:
+                pending += line
+                if not pending.endswith('\n'):
+                    continue  # Partial line, the rest is still being written
+                line, pending = pending.rstrip('\r\n'), ''
+                entry = parse_log_line(line)
+                if entry:
+                    showing = matches(entry)
+                    if showing:
+                        print_entry(entry)
+                elif showing and line:
+                    print(line)
+                sys.stdout.flush()
+                continue
+
+            time.sleep(poll_interval)
+            try:
+                st = os.stat(log_file)
+            except OSError:
+                continue  # Between the archive rename and the new file
+            if st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell():
+                f.close()
+                f = open(log_file, 'r', encoding='utf-8', errors='replace')
+                pending = ''
+    except KeyboardInterrupt:
+        pass
+    finally:
+        f.close()
+
+def display_logs(entries, show_count=None):
+    """Display log entries. Returns how many were shown."""
     # Display limited number of entries if specified
     if show_count and show_count > 0:
-        entries = entries[-show_count:]
-    
+        entries = collections.deque(entries, maxlen=show_count)
+
+    shown = 0
     for entry in entries:
-        timestamp = entry['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-        level = entry['level']
-        message = entry['message']
-        
-        # Color the output based on log level
-        if level == "ERROR" or level == "CRITICAL":
-            level_color = "\033[91m"  # Red
-        elif level == "WARNING":
-            level_color = "\033[93m"  # Yellow
-        elif level == "INFO":
-            level_color = "\033[92m"  # Green
-        else:
-            level_color = "\033[0m"   # Default
-        
-        reset_color = "\033[0m"
-        print(f"{timestamp} {level_color}[{level}]{reset_color} {message}")
+        print_entry(entry)
+        shown += 1
+
+    if not shown:
+        print("No log entries found.")
+    return shown
 
 def analyze_logs(entries):
     """Analyze log entries and print summary."""
@@ -124,13 +415,125 @@ def analyze_logs(entries):
                 timestamp = entry['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
                 print(f"  {timestamp}: {entry['message']}")
 
+def collect_perf_events(entries):
+    """Get the fields of the timing events among log entries."""
+    events = []
+    for entry in entries:
+        fields = parse_perf_message(entry['message'])
+        if fields:
+            fields['timestamp'] = entry['timestamp']
+            events.append(fields)
+    return events
+
+def percentile(sorted_values, p):
+    """Get the p-th percentile (0-100) of sorted values, interpolating between ranks."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+def summarize_timings(values):
+    """Get the count, mean, percentiles and maximum of durations in ms."""
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else 0.0
+    }
+
+def histogram(values, buckets=PERF_BUCKETS_MS):
+    """Count durations into buckets. Returns [(upper bound, count)] up to the last used bucket."""
+    counts = [0] * len(buckets)
+    for value in values:
+        counts[bisect.bisect_left(buckets, value)] += 1
+    used = max((i for i, count in enumerate(counts) if count), default=-1)
+    return list(zip(buckets, counts))[:used + 1]
+
+def find_regressions(events, threshold=REGRESSION_THRESHOLD, min_samples=REGRESSION_MIN_SAMPLES):
+    """
+    Compare the latest session of each event against the sessions before it.
+
+    Session IDs start with the launch time, so they sort in time order.
+    A regression is a median or p90 that is more than threshold slower than
+    in all earlier sessions taken together. Sessions with fewer than
+    min_samples timings aren't compared.
+    """
+    by_event = collections.defaultdict(lambda: collections.defaultdict(list))
+    for event in events:
+        by_event[event['event']][event.get('session', '')].append(event['ms'])
+
+    regressions = []
+    for name, sessions in sorted(by_event.items()):
+        ordered = [session for session in sorted(sessions) if len(sessions[session]) >= min_samples]
+        if len(ordered) < 2:
+            continue
+        latest = summarize_timings(sessions[ordered[-1]])
+        baseline = summarize_timings([ms for session in ordered[:-1] for ms in sessions[session]])
+        for metric in ('p50', 'p90'):
+            if baseline[metric] > 0 and latest[metric] > baseline[metric] * (1 + threshold):
+                regressions.append({
+                    'event': name,
+                    'metric': metric,
+                    'session': ordered[-1],
+                    'baseline': baseline[metric],
+                    'latest': latest[metric],
+                    'change': latest[metric] / baseline[metric] - 1
+                })
+    return regressions
+
+def format_ms(value):
+    if value == float('inf'):
+        return "inf"
+    return f"{value / 1000:.1f}s" if value >= 1000 else f"{value:.1f}ms"
+
+def print_perf_report(events):
+    """Print latency statistics, histograms and regressions of timing events."""
+    if not events:
+        print("No timing events found.")
+        return
+
+    by_event = collections.defaultdict(list)
+    for event in events:
+        by_event[event['event']].append(event['ms'])
+    sessions = {event.get('session') for event in events}
+
+    print(f"\n=== Performance ({len(events)} timings, {len(sessions)} sessions) ===")
+    for name, values in sorted(by_event.items()):
+        stats = summarize_timings(values)
+        print(f"\n{name}: {stats['count']} timings, mean {format_ms(stats['mean'])}, "
+              f"p50 {format_ms(stats['p50'])}, p90 {format_ms(stats['p90'])}, "
+              f"p99 {format_ms(stats['p99'])}, max {format_ms(stats['max'])}")
+        buckets = histogram(values)
+        widest = max(count for _, count in buckets)
+        for upper, count in buckets:
+            bar = "#" * (round(count * 40 / widest) if count else 0)
+            print(f"  <= {format_ms(upper):>7} {count:>7} {bar}")
+
+    regressions = find_regressions(events)
+    print("\nRegressions against earlier sessions:")
+    if not regressions:
+        print("  None found.")
+    for regression in regressions:
+        print(f"  {regression['event']} {regression['metric']}: {format_ms(regression['baseline'])} -> "
+              f"{format_ms(regression['latest'])} (+{regression['change'] * 100:.0f}%) in session {regression['session']}")
+
 def main():
     parser = argparse.ArgumentParser(description='CxrruptPad Log Viewer')
-    parser.add_argument('-f', '--file', help='Specific log file to read (defaults to latest.log)')
+    parser.add_argument('-f', '--file', help='Specific log file to read, plain or .gz (defaults to latest.log)')
     parser.add_argument('-l', '--level', help='Filter by log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)')
     parser.add_argument('-s', '--search', help='Search term to filter logs')
     parser.add_argument('-n', '--lines', type=int, help='Number of lines to show (from the end)')
     parser.add_argument('-a', '--analyze', action='store_true', help='Analyze logs and show summary')
+    parser.add_argument('--all', action='store_true', help='Search all archived logs as well as the latest one')
+    parser.add_argument('--since', help="Only entries from this time on ('YYYY-MM-DD [HH:MM[:SS]]' or e.g. '2h', '7d' ago)")
+    parser.add_argument('--until', help='Only entries up to this time (same formats as --since)')
+    parser.add_argument('--follow', action='store_true', help='Keep printing new entries as they are logged')
+    parser.add_argument('--perf', action='store_true', help='Summarize timing events: percentiles, histograms and regressions between sessions (all logs unless --file is given)')
     parser.add_argument('--list', action='store_true', help='List available log files')
     
     args = parser.parse_args()
@@ -140,7 +543,7 @@ def main():
     # List available log files
     if args.list:
         print(f"Log directory: {log_dir}")
-        log_files = sorted(Path(log_dir).glob('*.log'))
+        log_files = sorted(list(Path(log_dir).glob('*.log')) + list(Path(log_dir).glob('*.log.gz')))
         if log_files:
             print("\nAvailable log files:")
             for log_file in log_files:
@@ -151,32 +554,64 @@ def main():
             print("No log files found.")
         return
     
-    # Determine which log file to read
-    if args.file:
+    try:
+        since = parse_time_arg(args.since) if args.since else None
+        until = parse_time_arg(args.until) if args.until else None
+    except ValueError as e:
+        print(f"Error: Invalid time: {e}")
+        return
+    matches = make_filter(args.level, args.search, since, until)
+    
+    # Determine which log files to read
+    if args.all or (args.perf and not args.file):
+        log_files = list_log_files(log_dir)
+    elif args.file:
         log_file = os.path.join(log_dir, args.file)
+        # Archives may have been compressed since they were listed
+        if not os.path.exists(log_file) and os.path.exists(log_file + '.gz'):
+            log_file += '.gz'
+        log_files = [log_file]
+    else:
+        log_files = [os.path.join(log_dir, 'latest.log')]
+    
+    missing = [log_file for log_file in log_files if not os.path.exists(log_file)]
+    if missing or not log_files:
+        print(f"Error: Log file not found: {missing[0] if missing else log_dir}")
+        return
+    
+    if len(log_files) == 1:
+        print(f"Displaying logs from: {os.path.basename(log_files[0])}")
     else:
-        log_file = os.path.join(log_dir, 'latest.log')
+        print(f"Displaying logs from {len(log_files)} files in: {log_dir}")
+    print("-" * 60)
     
-    if not os.path.exists(log_file):
-        print(f"Error: Log file not found: {log_file}")
+    if args.perf:
+        # Only the timing events are needed, they are all logged at INFO
+        events = collect_perf_events(iter_all_entries(log_files, matches, 'INFO', since, until))
+        print_perf_report(events)
         return
     
-    # Read and parse the log file
-    entries = read_log_file(log_file)
+    if args.follow:
+        # Show the recent entries, then keep watching the file
+        display_logs(last_entries(log_files[-1:], args.lines or 10, matches))
+        follow_log(log_files[-1], matches)
+        return
     
-    # Apply filters
-    filtered_entries = filter_logs(entries, args.level, args.search)
+    if args.lines and not args.analyze:
+        # Only the end is needed, read backwards and stop once there are enough
+        entries = last_entries(log_files, args.lines, matches)
+    else:
+        entries = iter_all_entries(log_files, matches, args.level, since, until)
+        if args.analyze:
+            entries = list(entries)
     
-    # Display logs
-    print(f"Displaying logs from: {os.path.basename(log_file)}")
-    print(f"Total entries: {len(entries)}, Filtered: {len(filtered_entries)}")
+    shown = display_logs(entries, args.lines)
     print("-" * 60)
-    
-    display_logs(filtered_entries, args.lines)
+    print(f"Matching entries shown: {shown}")
     
     # Analyze logs if requested
     if args.analyze:
-        analyze_logs(filtered_entries)
+        analyze_logs(entries)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,35 +1,415 @@
 import os
 import sys
+import copy
+import gzip
+import time
+import queue
+import shutil
+import threading
+import atexit
 import logging
+import logging.handlers
 import datetime
 import platform
 import traceback
+import multiprocessing
 from pathlib import Path
 
-def get_log_directory():
-    """Get the appropriate directory for storing log files based on the platform."""
-    system = platform.system()
+from src.utils.log_paths import get_log_directory
+from src.utils.perf import PERF_PREFIX
+
+# Size and age at which latest.log is archived and a new file started
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_ROTATE_SECONDS = 24 * 60 * 60
+
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def archive_log(log_path):
+    """Move a log file aside as log_<timestamp>.log, next to it."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    archived_log_path = os.path.join(os.path.dirname(log_path), f'log_{timestamp}.log')
+    suffix = 1
+    while os.path.exists(archived_log_path):
+        # Several rollovers within a second
+        archived_log_path = os.path.join(os.path.dirname(log_path), f'log_{timestamp}_{suffix}.log')
+        suffix += 1
+    try:
+        os.rename(log_path, archived_log_path)
+    except Exception:
+        # If renaming fails, just proceed with a new file
+        return None
+    return archived_log_path
+
+# How many archived logs are kept, and for how long, by default
+LOG_KEEP_COUNT = 50
+LOG_KEEP_DAYS = 30
+LOG_KEEP_MB = 200
+
+def compress_log(log_path):
+    """Gzip an archived log next to itself and remove the original."""
+    gz_path = log_path + '.gz'
+    tmp_path = gz_path + '.tmp'
+    st = os.stat(log_path)
+    with open(log_path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    # Keep the archive's age, retention goes by it
+    os.utime(tmp_path, (st.st_atime, st.st_mtime))
+    os.replace(tmp_path, gz_path)
+    os.remove(log_path)
+    _remove_quietly(log_path + '.idx')
+    return gz_path
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def enforce_log_retention(log_dir, max_count=LOG_KEEP_COUNT, max_age_days=LOG_KEEP_DAYS, max_total_mb=LOG_KEEP_MB):
+    """
+    Compress archived logs and delete the ones past the retention policy.
+
+    Archives are kept newest first while they fit within max_count files,
+    max_age_days and max_total_mb altogether. latest.log is never touched.
+    Returns (compressed, deleted) counts.
+    """
+    compressed = 0
+    deleted = 0
+    names = os.listdir(log_dir)
+    
+    # Remove leftovers of an interrupted compression, and log_viewer
+    # indexes whose archive is gone
+    for name in names:
+        if name.startswith('log_') and name.endswith('.gz.tmp'):
+            _remove_quietly(os.path.join(log_dir, name))
+        elif name.startswith('log_') and name.endswith('.idx') and name[:-4] not in names:
+            _remove_quietly(os.path.join(log_dir, name))
     
-    if system == "Windows":
-        log_dir = os.path.join(os.getenv('APPDATA'), 'CxrruptPad', 'logs')
-    elif system == "Linux":
-        log_dir = os.path.join(os.path.expanduser('~'), '.config', 'CxrruptPad', 'logs')
-    else:
-        # Fallback for other platforms
-        log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
+    # Compress plain archives
+    for name in names:
+        if name.startswith('log_') and name.endswith('.log'):
+            try:
+                compress_log(os.path.join(log_dir, name))
+                compressed += 1
+            except OSError:
+                continue
     
-    # Create the directory if it doesn't exist
-    os.makedirs(log_dir, exist_ok=True)
+    # Collect the archives with their age and size, newest first
+    archives = []
+    for entry in os.scandir(log_dir):
+        if entry.name.startswith('log_') and entry.name.endswith(('.log', '.log.gz')):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            archives.append((st.st_mtime, st.st_size, entry.path))
+    archives.sort(reverse=True)
     
-    return log_dir
+    cutoff = time.time() - max_age_days * 24 * 60 * 60
+    total = 0
+    for count, (mtime, size, path) in enumerate(archives):
+        total += size
+        if count >= max_count or mtime < cutoff or total > max_total_mb * 1024 * 1024:
+            try:
+                os.remove(path)
+                deleted += 1
+            except OSError:
+                continue
+            _remove_quietly(path + '.idx')
+    return compressed, deleted
+
+_retention_policy = None  # Set once retention has been started
+_retention_lock = threading.Lock()
+
+def start_log_retention(**policy):
+    """
+    Apply the log retention policy on a background thread.
+
+    Takes the enforce_log_retention keyword arguments; they are remembered,
+    so later calls (e.g. after a size rollover) use the same policy.
+    """
+    global _retention_policy
+    _retention_policy = {**(_retention_policy or {}), **policy}
+    log_dir = get_log_directory()
+    
+    def run():
+        # One pass at a time; a pass that has to wait still sees new archives
+        with _retention_lock:
+            try:
+                compressed, deleted = enforce_log_retention(log_dir, **_retention_policy)
+                if compressed or deleted:
+                    logging.getLogger('CxrruptPad').debug(
+                        "Log retention: compressed %s, deleted %s archives", compressed, deleted
+                    )
+            except OSError as e:
+                logging.getLogger('CxrruptPad').warning("Log retention failed: %s", e)
+    
+    thread = threading.Thread(target=run, name="LogRetention", daemon=True)
+    thread.start()
+    return thread
+
+class LatestLogHandler(logging.handlers.BaseRotatingHandler):
+    """
+    Writes latest.log, archiving it once it grows past max_bytes or gets older
+    than interval seconds. Archives use the same log_<timestamp>.log names as
+    the ones made at startup.
+    """
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, interval=LOG_ROTATE_SECONDS, encoding='utf-8'):
+        super().__init__(filename, 'a', encoding=encoding, delay=False)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.rollover_at = time.time() + interval
+
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        # Checked against what has been written so far, so records aren't formatted twice
+        if self.max_bytes and self.stream.tell() >= self.max_bytes:
+            return True
+        return bool(self.interval) and time.time() >= self.rollover_at
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        archive_log(self.baseFilename)
+        self.stream = self._open()
+        self.rollover_at = time.time() + self.interval
+        
+        # Compress the new archive and trim old ones
+        if _retention_policy is not None:
+            start_log_retention()
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves message formatting to the writer thread.
+
+    The stock QueueHandler formats every record on the thread that logs it.
+    Here the caller only snapshots the record; the %-style arguments are
+    merged, and the line formatted and written, on the listener thread.
+    Arguments should therefore be values that don't change afterwards
+    (strings, numbers), which is what log calls pass anyway.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info:
+            # Tracebacks can't wait, the frames they point at keep changing
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_exception_formatter = logging.Formatter()
+
+def hide_perf_events(record):
+    """Console filter: timing events are for the log file and log_viewer --perf, not the terminal."""
+    return not (isinstance(record.msg, str) and record.msg.startswith(PERF_PREFIX))
+
+# Identical warnings within this many seconds of each other are collapsed
+LOG_REPEAT_WINDOW = 60.0
+# How often collapsed repeats and rate-limited records are summarized
+LOG_SUMMARY_INTERVAL = 10.0
+# Warnings per second (and burst size) each logger may write
+LOG_RATE_LIMIT = 20.0
+LOG_RATE_BURST = 100
+
+class RepeatFilter(logging.Filter):
+    """
+    Collapses repeated warnings and rate-limits them per logger.
+
+    A failure that repeats on every trigger or timer tick (a missing file,
+    a lost audio device) would otherwise write the same message and
+    traceback over and over. The first occurrence of a warning goes through
+    in full; identical ones (same call site, message, arguments and
+    traceback) are counted instead, and summarized as "repeated N times in
+    T s" every summary_interval seconds, until none has been seen for
+    window seconds. Distinct warnings are limited to rate per second per
+    logger by a token bucket, and the dropped ones summarized the same way.
+
+    Only WARNING and above are affected. Summaries are written through emit
+    when the next warning comes after they're due, on flush(), or by the
+    timer thread from start_timer() when no more warnings come.
+    """
+
+    def __init__(self, emit, window=LOG_REPEAT_WINDOW, summary_interval=LOG_SUMMARY_INTERVAL,
+                 rate=LOG_RATE_LIMIT, burst=LOG_RATE_BURST, clock=time.monotonic):
+        super().__init__()
+        self.emit = emit
+        self.window = window
+        self.summary_interval = summary_interval
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.repeats = {}  # fingerprint -> [record fields, first seen, last seen, suppressed, reported at]
+        self.buckets = {}  # logger name -> [tokens, updated at, dropped, first dropped at]
+        self.next_summary = 0.0
+        self.timer_stopped = threading.Event()
+
+    @staticmethod
+    def fingerprint(record):
+        """Get what makes two records the same, without formatting them."""
+        exc = None
+        if record.exc_info and record.exc_info[0] is not None:
+            frames = []
+            tb = record.exc_info[2]
+            while tb is not None:
+                frames.append((tb.tb_frame.f_code.co_filename, tb.tb_lineno))
+                tb = tb.tb_next
+            exc = (record.exc_info[0].__name__, tuple(frames))
+        args = record.args
+        if isinstance(args, tuple):
+            args = tuple(str(arg) for arg in args)
+        elif args:
+            args = str(args)
+        return (record.name, record.levelno, record.pathname, record.lineno, str(record.msg), args, exc)
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+
+        now = self.clock()
+        key = self.fingerprint(record)
+        with self.lock:
+            summaries = self._collect(now) if now >= self.next_summary else []
+            repeat = self.repeats.get(key)
+            if repeat is not None and now - repeat[2] < self.window:
+                # Seen recently, count it instead
+                repeat[2] = now
+                repeat[3] += 1
+                allowed = False
+            else:
+                if repeat is not None and repeat[3]:
+                    # Back after a quiet spell; report the repeats held back before it
+                    summaries.append(self._summarize(repeat, now))
+                allowed = self._take_token(record.name, now)
+                if allowed:
+                    # Keep what the summary needs, not the record and its traceback
+                    origin = (record.name, record.levelno, record.pathname, record.lineno, record.getMessage().split('\n', 1)[0])
+                    self.repeats[key] = [origin, now, now, 0, now]
+
+        for summary in summaries:
+            self.emit(summary)
+        return allowed
+
+    def _take_token(self, name, now):
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            bucket = self.buckets[name] = [float(self.burst), now, 0, now]
+        bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True
+        if not bucket[2]:
+            bucket[3] = now
+        bucket[2] += 1
+        return False
+
+    def _summarize(self, repeat, now):
+        # Build the summary record of a repeat's suppressed count and reset it
+        (name, level, pathname, lineno, message), first, last, suppressed, _ = repeat
+        repeat[1] = last
+        repeat[3] = 0
+        repeat[4] = now
+        return logging.LogRecord(
+            name, level, pathname, lineno, "%s (repeated %d times in %.1f s)",
+            (message, suppressed, last - first), None
+        )
+
+    def _collect(self, now, force=False):
+        # Build the summary records that are due and forget expired repeats
+        self.next_summary = now + self.summary_interval
+        summaries = []
+        for key, repeat in list(self.repeats.items()):
+            last, suppressed, reported = repeat[2:]
+            expired = now - last >= self.window
+            if suppressed and (force or expired or now - reported >= self.summary_interval):
+                summaries.append(self._summarize(repeat, now))
+            if expired:
+                del self.repeats[key]
+        for name, bucket in self.buckets.items():
+            if bucket[2]:
+                summaries.append(logging.LogRecord(
+                    name, logging.WARNING, __file__, 0, "Dropped %d warnings over the rate limit in %.1f s",
+                    (bucket[2], now - bucket[3]), None
+                ))
+                bucket[2] = 0
+        return summaries
+
+    def flush(self, force=False):
+        """Write out the summaries that are due, or all pending ones if force is set."""
+        with self.lock:
+            summaries = self._collect(self.clock(), force)
+        for summary in summaries:
+            self.emit(summary)
+
+    def start_timer(self):
+        """Write out summaries as they fall due on a background thread, even if no warning follows."""
+        def run():
+            while not self.timer_stopped.wait(self.summary_interval):
+                self.flush()
+        
+        thread = threading.Thread(target=run, name="LogSummaries", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_timer(self):
+        self.timer_stopped.set()
+
+_repeat_filter = None
+_listener = None
+
+def get_log_file_path():
+    """Get the path of the log file of this session."""
+    return os.path.join(get_log_directory(), 'latest.log')
+
+def flush_logs():
+    """Block until every record logged so far has been written out."""
+    if _repeat_filter is not None:
+        _repeat_filter.flush()
+    if _listener is not None:
+        # Stopping drains the queue; a new writer thread takes over after
+        _listener.stop()
+        _listener.start()
+
+def stop_logging():
+    """Write out pending records and stop the writer thread."""
+    global _listener
+    if _repeat_filter is not None:
+        _repeat_filter.stop_timer()
+        _repeat_filter.flush(force=True)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 def setup_logger():
-    """Set up and configure the application logger."""
+    """
+    Set up and configure the application logger.
+
+    Records go onto a queue and are written to the console and latest.log by
+    a background thread, so logging never blocks the caller on I/O.
+    """
+    global _listener, _repeat_filter
+    
     # Create a custom logger
     logger = logging.getLogger('CxrruptPad')
-    logger.setLevel(logging.DEBUG)
+    # Records below this level are dropped before any formatting happens
+    logger.setLevel(getattr(logging, os.getenv('CXRRUPTPAD_LOG_LEVEL', 'DEBUG').upper(), logging.DEBUG))
+    
+    # Worker processes (e.g. spawned metadata probing pools) re-import this
+    # module, and must not archive or write to the parent's log files
+    if multiprocessing.parent_process() is not None:
+        if not logger.handlers:
+            logger.addHandler(logging.NullHandler())
+        return logger
     
     # Clear any existing handlers
+    stop_logging()
     if logger.handlers:
         logger.handlers.clear()
     
@@ -41,35 +421,37 @@ def setup_logger():
     
     # If latest.log exists, archive it with timestamp
     if os.path.exists(latest_log_path):
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        archived_log_path = os.path.join(log_dir, f'log_{timestamp}.log')
-        try:
-            os.rename(latest_log_path, archived_log_path)
-        except Exception:
-            # If renaming fails, just proceed with a new file
-            pass
+        archive_log(latest_log_path)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_format = logging.Formatter('%(levelname)s: %(message)s')
     console_handler.setFormatter(console_format)
+    console_handler.addFilter(hide_perf_events)
     
-    # File handler
-    file_handler = logging.FileHandler(latest_log_path, encoding='utf-8')
+    # File handler, rotated by size and age
+    file_handler = LatestLogHandler(latest_log_path)
     file_handler.setLevel(logging.DEBUG)
-    file_format = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    file_format = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
     file_handler.setFormatter(file_format)
     
-    # Add handlers to the logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Both handlers run on the writer thread; the logger only enqueues
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    queue_handler = DeferredQueueHandler(log_queue)
+    # Repeated warnings are dropped before they're copied or their tracebacks rendered
+    _repeat_filter = RepeatFilter(queue_handler.emit)
+    _repeat_filter.start_timer()
+    queue_handler.addFilter(_repeat_filter)
+    logger.addHandler(queue_handler)
     
     # Log system information
-    logger.info(f"=== CxrruptPad Session Started ===")
-    logger.info(f"System: {platform.system()} {platform.version()}")
-    logger.info(f"Python Version: {platform.python_version()}")
-    logger.info(f"Log Directory: {log_dir}")
+    logger.info("=== CxrruptPad Session Started ===")
+    logger.info("System: %s %s", platform.system(), platform.version())
+    logger.info("Python Version: %s", platform.python_version())
+    logger.info("Log Directory: %s", log_dir)
     
     return logger
 
@@ -86,4 +468,5 @@ def log_uncaught_exceptions(exc_type, exc_value, exc_traceback):
 
 # Global logger instance
 logger = setup_logger()
-sys.excepthook = log_uncaught_exceptions 
\ No newline at end of file
+sys.excepthook = log_uncaught_exceptions
+atexit.register(stop_logging) 
\ No newline at end of file
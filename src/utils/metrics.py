@@ -0,0 +1,247 @@
+"""
+Runtime metrics.
+
+Counters, gauges and histograms kept in memory by a registry, for boards
+that run unattended. Recording a value is a dict update under a lock;
+nothing is formatted until the metrics are read, either as Prometheus text
+or as JSON from an optional HTTP server that only listens on localhost.
+
+The server is started when the 'metrics_port' setting or the
+CXRRUPTPAD_METRICS_PORT environment variable is set to a port number:
+
+    curl http://127.0.0.1:<port>/metrics
+    curl http://127.0.0.1:<port>/metrics.json
+"""
+import os
+import json
+import math
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket bounds in seconds, from a fast sound trigger to a long download
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class Metric:
+    """Base class of metrics; values are kept per tuple of label values."""
+
+    type = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+        if not self.labelnames and self.type != 'histogram':
+            # Unlabelled totals read as 0 before anything happens, rather than missing
+            self.values[()] = 0
+
+    def snapshot(self):
+        """Get a copy of the values, keyed by label values."""
+        with self.lock:
+            return dict(self.values)
+
+    def label_dict(self, labels):
+        return dict(zip(self.labelnames, labels))
+
+class Counter(Metric):
+    """A total that only goes up, e.g. sounds played."""
+
+    type = 'counter'
+
+    def inc(self, amount=1, labels=()):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+class Gauge(Metric):
+    """A value that goes up and down, e.g. voices playing right now."""
+
+    type = 'gauge'
+
+    def set(self, value, labels=()):
+        with self.lock:
+            self.values[labels] = value
+
+    def inc(self, amount=1, labels=()):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, amount=1, labels=()):
+        self.inc(-amount, labels)
+
+class Histogram(Metric):
+    """
+    Counts of observed values (e.g. durations in seconds) per bucket.
+
+    Each observation lands in the first bucket whose bound is at least the
+    value; the cumulative counts Prometheus expects are summed when read.
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, labels=()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                # Per-bucket counts (the last one past every bound) and the sum
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {labels: (list(counts), total) for labels, (counts, total) in self.values.items()}
+
+def format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+class MetricsRegistry:
+    """Holds the app's metrics by name and renders them."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name, help, labelnames, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        """Get the counter called name, creating it on first use."""
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        """Get the gauge called name, creating it on first use."""
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Get the histogram called name, creating it on first use."""
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def collect(self):
+        with self.lock:
+            return sorted(self.metrics.values(), key=lambda metric: metric.name)
+
+    def render_prometheus(self):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for labels, value in sorted(metric.snapshot().items()):
+                label_dict = metric.label_dict(labels)
+                if metric.type != 'histogram':
+                    lines.append(f"{metric.name}{format_labels(label_dict)} {format_value(value)}")
+                    continue
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    bucket_labels = format_labels({**label_dict, 'le': format_value(float(bound))})
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric.name}_sum{format_labels(label_dict)} {format_value(total)}")
+                lines.append(f"{metric.name}_count{format_labels(label_dict)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        """Get every metric as a JSON-serializable dict."""
+        result = {}
+        for metric in self.collect():
+            samples = []
+            for labels, value in sorted(metric.snapshot().items()):
+                sample = {'labels': metric.label_dict(labels)}
+                if metric.type == 'histogram':
+                    counts, total = value
+                    sample['count'] = sum(counts)
+                    sample['sum'] = total
+                    # Counts per bucket, not cumulative
+                    sample['buckets'] = {format_value(float(bound)): count
+                                         for bound, count in zip(metric.buckets + (float('inf'),), counts)}
+                else:
+                    sample['value'] = value
+                samples.append(sample)
+            result[metric.name] = {'type': metric.type, 'help': metric.help, 'samples': samples}
+        return result
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_metrics():
+    """Get the shared metrics registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves /metrics as Prometheus text and /metrics.json as JSON."""
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path in ('/', '/metrics'):
+            body = self.server.registry.render_prometheus().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif path == '/metrics.json':
+            body = json.dumps(self.server.registry.to_json(), indent=2).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the log
+
+def get_metrics_port(settings):
+    """Get the port to serve metrics on from the environment or settings, or None."""
+    port = os.getenv('CXRRUPTPAD_METRICS_PORT') or settings.get('metrics_port')
+    try:
+        port = int(port)
+    except (TypeError, ValueError):
+        return None
+    return port if 0 < port < 65536 else None
+
+def start_metrics_server(port, registry=None, host='127.0.0.1'):
+    """
+    Serve the metrics over HTTP on a background thread.
+
+    Only listens on localhost by default. Returns the server; call its
+    shutdown() to stop it. Raises OSError if the port can't be bound.
+    """
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.daemon_threads = True
+    server.registry = registry or get_metrics()
+    thread = threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True)
+    thread.start()
+    return server
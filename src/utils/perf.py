@@ -0,0 +1,75 @@
+"""
+Structured timing events.
+
+Timings are logged as 'PERF {json}' lines with the event name, its duration
+in milliseconds, an ID for the app session and any extra fields, so
+log_viewer.py --perf can turn the logs collected from users into latency
+percentiles, histograms and comparisons between sessions.
+"""
+import os
+import json
+import time
+import logging
+import contextlib
+
+# Marks timing events among the other log messages
+PERF_PREFIX = "PERF "
+
+# Identifies this run of the app, across log rotations
+SESSION_ID = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+# Not src.utils.logger, so that log_viewer can import this without starting a log session
+_logger = logging.getLogger('CxrruptPad')
+
+class PerfEvent:
+    """A timing event, serialized only when the log writer formats it."""
+
+    __slots__ = ('fields',)
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __str__(self):
+        return json.dumps(self.fields, separators=(',', ':'))
+
+def log_timing(event, duration_ms, **fields):
+    """Log a timing event that took duration_ms milliseconds."""
+    if _logger.isEnabledFor(logging.INFO):
+        fields.update(event=event, ms=round(duration_ms, 3), session=SESSION_ID)
+        _logger.info(PERF_PREFIX + "%s", PerfEvent(fields))
+
+def start_timer():
+    """Start timing something that finishes elsewhere (e.g. in a signal handler)."""
+    return time.perf_counter()
+
+def log_elapsed(event, started, **fields):
+    """Log the time since start_timer() returned started, and return it in seconds."""
+    elapsed = time.perf_counter() - started
+    log_timing(event, elapsed * 1000, **fields)
+    return elapsed
+
+@contextlib.contextmanager
+def timed(event, **fields):
+    """
+    Time the block and log it as an event.
+
+    The yielded dict can be filled with more fields while the block runs.
+    Blocks that raise are not logged.
+    """
+    started = time.perf_counter()
+    extra = {}
+    yield extra
+    fields.update(extra)
+    log_elapsed(event, started, **fields)
+
+def parse_perf_message(message):
+    """Get the fields of a timing event from a log message, or None."""
+    if not message.startswith(PERF_PREFIX):
+        return None
+    try:
+        fields = json.loads(message[len(PERF_PREFIX):].split('\n', 1)[0])
+    except ValueError:
+        return None
+    if not isinstance(fields, dict) or 'event' not in fields or 'ms' not in fields:
+        return None
+    return fields
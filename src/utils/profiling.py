@@ -0,0 +1,200 @@
+"""
+On-demand CPU and memory profiling of a running instance.
+
+A capture runs cProfile on the GUI thread (where slowness is felt; other
+threads aren't profiled) and tracemalloc for a number of seconds, then
+writes to the log directory:
+
+    profile_<time>.pstats   cProfile data, for pstats or snakeviz
+    profile_<time>.txt      the slowest functions by cumulative time
+    memory_<time>.txt       allocations that grew during the capture
+
+Captures are started from the menu behind a right-click on the logo, by
+sending the process SIGUSR1 (again to stop early), or by setting
+CXRRUPTPAD_PROFILE=<seconds> to profile startup. Nothing is hooked in
+while no capture is running.
+"""
+import io
+import os
+import signal
+import pstats
+import cProfile
+import datetime
+import threading
+import tracemalloc
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from src.utils.logger import logger
+from src.utils.log_paths import get_log_directory
+
+# Default length of a capture
+PROFILE_SECONDS = 10
+
+# Frames kept per allocation traceback
+TRACEMALLOC_FRAMES = 10
+
+# Lines in the reports
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 30
+
+# tracemalloc's own bookkeeping, left out of the memory report
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+class Profiler(QObject):
+    """
+    Runs one capture at a time on the thread that owns it (the GUI thread).
+
+    finished_signal is emitted with the paths of the reports written.
+    """
+    finished_signal = pyqtSignal(list)
+
+    def __init__(self, output_dir=None, parent=None):
+        super().__init__(parent)
+        self.output_dir = output_dir
+        self.profile = None
+        self.memory_snapshot = None
+        self.started_tracemalloc = False
+        self.started_at = None
+        self.stop_timer = QTimer(self)
+        self.stop_timer.setSingleShot(True)
+        self.stop_timer.timeout.connect(self.stop)
+
+    def is_running(self):
+        return self.profile is not None
+
+    def start(self, seconds=PROFILE_SECONDS, memory=True):
+        """Start a capture that stops by itself after seconds. Returns False if one is running."""
+        if self.is_running():
+            return False
+
+        # Memory tracing first, so the profile doesn't include taking the snapshot
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self.started_tracemalloc = True
+            self.memory_snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+
+        self.started_at = datetime.datetime.now()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        if seconds:
+            self.stop_timer.start(int(seconds * 1000))
+        logger.info("Profiling started for %s s", seconds)
+        return True
+
+    def stop(self):
+        """Stop the capture and write its reports. Returns their paths."""
+        if not self.is_running():
+            return []
+        self.profile.disable()
+        self.stop_timer.stop()
+        profile, self.profile = self.profile, None
+        elapsed = (datetime.datetime.now() - self.started_at).total_seconds()
+        
+        # Before writing anything, so the report doesn't show its own allocations
+        end_snapshot = None
+        if self.memory_snapshot is not None:
+            end_snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+            traced = tracemalloc.get_traced_memory()
+
+        output_dir = self.output_dir or get_log_directory()
+        timestamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+        paths = []
+        try:
+            paths += self.write_profile(profile, os.path.join(output_dir, f'profile_{timestamp}'), elapsed)
+            if end_snapshot is not None:
+                paths.append(self.write_memory_report(
+                    os.path.join(output_dir, f'memory_{timestamp}.txt'), self.memory_snapshot, end_snapshot, traced, elapsed
+                ))
+        except OSError as e:
+            logger.error("Failed to write profiling reports: %s", e)
+        finally:
+            self.memory_snapshot = None
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+                self.started_tracemalloc = False
+
+        logger.info("Profiling finished after %.1f s: %s", elapsed, ', '.join(paths))
+        self.finished_signal.emit(paths)
+        return paths
+
+    def toggle(self, seconds=PROFILE_SECONDS):
+        if self.is_running():
+            self.stop()
+        else:
+            self.start(seconds)
+
+    @staticmethod
+    def write_profile(profile, base_path, elapsed):
+        profile.dump_stats(base_path + '.pstats')
+
+        # Readable summary of the slowest functions
+        stream = io.StringIO()
+        stream.write(f"GUI thread profile over {elapsed:.1f} s\n")
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        with open(base_path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(stream.getvalue())
+        return [base_path + '.pstats', base_path + '.txt']
+
+    @staticmethod
+    def write_memory_report(path, start_snapshot, snapshot, traced, elapsed):
+        current, peak = traced
+        lines = [
+            f"Memory allocations over {elapsed:.1f} s",
+            f"Traced memory: {current / 1024:.1f} KiB now, {peak / 1024:.1f} KiB at peak",
+            "",
+            f"Top {TOP_ALLOCATIONS} changes by line:"
+        ]
+        lines += [str(stat) for stat in snapshot.compare_to(start_snapshot, 'lineno')[:TOP_ALLOCATIONS]]
+
+        # Where the biggest growth came from
+        lines += ["", "Largest changes by traceback:"]
+        for stat in snapshot.compare_to(start_snapshot, 'traceback')[:5]:
+            lines.append("")
+            lines.append(f"{stat.size_diff / 1024:+.1f} KiB in {stat.count_diff:+d} blocks")
+            lines += stat.traceback.format()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+def get_profiler():
+    """Get the shared profiler; first called from the GUI thread."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = Profiler()
+        return _profiler
+
+def install_profile_signal():
+    """
+    Toggle a capture when the process gets SIGUSR1 (where there is one).
+
+    Python runs the handler on the main thread as soon as it gets to run
+    any Python code, which the app's timers make happen within a fraction
+    of a second; the capture itself starts from the event loop.
+    """
+    if not hasattr(signal, 'SIGUSR1'):
+        return False
+    signal.signal(signal.SIGUSR1, lambda signum, frame: QTimer.singleShot(0, get_profiler().toggle))
+    return True
+
+def start_profile_from_env():
+    """Start a capture if CXRRUPTPAD_PROFILE asks for one, for that many seconds."""
+    value = os.getenv('CXRRUPTPAD_PROFILE')
+    if not value or value == '0':
+        return False
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = PROFILE_SECONDS
+    return get_profiler().start(seconds)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.utils.blob_store import BlobStore, blob_key
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.sounds_dir = os.path.join(self.root, "sounds")
+        self.index_path = os.path.join(self.root, "blob_index.json")
+        for tab in ("A", "B"):
+            os.makedirs(os.path.join(self.sounds_dir, tab))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, relpath, data):
+        path = os.path.join(self.sounds_dir, relpath)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_duplicates_share_one_blob(self):
+        """Test that identical files in different tabs become links to one blob"""
+        data = os.urandom(300 * 1024)
+        first = self.write("A/clip.wav", data)
+        second = self.write("B/clip copy.wav", data)
+        unique = self.write("B/other.wav", os.urandom(1024))
+
+        store = BlobStore(self.sounds_dir, self.index_path)
+        saved = store.index_files([first, second, unique])
+
+        self.assertEqual(saved, len(data))
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertEqual(blob_key(first), blob_key(second))
+        self.assertEqual(len(store.blobs), 1)
+
+        # Unique content is never fully hashed
+        self.assertIsNone(store.files[os.path.join("B", "other.wav")]['hash'])
+
+        with open(second, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_index_is_reused_and_blobs_pruned(self):
+        """Test that the saved index is reused and unused blobs are removed"""
+        data = os.urandom(4096)
+        first = self.write("A/one.wav", data)
+        second = self.write("B/two.wav", data)
+        BlobStore(self.sounds_dir, self.index_path).index_files([first, second])
+
+        # A new store instance picks up the saved index
+        store = BlobStore(self.sounds_dir, self.index_path)
+        self.assertEqual(len(store.blobs), 1)
+        blob_path = os.path.join(self.sounds_dir, list(store.blobs.values())[0]['path'])
+
+        os.remove(first)
+        os.remove(second)
+        store.prune()
+        self.assertEqual(store.blobs, {})
+        self.assertFalse(os.path.exists(blob_path))
+
+    def test_import_links_known_content(self):
+        """Test that importing known content links to the existing blob"""
+        data = os.urandom(8192)
+        first = self.write("A/one.wav", data)
+        second = self.write("B/two.wav", data)
+        store = BlobStore(self.sounds_dir, self.index_path)
+        store.index_files([first, second])
+
+        source = os.path.join(self.root, "outside.wav")
+        with open(source, 'wb') as f:
+            f.write(data)
+        target = os.path.join(self.sounds_dir, "B", "imported.wav")
+
+        self.assertTrue(store.link_duplicate(source, target))
+        self.assertTrue(os.path.samefile(target, first))
+        self.assertFalse(store.link_duplicate(source + "-missing", target + "2"))
+
+if __name__ == '__main__':
+    unittest.main()
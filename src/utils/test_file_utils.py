@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.utils.file_utils import (
+    get_tab_favorites_path, get_tab_playlist_path, get_tab_trims_path,
+    save_json, load_json, rename_tab_data, delete_tab_data
+)
+
+class TestTabData(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.environ = dict(os.environ)
+        os.environ['CXRRUPTPAD_DATA_DIR'] = self.root
+        save_json(get_tab_favorites_path("Old"), {"0": True})
+        save_json(get_tab_playlist_path("Old"), {"url": "https://example.com/list"})
+        save_json(get_tab_trims_path("Old"), {"a.wav": [0.1, 0.9]})
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.root)
+
+    def test_rename_moves_tab_files(self):
+        """Test that renaming a tab takes its favorites, playlist link and trims along"""
+        save_json(get_tab_trims_path("New"), {"stale.wav": [0, 1]})
+        os.remove(get_tab_playlist_path("Old"))
+        save_json(get_tab_playlist_path("New"), {"url": "https://example.com/stale"})
+        rename_tab_data("Old", "New")
+        self.assertEqual(load_json(get_tab_favorites_path("New")), {"0": True})
+        self.assertEqual(load_json(get_tab_trims_path("New")), {"a.wav": [0.1, 0.9]})
+        self.assertFalse(os.path.exists(get_tab_playlist_path("New")))
+        self.assertEqual(sorted(os.listdir(self.root)), ["New_favorites.json", "New_trims.json"])
+
+    def test_delete_removes_tab_files(self):
+        """Test that deleting a tab removes its favorites, playlist link and trims"""
+        save_json(get_tab_trims_path("Other"), {})
+        delete_tab_data("Old")
+        self.assertEqual(os.listdir(self.root), ["Other_trims.json"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import json
+import wave
+import random
+import shutil
+import tempfile
+import unittest
+from src.utils.library_generator import generate_library, parse_lengths
+
+class TestLibraryGenerator(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def generate(self, name, **kwargs):
+        return generate_library(os.path.join(self.root, name), tabs=2, sounds=6, lengths='fixed:0.3',
+                                rates=(8000, 16000), favorites=0.5, hotkeys=3, seed=7, **kwargs)
+
+    def test_library_layout(self):
+        """Test that tabs, sound files and favorites come out the way the app reads them"""
+        library = self.generate('a')
+        self.assertEqual(library['sounds'], 12)
+        self.assertEqual(sorted(os.listdir(library['sounds_dir'])), ["Tab 001", "Tab 002"])
+
+        tab_dir = os.path.join(library['sounds_dir'], "Tab 001")
+        files = sorted(os.listdir(tab_dir))
+        self.assertEqual([f[:5] for f in files], [f"{i:05d}" for i in range(6)])
+        for filename in files:
+            with wave.open(os.path.join(tab_dir, filename), 'rb') as wf:
+                self.assertIn(wf.getframerate(), (8000, 16000))
+                self.assertAlmostEqual(wf.getnframes() / wf.getframerate(), 0.3, places=2)
+
+        with open(os.path.join(library['data_dir'], "Tab 001_favorites.json"), 'r', encoding='utf-8') as f:
+            favorites = json.load(f)
+        self.assertEqual(len(favorites['favorites']), 3)
+        self.assertEqual(favorites['hotkeys'], {"0": "0", "1": "1", "2": "2"})
+
+        # The same seed gives the same library
+        other = self.generate('b')
+        self.assertEqual(sorted(os.listdir(os.path.join(other['sounds_dir'], "Tab 001"))), files)
+
+    def test_unavailable_formats(self):
+        """Test that formats needing a missing ffmpeg are skipped, or refused if nothing is left"""
+        library = self.generate('a', formats=('wav', 'mp3'), ffmpeg="no-such-ffmpeg")
+        self.assertEqual(library['formats'], ['wav'])
+        self.assertEqual(library['skipped_formats'], ['mp3'])
+        with self.assertRaises(ValueError):
+            self.generate('b', formats=('ogg',), ffmpeg="no-such-ffmpeg")
+
+    def test_parse_lengths(self):
+        """Test length distributions and their lower bound"""
+        rng = random.Random(1)
+        self.assertEqual(parse_lengths('fixed:2')(rng), 2)
+        self.assertEqual(parse_lengths('fixed:0')(rng), 0.05)
+        self.assertTrue(all(1 <= parse_lengths('uniform:1,2')(rng) <= 2 for _ in range(50)))
+        for spec in ('lognormal:1', 'triangle:1,2', 'uniform:a,b'):
+            with self.assertRaises(ValueError):
+                parse_lengths(spec)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import gzip
+import shutil
+import datetime
+import tempfile
+import unittest
+from src.utils import log_viewer
+from src.utils.log_viewer import (
+    iter_all_entries, iter_entries, iter_file_entries, last_entries, load_index,
+    make_filter, parse_time_arg, collect_perf_events, summarize_timings, histogram, find_regressions
+)
+
+def write_log(path, start, count, level="INFO", extra=None):
+    # One entry per minute from start, every tenth with a traceback
+    lines = []
+    for i in range(count):
+        stamp = (start + datetime.timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')
+        lines.append(f"{stamp} [{level}] Entry {i}")
+        if i % 10 == 9:
+            lines.append("Traceback (most recent call last):")
+            lines.append(f"ValueError: failure {i}")
+    data = ("\n".join(lines) + "\n").encode('utf-8')
+    if path.endswith('.gz'):
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+    else:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+class TestLogViewer(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.day1 = datetime.datetime(2024, 1, 1, 12, 0, 0)
+        self.day2 = datetime.datetime(2024, 1, 2, 12, 0, 0)
+        self.archive = os.path.join(self.root, 'log_20240101_120000.log.gz')
+        self.latest = os.path.join(self.root, 'latest.log')
+        write_log(self.archive, self.day1, 50)
+        write_log(self.latest, self.day2, 100, level="DEBUG")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_continuation_lines(self):
+        """Test that lines without a header are kept with the entry before them"""
+        entries = list(iter_entries([
+            "2024-01-01 00:00:00 [ERROR] Failed\n",
+            "Traceback (most recent call last):\n",
+            "  File \"x.py\", line 1\n",
+            "2024-01-01 00:00:01 [INFO] Next\n"
+        ]))
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0]['message'], "Failed\nTraceback (most recent call last):\n  File \"x.py\", line 1")
+        self.assertEqual(entries[1]['message'], "Next")
+
+    def test_last_entries_reads_backwards(self):
+        """Test that the last entries come out in order across read blocks and files"""
+        block = log_viewer.REVERSE_BLOCK
+        log_viewer.REVERSE_BLOCK = 64  # Force lines to straddle blocks
+        try:
+            entries = last_entries([self.archive, self.latest], 3, make_filter())
+            self.assertEqual([entry['message'].split('\n')[0] for entry in entries], ["Entry 97", "Entry 98", "Entry 99"])
+            self.assertIn("ValueError: failure 99", entries[-1]['message'])
+
+            # Spans into the compressed archive when the latest log has too few matches
+            entries = last_entries([self.archive, self.latest], 2, make_filter(level="INFO"))
+            self.assertEqual([entry['message'].split('\n')[0] for entry in entries], ["Entry 48", "Entry 49"])
+        finally:
+            log_viewer.REVERSE_BLOCK = block
+
+    def test_index_skips_files(self):
+        """Test that the time index rules out archives and is cached next to them"""
+        index = load_index(self.archive)
+        self.assertEqual(index['first'], "2024-01-01 12:00:00")
+        self.assertEqual(index['last'], "2024-01-01 12:49:00")
+        self.assertEqual(index['levels'], {"INFO": 50})
+        self.assertTrue(os.path.exists(self.archive + '.idx'))
+
+        # Only latest.log holds entries from the second day
+        since = datetime.datetime(2024, 1, 2, 13, 0, 0)
+        entries = list(iter_all_entries([self.archive, self.latest], make_filter(since=since), since=since))
+        self.assertEqual(len(entries), 40)
+        self.assertEqual(list(iter_file_entries(self.archive, since=since)), [])
+        self.assertEqual(list(iter_file_entries(self.archive, level="ERROR")), [])
+
+    def test_checkpoints_seek_into_plain_archive(self):
+        """Test that reads of a plain archive start from a checkpoint before since"""
+        plain = os.path.join(self.root, 'log_20240103_000000.log')
+        write_log(plain, self.day1, 3000)
+        step = log_viewer.INDEX_STEP
+        log_viewer.INDEX_STEP = 4096
+        try:
+            index = load_index(plain)
+        finally:
+            log_viewer.INDEX_STEP = step
+        self.assertGreater(len(index['checkpoints']), 10)
+
+        since = self.day1 + datetime.timedelta(minutes=2990)
+        until = self.day1 + datetime.timedelta(minutes=2995)
+        entries = [entry for entry in iter_file_entries(plain, since=since, until=until) if make_filter(since=since)(entry)]
+        self.assertEqual([entry['message'].split('\n')[0] for entry in entries], [f"Entry {i}" for i in range(2990, 2996)])
+
+    def test_parse_time_arg(self):
+        """Test absolute and relative time arguments"""
+        now = datetime.datetime(2024, 1, 2, 12, 0, 0)
+        self.assertEqual(parse_time_arg("2024-01-01"), datetime.datetime(2024, 1, 1))
+        self.assertEqual(parse_time_arg("2024-01-01 10:30"), datetime.datetime(2024, 1, 1, 10, 30))
+        self.assertEqual(parse_time_arg("2h", now), datetime.datetime(2024, 1, 2, 10, 0, 0))
+        self.assertEqual(parse_time_arg("7d", now), datetime.datetime(2023, 12, 26, 12, 0, 0))
+        with self.assertRaises(ValueError):
+            parse_time_arg("yesterday")
+
+    def test_perf_statistics(self):
+        """Test percentiles and histogram buckets of timings"""
+        stats = summarize_timings([float(ms) for ms in range(1, 101)])
+        self.assertEqual(stats['count'], 100)
+        self.assertAlmostEqual(stats['p50'], 50.5)
+        self.assertAlmostEqual(stats['p90'], 90.1)
+        self.assertEqual(stats['max'], 100)
+        self.assertEqual(histogram([0.5, 1, 3, 3, 40]), [(1, 2), (2, 0), (5, 2), (10, 0), (20, 0), (50, 1)])
+
+    def test_perf_regressions(self):
+        """Test that a session slower than the ones before it is reported"""
+        lines = []
+        for session, ms in (("20240101_000000_1", 10), ("20240102_000000_2", 11), ("20240103_000000_3", 30)):
+            for i in range(6):
+                lines.append(f'2024-01-01 00:00:0{i} [INFO] PERF {{"event":"sound.trigger","ms":{ms + i % 2},"session":"{session}"}}')
+                lines.append(f'2024-01-01 00:00:0{i} [INFO] PERF {{"event":"tab.load","ms":100,"session":"{session}"}}')
+        lines.append("2024-01-01 00:00:09 [INFO] Not a timing")
+        events = collect_perf_events(iter_entries(lines))
+        self.assertEqual(len(events), 36)
+
+        regressions = find_regressions(events)
+        self.assertEqual({(r['event'], r['metric']) for r in regressions}, {("sound.trigger", "p50"), ("sound.trigger", "p90")})
+        self.assertEqual(regressions[0]['session'], "20240103_000000_3")
+        self.assertGreater(regressions[0]['change'], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
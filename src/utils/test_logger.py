@@ -1,7 +1,12 @@
 import os
+import sys
+import shutil
+import tempfile
 import unittest
 import logging
-from src.utils.logger import setup_logger, get_log_directory
+import time
+from src.utils.logger import setup_logger, get_log_directory, flush_logs, enforce_log_retention, LatestLogHandler, RepeatFilter, hide_perf_events
+from src.utils.log_viewer import read_log_file
 
 class TestLogger(unittest.TestCase):
     def test_logger_setup(self):
@@ -24,6 +29,9 @@ class TestLogger(unittest.TestCase):
         logger.warning("Warning test message")
         logger.error("Error test message")
         
+        # Records are written by a background thread
+        flush_logs()
+        
         # Check that log file exists
         latest_log_path = os.path.join(log_dir, 'latest.log')
         self.assertTrue(os.path.exists(latest_log_path), "latest.log file should exist")
@@ -35,8 +43,167 @@ class TestLogger(unittest.TestCase):
             self.assertIn("Info test message", log_content)
             self.assertIn("Warning test message", log_content)
             self.assertIn("Error test message", log_content)
+    
+    def test_lazy_formatting(self):
+        """Test that %-style arguments and tracebacks reach the log file"""
+        logger = setup_logger()
+        logger.info("Lazy %s message %d", "formatted", 42)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.error("Caught %s", "error", exc_info=True)
+        flush_logs()
+        
+        with open(os.path.join(get_log_directory(), 'latest.log'), 'r', encoding='utf-8') as f:
+            log_content = f.read()
+        self.assertIn("Lazy formatted message 42", log_content)
+        self.assertIn("Caught error", log_content)
+        self.assertIn("ValueError: boom", log_content)
+    
+    def test_size_rotation(self):
+        """Test that the log file is archived once it grows past its size limit"""
+        log_dir = tempfile.mkdtemp()
+        try:
+            handler = LatestLogHandler(os.path.join(log_dir, 'latest.log'), max_bytes=200)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            for i in range(10):
+                handler.handle(logging.makeLogRecord({'msg': "x" * 50, 'levelno': logging.INFO}))
+            handler.close()
+            
+            archives = [name for name in os.listdir(log_dir) if name.startswith('log_')]
+            self.assertTrue(archives)
+            for name in archives:
+                self.assertLessEqual(os.path.getsize(os.path.join(log_dir, name)), 200 + 51)
+        finally:
+            shutil.rmtree(log_dir)
+    
+    def test_retention_compresses_and_prunes(self):
+        """Test that archives are gzipped and pruned by count and age, keeping latest.log"""
+        log_dir = tempfile.mkdtemp()
+        try:
+            # The first archive is 40 days old, the others a few hours
+            ages = [40 * 86400, 5 * 3600, 4 * 3600, 3 * 3600, 2 * 3600, 3600]
+            for day, age in enumerate(ages):
+                path = os.path.join(log_dir, f'log_2024010{day + 1}_000000.log')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(f"2024-01-0{day + 1} 00:00:00 [INFO] Session {day}\n")
+                os.utime(path, (time.time() - age, time.time() - age))
+            with open(os.path.join(log_dir, 'latest.log'), 'w', encoding='utf-8') as f:
+                f.write("current\n")
+            
+            compressed, deleted = enforce_log_retention(log_dir, max_count=4, max_age_days=30, max_total_mb=10)
+            self.assertEqual(compressed, 6)
+            self.assertEqual(deleted, 2)
             
-        return True
+            remaining = sorted(os.listdir(log_dir))
+            self.assertEqual(remaining, [
+                'latest.log',
+                'log_20240103_000000.log.gz', 'log_20240104_000000.log.gz',
+                'log_20240105_000000.log.gz', 'log_20240106_000000.log.gz'
+            ])
+            
+            # Compressed archives read like plain ones
+            entries = read_log_file(os.path.join(log_dir, 'log_20240106_000000.log.gz'))
+            self.assertEqual([entry['message'] for entry in entries], ["Session 5"])
+        finally:
+            shutil.rmtree(log_dir)
+    
+    def test_repeated_warnings_are_summarized(self):
+        """Test that repeated warnings are collapsed and floods rate-limited"""
+        now = [0.0]
+        emitted = []
+        repeat_filter = RepeatFilter(emitted.append, window=60, summary_interval=10, rate=1, burst=5, clock=lambda: now[0])
+        logger = logging.getLogger('CxrruptPad.test_repeat')
+        
+        def log(msg, *args, level=logging.ERROR, exc_info=None):
+            record = logger.makeRecord(logger.name, level, __file__, 1, msg, args, exc_info)
+            return repeat_filter.filter(record)
+        
+        try:
+            raise FileNotFoundError("gone")
+        except FileNotFoundError:
+            exc_info = sys.exc_info()
+        
+        # Only the first of a failure repeated on every trigger goes through
+        results = []
+        for i in range(50):
+            now[0] = i * 0.1
+            results.append(log("Sound file not found: %s", "a.mp3", exc_info=exc_info))
+        self.assertEqual(results.count(True), 1)
+        self.assertTrue(log("Sound file not found: %s", "b.mp3"))
+        self.assertTrue(log("Playing sound", level=logging.DEBUG))
+        
+        # The summary goes out with the next warning once it's due
+        now[0] = 12.0
+        self.assertTrue(log("Other failure"))
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].getMessage(), "Sound file not found: a.mp3 (repeated 49 times in 4.9 s)")
+        self.assertEqual(emitted[0].levelno, logging.ERROR)
+        
+        # Distinct warnings past the burst are dropped and counted
+        results = [log("Failure %d", i) for i in range(10)]
+        self.assertEqual(results.count(True), 4)
+        repeat_filter.flush(force=True)
+        self.assertEqual(emitted[-1].getMessage(), "Dropped 6 warnings over the rate limit in 0.0 s")
+        
+        # A failure that stopped repeating is logged in full again
+        now[0] = 100.0
+        self.assertTrue(log("Sound file not found: %s", "a.mp3", exc_info=exc_info))
+
+    def test_summaries_need_no_further_warning(self):
+        """Test that held back repeats are summarized by the timer, and before a failure is logged again after a quiet spell"""
+        now = [0.0]
+        emitted = []
+        repeat_filter = RepeatFilter(emitted.append, window=60, summary_interval=0.02, clock=lambda: now[0])
+        logger = logging.getLogger('CxrruptPad.test_repeat')
+
+        def log(msg):
+            return repeat_filter.filter(logger.makeRecord(logger.name, logging.WARNING, __file__, 1, msg, (), None))
+
+        # A failure that repeats and then stops is summarized without another warning
+        for i in range(5):
+            now[0] = i * 0.001
+            log("Device lost")
+        now[0] = 1.0
+        repeat_filter.start_timer()
+        try:
+            deadline = time.monotonic() + 5
+            while not emitted and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            repeat_filter.stop_timer()
+        self.assertEqual([record.getMessage() for record in emitted], ["Device lost (repeated 4 times in 0.0 s)"])
+
+        # Repeats still pending when a failure comes back after the window are summarized first
+        emitted.clear()
+        repeat_filter = RepeatFilter(emitted.append, window=60, summary_interval=1000, clock=lambda: now[0])
+        for now[0] in (0.0, 1.0):
+            log("Device lost")
+        now[0] = 70.0
+        self.assertTrue(log("Device lost"))
+        self.assertEqual([record.getMessage() for record in emitted], ["Device lost (repeated 1 times in 1.0 s)"])
+
+    def test_console_hides_perf_events(self):
+        """Test that timing events are kept off the console but other INFO messages aren't"""
+        from src.utils.perf import log_timing
+        logger = setup_logger()
+        
+        class ListHandler(logging.Handler):
+            def __init__(self):
+                super().__init__(logging.INFO)
+                self.messages = []
+            def emit(self, record):
+                self.messages.append(record.getMessage())
+        
+        console = ListHandler()
+        console.addFilter(hide_perf_events)
+        logger.addHandler(console)
+        try:
+            log_timing("sound.trigger", 1.5)
+            logger.info("Playing sound")
+        finally:
+            logger.removeHandler(console)
+        self.assertEqual(console.messages, ["Playing sound"])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
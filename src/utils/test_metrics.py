@@ -0,0 +1,76 @@
+import os
+import json
+import unittest
+import urllib.request
+from src.utils.metrics import MetricsRegistry, get_metrics_port, start_metrics_server
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.plays = self.registry.counter("test_plays_total", "Sounds started")
+        self.failures = self.registry.counter("test_failures_total", "Failed plays", ("reason",))
+        self.voices = self.registry.gauge("test_voices", "Voices playing")
+        self.latency = self.registry.histogram("test_latency_seconds", "Trigger latency", buckets=(0.01, 0.1, 1.0))
+
+    def test_prometheus_text(self):
+        """Test counters, labels, gauges and cumulative histogram buckets in the text format"""
+        self.plays.inc()
+        self.plays.inc(2)
+        self.failures.inc(labels=("missing_file",))
+        self.failures.inc(labels=('say "hi"',))
+        self.voices.set(3)
+        self.voices.dec()
+        for value in (0.005, 0.01, 0.05, 5.0):
+            self.latency.observe(value)
+
+        lines = self.registry.render_prometheus().splitlines()
+        self.assertIn("# TYPE test_plays_total counter", lines)
+        self.assertIn("test_plays_total 3", lines)
+        self.assertIn('test_failures_total{reason="missing_file"} 1', lines)
+        self.assertIn('test_failures_total{reason="say \\"hi\\""} 1', lines)
+        self.assertIn("test_voices 2", lines)
+        self.assertIn('test_latency_seconds_bucket{le="0.01"} 2', lines)
+        self.assertIn('test_latency_seconds_bucket{le="0.1"} 3', lines)
+        self.assertIn('test_latency_seconds_bucket{le="1"} 3', lines)
+        self.assertIn('test_latency_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("test_latency_seconds_sum 5.065", lines)
+        self.assertIn("test_latency_seconds_count 4", lines)
+
+        # The same name always gives the same metric
+        self.assertIs(self.registry.counter("test_plays_total", "Sounds started"), self.plays)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("test_plays_total", "Not a gauge")
+
+    def test_http_endpoint(self):
+        """Test that the server serves both formats on localhost"""
+        self.plays.inc(5)
+        self.latency.observe(0.2)
+        server = start_metrics_server(0, self.registry)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(base + "/metrics", timeout=5) as response:
+                self.assertIn("test_plays_total 5", response.read().decode('utf-8'))
+            with urllib.request.urlopen(base + "/metrics.json", timeout=5) as response:
+                data = json.loads(response.read())
+            self.assertEqual(data["test_plays_total"]["samples"], [{"labels": {}, "value": 5}])
+            latency = data["test_latency_seconds"]["samples"][0]
+            self.assertEqual(latency["count"], 1)
+            self.assertEqual(latency["buckets"], {"0.01": 0, "0.1": 0, "1": 1, "+Inf": 0})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_metrics_port(self):
+        """Test that the environment overrides the setting and bad ports are ignored"""
+        os.environ.pop('CXRRUPTPAD_METRICS_PORT', None)
+        self.assertIsNone(get_metrics_port({}))
+        self.assertEqual(get_metrics_port({'metrics_port': 9123}), 9123)
+        self.assertIsNone(get_metrics_port({'metrics_port': "off"}))
+        os.environ['CXRRUPTPAD_METRICS_PORT'] = "9200"
+        try:
+            self.assertEqual(get_metrics_port({'metrics_port': 9123}), 9200)
+        finally:
+            del os.environ['CXRRUPTPAD_METRICS_PORT']
+
+if __name__ == '__main__':
+    unittest.main()
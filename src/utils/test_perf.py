@@ -0,0 +1,48 @@
+import logging
+import unittest
+from src.utils.perf import log_timing, timed, parse_perf_message, SESSION_ID
+
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+class TestPerf(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger('CxrruptPad')
+        self.handler = CaptureHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_log_timing_round_trip(self):
+        """Test that timing events are logged as parseable JSON"""
+        log_timing("sound.trigger", 1.23456, cached=True)
+        fields = parse_perf_message(self.handler.messages[-1])
+        self.assertEqual(fields['event'], "sound.trigger")
+        self.assertEqual(fields['ms'], 1.235)
+        self.assertEqual(fields['session'], SESSION_ID)
+        self.assertTrue(fields['cached'])
+
+    def test_timed_block(self):
+        """Test that timed() logs the block with fields added inside it, and skips failed blocks"""
+        with timed("sound.decode", ext=".wav") as fields:
+            fields['seconds'] = 2.5
+        event = parse_perf_message(self.handler.messages[-1])
+        self.assertEqual(event['event'], "sound.decode")
+        self.assertEqual(event['seconds'], 2.5)
+        self.assertGreaterEqual(event['ms'], 0)
+
+        count = len(self.handler.messages)
+        with self.assertRaises(ValueError):
+            with timed("sound.decode"):
+                raise ValueError("bad file")
+        self.assertEqual(len(self.handler.messages), count)
+        self.assertIsNone(parse_perf_message("Playing sound 1"))
+
+if __name__ == '__main__':
+    unittest.main()
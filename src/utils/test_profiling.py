@@ -0,0 +1,47 @@
+import os
+import pstats
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+from PyQt6.QtCore import QCoreApplication
+from src.utils.profiling import Profiler
+
+def allocate_buffers():
+    return [bytearray(64 * 1024) for _ in range(32)]
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_capture_writes_reports(self):
+        """Test that a capture writes the profile and the allocations made during it"""
+        profiler = Profiler(output_dir=self.root)
+        self.assertTrue(profiler.start(seconds=0))
+        self.assertFalse(profiler.start(seconds=0))
+        buffers = allocate_buffers()
+        paths = profiler.stop()
+        
+        self.assertFalse(profiler.is_running())
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(sorted(os.path.splitext(path)[1] for path in paths), ['.pstats', '.txt', '.txt'])
+        
+        profile_path = next(path for path in paths if path.endswith('.pstats'))
+        functions = {function for _, _, function in pstats.Stats(profile_path).stats}
+        self.assertIn('allocate_buffers', functions)
+        
+        memory_path = next(path for path in paths if os.path.basename(path).startswith('memory_'))
+        with open(memory_path, 'r', encoding='utf-8') as f:
+            report = f.read()
+        self.assertIn("test_profiling.py", report)
+        self.assertEqual(len(buffers), 32)
+        
+        # Nothing left to stop
+        self.assertEqual(profiler.stop(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from src.utils import tracing
+from src.utils.tracing import span, traced, enable_tracing, disable_tracing, span_count, build_trace, dump_trace
+
+@traced("test.work")
+def work(value):
+    return value * 2
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.was_enabled = tracing.is_enabled()
+
+    def tearDown(self):
+        if self.was_enabled:
+            enable_tracing()
+        else:
+            disable_tracing()
+
+    def test_disabled_records_nothing(self):
+        """Test that spans and traced calls are no-ops while tracing is off"""
+        enable_tracing()
+        disable_tracing()
+        with span("test.off", detail=1):
+            pass
+        self.assertEqual(work(2), 4)
+        self.assertEqual(span_count(), 0)
+        self.assertIs(span("test.off"), span("test.other"))
+
+    def test_chrome_trace(self):
+        """Test that nested spans from several threads end up in the trace JSON"""
+        enable_tracing()
+        with span("test.outer", tab="Default"):
+            self.assertEqual(work(3), 6)
+        thread = threading.Thread(target=work, args=(1,), name="TestWorker")
+        thread.start()
+        thread.join()
+        with self.assertRaises(ValueError):
+            with span("test.failing"):
+                raise ValueError("boom")
+
+        trace = build_trace()
+        spans = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+        self.assertEqual([event['name'] for event in spans], ["test.work", "test.outer", "test.work", "test.failing"])
+        inner, outer, other, failing = spans
+        self.assertEqual(outer['args'], {'tab': "Default"})
+        self.assertEqual(failing['args'], {'error': "ValueError"})
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['ts'] + outer['dur'], inner['ts'] + inner['dur'])
+        self.assertNotEqual(inner['tid'], other['tid'])
+        names = {event['tid']: event['args']['name'] for event in trace['traceEvents'] if event['ph'] == 'M'}
+        self.assertEqual(names[other['tid']], "TestWorker")
+
+        root = tempfile.mkdtemp()
+        try:
+            path = dump_trace(os.path.join(root, 'trace.json'))
+            with open(path, 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f), trace)
+        finally:
+            shutil.rmtree(root)
+
+    def test_ring_buffer(self):
+        """Test that only the newest spans are kept once the buffer is full"""
+        enable_tracing(capacity=5)
+        try:
+            for i in range(8):
+                with span(f"test.{i}"):
+                    pass
+            self.assertEqual([event['name'] for event in build_trace()['traceEvents'] if event['ph'] == 'X'],
+                             [f"test.{i}" for i in range(3, 8)])
+        finally:
+            enable_tracing()
+
+if __name__ == '__main__':
+    unittest.main()
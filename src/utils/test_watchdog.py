@@ -0,0 +1,43 @@
+import time
+import unittest
+from PyQt6.QtCore import QCoreApplication
+from src.utils.watchdog import StallWatchdog, stalls_counter
+
+def blocking_call(seconds):
+    time.sleep(seconds)
+
+class TestWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def run_events(self, seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_stall_is_reported_with_stack(self):
+        """Test that a blocked event loop is reported with where it was blocked"""
+        stalls = []
+        watchdog = StallWatchdog(threshold=0.15, interval=0.02)
+        watchdog.stall_signal.connect(lambda seconds, stack: stalls.append((seconds, stack)))
+        before = stalls_counter.snapshot()[()]
+        watchdog.start_watching()
+        try:
+            # Short delays between heartbeats aren't stalls
+            self.run_events(0.2)
+            self.assertEqual(stalls, [])
+            
+            blocking_call(0.4)
+            self.run_events(0.1)
+        finally:
+            watchdog.stop_watching()
+        
+        self.assertEqual(len(stalls), 1)
+        seconds, stack = stalls[0]
+        self.assertGreater(seconds, 0.3)
+        self.assertIn("blocking_call", stack)
+        self.assertEqual(stalls_counter.snapshot()[()], before + 1)
+
+if __name__ == '__main__':
+    unittest.main()
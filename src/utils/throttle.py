@@ -0,0 +1,20 @@
+import time
+
+class Throttle:
+    """Limit how often something happens to at most once per interval."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.last_time = None
+
+    def ready(self, force=False):
+        """Return True (and restart the interval) if enough time has passed."""
+        now = time.monotonic()
+        if force or self.last_time is None or now - self.last_time >= self.interval:
+            self.last_time = now
+            return True
+        return False
+
+    def reset(self):
+        """Forget the last event so the next call to ready() succeeds."""
+        self.last_time = None
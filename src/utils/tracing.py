@@ -0,0 +1,166 @@
+"""
+Span tracing across threads.
+
+Spans (a name, start, duration, thread and a few arguments) are kept in a
+fixed-size ring buffer while tracing is enabled, and dumped as Chrome
+trace-event JSON that chrome://tracing and https://ui.perfetto.dev open
+directly, one row per thread.
+
+    with span("tab.probe", tab=name):
+        ...
+
+    @traced("sound.trigger")
+    def toggle_sound(...):
+        ...
+
+While tracing is disabled, span() returns a shared no-op context and
+traced functions only check a flag before calling through.
+
+Set CXRRUPTPAD_TRACE=1 to trace from startup and save the trace to the
+log directory on exit (or set it to a .json path to save it there), or
+use the menu behind a right-click on the logo.
+
+This module sticks to the standard library, since worker processes that
+probe metadata import it too; spans recorded in other processes are not
+collected.
+"""
+import os
+import json
+import time
+import atexit
+import datetime
+import functools
+import threading
+import collections
+import multiprocessing
+
+from src.utils.log_paths import get_log_directory
+
+# Spans kept; the oldest are dropped once the buffer is full
+TRACE_CAPACITY = 200000
+
+_enabled = False
+_events = collections.deque(maxlen=TRACE_CAPACITY)  # (name, start ns, end ns, thread id, args)
+_thread_names = {}
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """Records the time between entering and leaving it."""
+
+    __slots__ = ('name', 'args', 'started')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.started = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        record_span(self.name, self.started, time.perf_counter_ns(), self.args)
+        return False
+
+def is_enabled():
+    return _enabled
+
+def enable_tracing(capacity=TRACE_CAPACITY):
+    """Start recording spans, into a fresh buffer holding up to capacity of them."""
+    global _enabled, _events
+    if _events.maxlen != capacity:
+        _events = collections.deque(maxlen=capacity)
+    _events.clear()
+    _enabled = True
+
+def disable_tracing():
+    """Stop recording spans; the ones recorded so far can still be dumped."""
+    global _enabled
+    _enabled = False
+
+def record_span(name, start_ns, end_ns, args=None):
+    """Add a finished span that ran on the calling thread."""
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    # deque.append is atomic, so threads need no lock here
+    _events.append((name, start_ns, end_ns, tid, args))
+
+def span(name, **args):
+    """Get a context manager that records the block as a span, if tracing is on."""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, args)
+
+def traced(name=None):
+    """Decorate a function so each call is recorded as a span named name (or its qualified name)."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def span_count():
+    return len(_events)
+
+def build_trace():
+    """Get the recorded spans as a Chrome trace-event dict."""
+    pid = os.getpid()
+    events = list(_events)
+    trace_events = []
+    for tid in sorted({event[3] for event in events}):
+        trace_events.append({
+            'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+            'args': {'name': _thread_names.get(tid, str(tid))}
+        })
+    for name, start, end, tid, args in events:
+        event = {
+            'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+            'ts': start / 1000.0, 'dur': (end - start) / 1000.0
+        }
+        if args:
+            event['args'] = {key: value if isinstance(value, (int, float, bool)) else str(value)
+                             for key, value in args.items()}
+        trace_events.append(event)
+    return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+def get_default_trace_path():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(get_log_directory(), f'trace_{timestamp}.json')
+
+def dump_trace(path=None):
+    """Write the recorded spans to path (a new file in the log directory by default) and return it."""
+    path = path or get_default_trace_path()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(build_trace(), f, separators=(',', ':'))
+    return path
+
+def _dump_at_exit(path):
+    if _events:
+        dump_trace(path)
+
+# Trace the whole session when asked to by the environment; worker
+# processes re-import this and leave the dump to the main process
+_trace_env = os.getenv('CXRRUPTPAD_TRACE')
+if _trace_env and _trace_env != '0':
+    enable_tracing()
+    if multiprocessing.parent_process() is None:
+        atexit.register(_dump_at_exit, _trace_env if _trace_env.endswith('.json') else None)
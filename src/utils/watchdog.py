@@ -0,0 +1,109 @@
+"""
+GUI event loop stall detection.
+
+A timer on the GUI thread records a heartbeat every few tens of
+milliseconds. A watchdog thread checks how old the last heartbeat is; once
+it's older than the stall threshold, the GUI thread is stuck in some call
+(a file copy, a subprocess, decoding a long sound) and the watchdog grabs
+its Python stack with sys._current_frames() while it's still there. When
+the heartbeat comes back, the stall is logged with its length and that
+stack, and counted in the metrics.
+"""
+import sys
+import time
+import threading
+import traceback
+
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal
+
+from src.utils.logger import logger
+from src.utils.metrics import get_metrics
+
+# How often the GUI thread checks in
+HEARTBEAT_INTERVAL = 0.05
+
+# Event loop delays longer than this are reported as stalls
+STALL_THRESHOLD = 0.5
+
+# Stalls this long are logged straight away, in case the GUI never recovers
+HANG_THRESHOLD = 10.0
+
+# Stall metrics
+stalls_counter = get_metrics().counter("cxrruptpad_gui_stalls_total", "Times the GUI event loop was blocked past the stall threshold")
+stall_histogram = get_metrics().histogram("cxrruptpad_gui_stall_seconds", "How long the GUI event loop was blocked")
+
+class StallWatchdog(QThread):
+    """
+    Watches the event loop of the thread that creates it.
+
+    stall_signal is emitted on the GUI thread after each stall, with its
+    length in seconds and the stack the GUI thread was stuck in.
+    """
+    stall_signal = pyqtSignal(float, str)
+
+    def __init__(self, threshold=STALL_THRESHOLD, interval=HEARTBEAT_INTERVAL,
+                 hang_threshold=HANG_THRESHOLD, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold
+        self.interval = interval
+        self.hang_threshold = hang_threshold
+        self.gui_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.stall_stack = None  # Captured by the watchdog during a stall
+        self.hang_logged = False
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+        # The timer belongs to the GUI thread, like this object
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.timeout.connect(self.heartbeat)
+
+    def start_watching(self):
+        self.last_beat = time.monotonic()
+        self.stop_event.clear()
+        self.heartbeat_timer.start(int(self.interval * 1000))
+        self.start()
+
+    def stop_watching(self):
+        self.heartbeat_timer.stop()
+        self.stop_event.set()
+        self.wait()
+
+    def heartbeat(self):
+        now = time.monotonic()
+        stalled = now - self.last_beat - self.interval
+        self.last_beat = now
+        if stalled < self.threshold:
+            return
+
+        with self.lock:
+            stack, self.stall_stack = self.stall_stack, None
+            self.hang_logged = False
+        stalls_counter.inc()
+        stall_histogram.observe(stalled)
+        if stack:
+            logger.warning("GUI event loop stalled for %.2f s in:\n%s", stalled, stack)
+        else:
+            logger.warning("GUI event loop stalled for %.2f s", stalled)
+        self.stall_signal.emit(stalled, stack or "")
+
+    def capture_stack(self):
+        """Get the GUI thread's current Python stack, formatted, or None."""
+        frame = sys._current_frames().get(self.gui_thread_id)
+        if frame is None:
+            return None
+        return ''.join(traceback.format_stack(frame)).rstrip()
+
+    def run(self):
+        # Check twice per heartbeat, so short stalls past the threshold are caught
+        while not self.stop_event.wait(self.interval / 2):
+            stalled = time.monotonic() - self.last_beat - self.interval
+            if stalled < self.threshold:
+                continue
+            with self.lock:
+                if self.stall_stack is None:
+                    self.stall_stack = self.capture_stack()
+                elif stalled >= self.hang_threshold and not self.hang_logged:
+                    self.hang_logged = True
+                    logger.error("GUI event loop has been stalled for %.1f s, currently in:\n%s",
+                                 stalled, self.capture_stack())
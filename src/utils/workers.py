@@ -0,0 +1,64 @@
+import os
+import platform
+import multiprocessing
+import concurrent.futures
+
+def is_rotational_storage(path):
+    """
+    Check whether a path lives on a spinning disk.
+
+    Only Linux exposes this reliably (through sysfs). Everywhere else the
+    storage is assumed to be solid state, which is the common case today.
+    """
+    if platform.system() != "Linux" or not path:
+        return False
+
+    try:
+        device = os.stat(path).st_dev
+        block_dir = f"/sys/dev/block/{os.major(device)}:{os.minor(device)}"
+
+        # Partitions keep the queue information on their parent device
+        for queue_dir in (os.path.join(block_dir, "queue"), os.path.join(block_dir, "..", "queue")):
+            rotational_path = os.path.join(queue_dir, "rotational")
+            if os.path.exists(rotational_path):
+                with open(rotational_path, 'r') as f:
+                    return f.read().strip() == "1"
+    except (OSError, ValueError):
+        pass
+    return False
+
+def get_worker_count(path=None, cpu_bound=False):
+    """
+    Get a sensible pool size for work on the files under path.
+
+    CPU-bound work gets one worker per core. I/O-bound work gets more workers
+    than cores on solid state storage, but only a couple on spinning disks
+    where parallel reads just make the drive seek.
+    """
+    cpus = os.cpu_count() or 1
+
+    if cpu_bound:
+        return cpus
+    if is_rotational_storage(path):
+        return 2
+    return min(32, cpus * 2)
+
+def create_executor(path=None, cpu_bound=False, use_processes=False, max_workers=None):
+    """
+    Create a pool executor sized for the given workload.
+
+    Process pools always use the spawn start method, because forking a process
+    that is already running Qt and audio threads is not safe. Spawned workers
+    re-run the main script as __mp_main__, so main.py keeps its imports under
+    its __main__ guard; workers then only import the modules of the functions
+    they're given.
+    """
+    if max_workers is None:
+        max_workers = get_worker_count(path, cpu_bound=cpu_bound or use_processes)
+
+    if use_processes:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)